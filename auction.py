@@ -1,25 +1,59 @@
 import discord
 from discord import app_commands
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord.ui import Button, View
+from discord.webhook.async_ import async_context as webhook_async_context
 import asyncio
+import csv
 import datetime
-from typing import Dict, Optional, List, Literal
+import io
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Dict, Optional, List, Literal, Set, Tuple
 import sys
 import os
 
 # Add the parent directory to sys.path to import from utils
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from utils.auction_manager import AuctionManager, Auction
+from utils.auction_manager import (
+    AuctionManager, Auction, AuctionArchive, AuctionPartitions, SnapshotJournalStore, SQLiteAuctionStore,
+    CLOSE_ENDING, CLOSE_ANNOUNCED, CLOSE_FINALIZED
+)
+from utils.metrics import (
+    MetricsServer, bid_submit_seconds, bids_accepted, bids_rejected, embed_render_seconds,
+    instrument_rest, registry, rest_requests, save_data_seconds, scheduler_lag_seconds
+)
+from utils.notifications import NotificationDispatcher, NotificationOutbox
+from utils.user_names import UserNameCache
 
-class BidButton(Button):
-    def __init__(self, auction_id: int, manager: AuctionManager):
+logger = logging.getLogger('auction_bot')
+
+# Multiples of the bid increment offered as one-click bids on auction messages
+QUICK_BID_STEPS = (1, 5)
+
+class BidButton(discord.ui.DynamicItem[Button], template=r"auction:bid:(?P<auction_id>[0-9]+)"):
+    """Place Bid button of an auction message
+
+    Clicks are dispatched by custom_id, so the button keeps working after a
+    restart and nothing is held in memory per auction message.
+    """
+    def __init__(self, auction_id: int):
         self.auction_id = auction_id
-        self.manager = manager
-        super().__init__(label="Place Bid", style=discord.ButtonStyle.green)
+        super().__init__(Button(
+            label="Place Bid",
+            style=discord.ButtonStyle.green,
+            custom_id=f"auction:bid:{auction_id}"
+        ))
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(int(match["auction_id"]))
     
     async def callback(self, interaction: discord.Interaction):
-        auction = self.manager.get_auction(self.auction_id)
+        guild = _guild_auctions(interaction)
+        auction = guild.manager.get_auction(self.auction_id) if guild else None
         if not auction:
             await interaction.response.send_message("This auction no longer exists.", ephemeral=True)
             return
@@ -30,23 +64,27 @@ class BidButton(Button):
         
         # Get the user who clicked the button
         user = interaction.user
-        current_bid = auction.highest_bid
         
-        # Calculate the new bid
-        new_bid = current_bid + auction.bid_increment
+        # Calculate the suggested bid; the modal re-checks it against the live
+        # highest bid on submit
+        new_bid = auction.min_next_bid()
         
-        # Create a proper Modal class outside of this method
         # Create and show a BidModal
-        modal = BidModal(auction, self.manager, user, new_bid)
+        modal = BidModal(auction, guild.manager, guild.publisher, user, new_bid)
         await interaction.response.send_modal(modal)
 
 
 # Define the BidModal class properly
 class BidModal(discord.ui.Modal):
-    def __init__(self, auction, manager, user, min_bid):
-        super().__init__(title=f"Place Bid on {auction.item_name}")
+    # Modals that are closed without submitting are dropped after this many
+    # seconds; interaction tokens expire after 15 minutes anyway
+    TIMEOUT = 900
+    
+    def __init__(self, auction, manager, publisher, user, min_bid):
+        super().__init__(title=f"Place Bid on {auction.item_name}", timeout=self.TIMEOUT)
         self.auction = auction
         self.manager = manager
+        self.publisher = publisher
         self.user = user
         self.min_bid = min_bid
         
@@ -61,57 +99,150 @@ class BidModal(discord.ui.Modal):
         self.add_item(self.bid_amount)
     
     async def on_submit(self, interaction: discord.Interaction):
+        with bid_submit_seconds.time():
+            await self._submit(interaction)
+    
+    async def _submit(self, interaction: discord.Interaction):
         try:
             amount = int(self.bid_amount.value)
-            if amount < self.min_bid:
-                await interaction.response.send_message(
-                    f"Your bid must be at least {self.min_bid} {self.auction.currency}.", 
-                    ephemeral=True
-                )
-                return
-            
-            # Update the auction with the new bid
-            success = self.auction.place_bid(self.user.id, self.user.name, amount)
-            if success:
-                # Update the auction message
-                view = AuctionView(self.auction.id, self.manager)
-                embed = self.manager.create_auction_embed(self.auction)
-                
-                # Get the original message
-                channel = interaction.channel
-                message = await channel.fetch_message(self.auction.message_id)
-                await message.edit(embed=embed, view=view)
-                
-                # Just send confirmation to the bidder without posting an announcement message
-                await interaction.response.send_message(
-                    f"Bid of {amount} {self.auction.currency} placed successfully! The auction has been updated.", 
-                    ephemeral=True
-                )
-            else:
-                await interaction.response.send_message(
-                    "Failed to place bid. The auction may have ended or your bid is no longer high enough.", 
-                    ephemeral=True
-                )
         except ValueError:
+            bids_rejected.inc(reason="invalid_amount")
             await interaction.response.send_message(
                 "Please enter a valid number for your bid.", 
                 ephemeral=True
             )
+            return
+        
+        await _submit_bid(interaction, self.manager, self.publisher, self.auction.id, amount)
+
+
+class QuickBidButton(discord.ui.DynamicItem[Button], template=r"auction:quickbid:(?P<auction_id>[0-9]+):(?P<steps>[0-9]+)"):
+    """Bids the current highest bid plus a number of increments in one click
+
+    The amount is worked out when the click is handled, so there is no modal
+    round trip.
+    """
+    def __init__(self, auction_id: int, steps: int):
+        self.auction_id = auction_id
+        self.steps = steps
+        super().__init__(Button(
+            label=f"+{steps}× increment",
+            style=discord.ButtonStyle.blurple,
+            custom_id=f"auction:quickbid:{auction_id}:{steps}"
+        ))
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(int(match["auction_id"]), int(match["steps"]))
+    
+    async def callback(self, interaction: discord.Interaction):
+        with bid_submit_seconds.time():
+            guild = _guild_auctions(interaction)
+            auction = guild.manager.get_auction(self.auction_id) if guild else None
+            if not auction:
+                bids_rejected.inc(reason="auction_missing")
+                await interaction.response.send_message("This auction no longer exists.", ephemeral=True)
+                return
+            
+            amount = auction.highest_bid + self.steps * auction.bid_increment
+            await _submit_bid(interaction, guild.manager, guild.publisher, auction.id, amount)
+
+
+async def _submit_bid(
+    interaction: discord.Interaction,
+    manager: AuctionManager,
+    publisher: "AuctionMessagePublisher",
+    auction_id: int,
+    amount: int
+):
+    """Place a bid for the interaction's user and respond to the interaction"""
+    auction = manager.get_auction(auction_id)
+    if not auction:
+        bids_rejected.inc(reason="auction_missing")
+        await interaction.response.send_message("This auction no longer exists.", ephemeral=True)
+        return
+    
+    # Bidding opens once the auction's message has been posted
+    if auction.message_id is None:
+        bids_rejected.inc(reason="not_posted")
+        await interaction.response.send_message(
+            "This auction is still being posted. Try again in a moment.",
+            ephemeral=True
+        )
+        return
+    
+    # Validate against the live highest bid, which may have moved on since
+    # the bidder last saw the auction
+    min_bid = auction.min_next_bid()
+    if amount < min_bid:
+        bids_rejected.inc(reason="below_minimum")
+        await interaction.response.send_message(
+            f"Your bid must be at least {min_bid} {auction.currency}.", 
+            ephemeral=True
+        )
+        return
+    
+    # Update the auction with the new bid
+    success = manager.place_bid(auction.id, interaction.user.id, interaction.user.name, amount)
+    if success:
+        bids_accepted.inc()
+        # Queue an update of the auction message; bursts of bids are
+        # folded into a single edit. /auction bid can be used from any
+        # channel, so the edit goes to the auction's own channel.
+        channel = interaction.client.get_channel(auction.channel_id) or interaction.channel
+        publisher.schedule(channel, auction)
+        
+        if auction.highest_bidder_id != interaction.user.id:
+            # Another bidder's maximum answered straight away; it stays hidden
+            await interaction.response.send_message(
+                f"Bid of {amount} {auction.currency} placed, but you were outbid right away by another "
+                f"bidder's maximum bid. The current bid is {auction.highest_bid} {auction.currency}.",
+                ephemeral=True
+            )
+            return
+        
+        # Just send confirmation to the bidder without posting an announcement message
+        await interaction.response.send_message(
+            f"Bid of {amount} {auction.currency} placed successfully! The auction has been updated.", 
+            ephemeral=True
+        )
+    else:
+        bids_rejected.inc(reason="ended_or_outbid")
+        await interaction.response.send_message(
+            "Failed to place bid. The auction may have ended or your bid is no longer high enough.", 
+            ephemeral=True
+        )
 
 
 class AuctionView(View):
-    def __init__(self, auction_id: int, manager: AuctionManager):
+    """Buttons of an auction message
+
+    The buttons are dispatched by custom_id, so the view is not kept around
+    once the message has been sent.
+    """
+    def __init__(self, auction_id: int):
         super().__init__(timeout=None)
         self.auction_id = auction_id
-        self.manager = manager
-        self.add_item(BidButton(auction_id, manager))
+        self.add_item(BidButton(auction_id))
+        for steps in QUICK_BID_STEPS:
+            self.add_item(QuickBidButton(auction_id, steps))
+        # Add cancel button for admins
+        self.add_item(CancelButton(auction_id))
 
 
-class CancelButton(Button):
-    def __init__(self, auction_id: int, manager: AuctionManager):
+class CancelButton(discord.ui.DynamicItem[Button], template=r"auction:cancel:(?P<auction_id>[0-9]+)"):
+    """Cancel Auction button of an auction message, dispatched like BidButton"""
+    def __init__(self, auction_id: int):
         self.auction_id = auction_id
-        self.manager = manager
-        super().__init__(label="Cancel Auction", style=discord.ButtonStyle.red)
+        super().__init__(Button(
+            label="Cancel Auction",
+            style=discord.ButtonStyle.red,
+            custom_id=f"auction:cancel:{auction_id}"
+        ))
+    
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(int(match["auction_id"]))
     
     async def callback(self, interaction: discord.Interaction):
         # Check if user has admin permissions
@@ -122,7 +253,8 @@ class CancelButton(Button):
             )
             return
         
-        auction = self.manager.get_auction(self.auction_id)
+        guild = _guild_auctions(interaction)
+        auction = guild.manager.get_auction(self.auction_id) if guild else None
         if not auction:
             await interaction.response.send_message(
                 "This auction no longer exists.", 
@@ -130,127 +262,801 @@ class CancelButton(Button):
             )
             return
         
-        # Cancel the auction
-        self.manager.end_auction(self.auction_id, cancelled=True)
-        
-        # Update the auction message
-        embed = discord.Embed(
-            title=f"Auction: {auction.item_name} [CANCELLED]",
-            description="This auction has been cancelled by an administrator.",
-            color=discord.Color.red()
-        )
+        if auction.ended:
+            await interaction.response.send_message(
+                "This auction has already ended.", 
+                ephemeral=True
+            )
+            return
         
-        # Get the original message
-        channel = interaction.channel
-        message = await channel.fetch_message(auction.message_id)
-        await message.edit(embed=embed, view=None)
+        # Cancel the auction; the message is updated and the cancellation
+        # announced in the background
+        guild.manager.end_auction(self.auction_id, cancelled=True)
+        closing = guild.closer.start(auction, cancelled_by=interaction.user)
         
         await interaction.response.send_message(
             f"Auction for {auction.item_name} has been cancelled.", 
             ephemeral=True
         )
+        guild.jobs.run(
+            interaction,
+            _closing_result(closing, auction, "cancelled"),
+            f"❌ Failed to close auction #{auction.id}"
+        )
+
+
+def _guild_auctions(interaction: discord.Interaction) -> Optional["GuildAuctions"]:
+    """Get the auctions of the interaction's guild, or None if the cog isn't loaded"""
+    cog = interaction.client.get_cog(AuctionCog.__cog_name__)
+    if cog is None or interaction.guild_id is None:
+        return None
+    return cog._guild(interaction.guild_id)
+
+
+class AuctionListView(View):
+    """Prev/Next paging for /auction list
+
+    Each page is fetched from the manager with a cursor, so only the auctions
+    on the current page are rendered.
+    """
+    PAGE_SIZE = 10
+    
+    def __init__(
+        self,
+        manager: AuctionManager,
+        user_id: int,
+        guild_id: int,
+        order: str,
+        channel_id: Optional[int],
+        currency: Optional[str],
+        ending_within: Optional[int]
+    ):
+        super().__init__(timeout=300)
+        self.manager = manager
+        self.user_id = user_id
+        self.guild_id = guild_id
+        self.order = order
+        self.channel_id = channel_id
+        self.currency = currency
+        self.ending_within = ending_within
+        # Cursors of the pages shown so far; the first page has no cursor
+        self.cursors: List[Optional[Tuple[int, ...]]] = [None]
+        self.next_cursor = None
+        self.prev_button = ListPageButton(-1, label="◀ Prev")
+        self.next_button = ListPageButton(1, label="Next ▶")
+        self.add_item(self.prev_button)
+        self.add_item(self.next_button)
+    
+    def render(self) -> Optional[discord.Embed]:
+        """Fetch and render the current page, or None if it is empty"""
+        auctions, self.next_cursor = self.manager.list_active_auctions(
+            order=self.order,
+            after=self.cursors[-1],
+            limit=self.PAGE_SIZE,
+            channel_id=self.channel_id,
+            currency=self.currency,
+            ending_within=self.ending_within
+        )
+        if not auctions:
+            return None
         
-        # Announce the cancellation
-        await channel.send(
-            f"⚠️ **Auction Cancelled!** The auction for **{auction.item_name}** has been cancelled by {interaction.user.mention}."
+        self.prev_button.disabled = len(self.cursors) == 1
+        self.next_button.disabled = self.next_cursor is None
+        
+        embed = discord.Embed(
+            title="Active Auctions",
+            description="Here are all the current active auctions:",
+            color=discord.Color.blue()
         )
+        
+        for auction in auctions:
+            # Display emblem if available and not auto-deleted
+            embed_str = ""
+            if auction.emblem_url and not (auction.ended and auction.auto_delete_emblem):
+                embed_str = f"[📷]({auction.emblem_url}) "
+                
+            # Handle highest bidder display based on anonymous setting
+            if auction.highest_bidder_name and auction.anonymous_bidding:
+                bidder_display = "Anonymous"
+            else:
+                bidder_display = auction.highest_bidder_name if auction.highest_bidder_name else 'None'
+                
+            embed.add_field(
+                name=f"{embed_str}#{auction.id}: {auction.item_name}"[:256],
+                value=(
+                    f"Owner: <@{auction.creator_id}>\n"
+                    f"Current Bid: {auction.highest_bid} {auction.currency}\n"
+                    f"Highest Bidder: {bidder_display}\n"
+                    f"Ends: <t:{auction.end_ts}:R>\n"
+                    f"[Jump to Auction](https://discord.com/channels/{self.guild_id}/{auction.channel_id}/{auction.message_id})"
+                ),
+                inline=False
+            )
+        
+        embed.set_footer(text=f"Page {len(self.cursors)}")
+        return embed
+    
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if interaction.user.id != self.user_id:
+            await interaction.response.send_message(
+                "Run /auction list to browse the auctions yourself.",
+                ephemeral=True
+            )
+            return False
+        return True
+
+
+class ListPageButton(Button):
+    def __init__(self, step: int, label: str):
+        self.step = step
+        super().__init__(label=label, style=discord.ButtonStyle.grey)
+    
+    async def callback(self, interaction: discord.Interaction):
+        view: AuctionListView = self.view
+        if self.step > 0:
+            view.cursors.append(view.next_cursor)
+        elif len(view.cursors) > 1:
+            view.cursors.pop()
+        
+        embed = view.render()
+        if embed is None:
+            # Auctions ended since the last page; start over from the top
+            view.cursors = [None]
+            embed = view.render()
+        if embed is None:
+            await interaction.response.edit_message(
+                content="📢 There are no active auctions at the moment.",
+                embed=None,
+                view=None
+            )
+            return
+        await interaction.response.edit_message(embed=embed, view=view)
 
 
+class MessageHandleCache:
+    """Editable handles for auction messages, keyed by (channel_id, message_id)
+
+    Edits go through a cached message or a partial message, so editing does
+    not need a fetch_message round trip first. A message is fetched only if
+    Discord no longer recognises the handle.
+    """
+    def __init__(self, max_size: int = 1024):
+        self.max_size = max_size
+        self._handles: "OrderedDict[Tuple[int, int], discord.PartialMessage]" = OrderedDict()
+    
+    def remember(self, message: discord.Message):
+        """Cache a message we already hold, e.g. one we just sent"""
+        self._put((message.channel.id, message.id), message)
+    
+    def discard(self, channel_id: int, message_id: int):
+        self._handles.pop((channel_id, message_id), None)
+    
+    def get(self, channel, message_id: int):
+        """Get a handle that can edit the message without fetching it"""
+        key = (channel.id, message_id)
+        handle = self._handles.get(key)
+        if handle is not None:
+            self._handles.move_to_end(key)
+            return handle
+        handle = channel.get_partial_message(message_id)
+        self._put(key, handle)
+        return handle
+    
+    async def edit(self, channel, message_id: int, **kwargs) -> discord.Message:
+        """Edit a message, fetching it only if the cached handle is unknown to Discord"""
+        key = (channel.id, message_id)
+        try:
+            message = await self.get(channel, message_id).edit(**kwargs)
+        except discord.NotFound:
+            self._handles.pop(key, None)
+            # Raises NotFound again if the message really was deleted
+            message = await channel.fetch_message(message_id)
+            message = await message.edit(**kwargs)
+        self._put(key, message)
+        return message
+    
+    def _put(self, key: Tuple[int, int], handle: discord.PartialMessage):
+        self._handles[key] = handle
+        self._handles.move_to_end(key)
+        while len(self._handles) > self.max_size:
+            self._handles.popitem(last=False)
+
+
+class AuctionMessagePublisher:
+    """Edits auction messages in version order
+
+    Edits for one auction are serialized, and each edit renders the state
+    as it is when the edit runs. A slow edit therefore can never overwrite a
+    newer one, and bids that pile up behind an edit are folded into it.
+    """
+    # Seconds to collect bids before editing the auction message
+    UPDATE_DELAY = 1.0
+    
+    def __init__(self, manager: AuctionManager):
+        self.manager = manager
+        self._locks: Dict[int, asyncio.Lock] = {}
+        self._published_versions: Dict[int, int] = {}
+        self._pending: Dict[int, asyncio.Task] = {}
+        self.messages = MessageHandleCache()
+    
+    def _lock(self, auction_id: int) -> asyncio.Lock:
+        lock = self._locks.get(auction_id)
+        if lock is None:
+            lock = self._locks[auction_id] = asyncio.Lock()
+        return lock
+    
+    async def publish(self, channel, auction: Auction):
+        """Show the current state of a running auction"""
+        async with self._lock(auction.id):
+            # Ended auctions only get their final embed; anything else is stale
+            if auction.ended or self._published_versions.get(auction.id, -1) >= auction.version:
+                return
+            # An auction whose message isn't posted yet has nothing to edit
+            if auction.message_id is None:
+                return
+            
+            version = auction.version
+            embed = self.manager.create_auction_embed(auction)
+            # The message keeps its existing buttons when no view is passed
+            await self.messages.edit(channel, auction.message_id, embed=embed)
+            self._published_versions[auction.id] = version
+    
+    def schedule(self, channel, auction: Auction):
+        """Queue an edit showing the auction's latest state
+
+        Only one edit is queued per auction at a time, so any number of bids
+        within UPDATE_DELAY results in a single edit.
+        """
+        if auction.id in self._pending:
+            return
+        self._pending[auction.id] = asyncio.create_task(self._publish_later(channel, auction))
+    
+    async def _publish_later(self, channel, auction: Auction):
+        await asyncio.sleep(self.UPDATE_DELAY)
+        # Bids arriving while the edit is in flight queue a fresh update
+        self._pending.pop(auction.id, None)
+        try:
+            await self.publish(channel, auction)
+        except Exception as e:
+            logger.error(f"Error updating auction message {auction.id}: {e}")
+    
+    async def publish_final(self, channel, auction: Auction, embed: discord.Embed):
+        """Replace an ended auction's message with its final embed and remove the buttons
+
+        Any queued update is dropped, so the final embed is shown right away.
+        """
+        pending = self._pending.pop(auction.id, None)
+        if pending:
+            pending.cancel()
+        try:
+            if auction.message_id is not None:
+                async with self._lock(auction.id):
+                    await self.messages.edit(channel, auction.message_id, embed=embed, view=None)
+        finally:
+            self.forget(auction.id)
+            self.messages.discard(channel.id, auction.message_id)
+    
+    def forget(self, auction_id: int):
+        """Drop the bookkeeping for an auction that will not be edited again"""
+        self._locks.pop(auction_id, None)
+        self._published_versions.pop(auction_id, None)
+    
+    def close(self):
+        """Cancel all queued updates"""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+
+class AuctionCloser:
+    """Closes ended auctions concurrently, retrying failed steps
+
+    Each closing moves through the persisted states ending -> announced ->
+    finalized. A step that fails is retried with backoff, and closings that
+    were cut short by a restart are resumed on startup.
+    """
+    # Closings that may talk to Discord at the same time
+    MAX_CONCURRENT = 10
+    MAX_ATTEMPTS = 6
+    # Seconds before the first retry, doubled after every failed attempt
+    RETRY_DELAY = 5
+    
+    def __init__(
+        self,
+        bot,
+        manager: AuctionManager,
+        publisher: AuctionMessagePublisher,
+        notifier: NotificationDispatcher,
+        slots: Optional[asyncio.Semaphore] = None
+    ):
+        self.bot = bot
+        self.manager = manager
+        self.publisher = publisher
+        self.notifier = notifier
+        # Closers of different guilds can share one concurrency limit
+        self._slots = slots or asyncio.Semaphore(self.MAX_CONCURRENT)
+        self._tasks: Dict[int, asyncio.Task] = {}
+    
+    def start(
+        self,
+        auction: Auction,
+        early: bool = False,
+        cancelled_by: Optional[discord.abc.User] = None
+    ) -> "asyncio.Task[bool]":
+        """Close an ended auction in the background
+
+        Returns the closing task, which results in whether the auction
+        message was updated.
+        """
+        task = self._tasks.get(auction.id)
+        if task is not None:
+            return task
+        task = asyncio.create_task(self._run(auction, early, cancelled_by))
+        self._tasks[auction.id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(auction.id, None))
+        return task
+    
+    def resume(self):
+        """Restart closings that were interrupted, e.g. by a restart"""
+        for auction_id in self.manager.get_unfinished_closings():
+            auction = self.manager.get_auction(auction_id)
+            if auction:
+                self.start(auction, early=auction.ended_early)
+    
+    def close(self):
+        """Cancel all running closings; they are resumed on the next start"""
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+    
+    async def _run(self, auction: Auction, early: bool, cancelled_by: Optional[discord.abc.User]) -> bool:
+        delay = self.RETRY_DELAY
+        for attempt in range(1, self.MAX_ATTEMPTS + 1):
+            try:
+                async with self._slots:
+                    await self._close(auction, early, cancelled_by)
+                return True
+            except (discord.Forbidden, discord.NotFound) as e:
+                # The channel or message is gone or off limits; retrying won't help
+                logger.warning(f"Could not close auction {auction.id}, giving up: {e}")
+                self.manager.set_close_state(auction.id, CLOSE_FINALIZED)
+                return False
+            except Exception as e:
+                logger.error(f"Error closing auction {auction.id} (attempt {attempt}/{self.MAX_ATTEMPTS}): {e}")
+                if attempt < self.MAX_ATTEMPTS:
+                    await asyncio.sleep(delay)
+                    delay *= 2
+        logger.error(f"Giving up on closing auction {auction.id} until the next restart")
+        return False
+    
+    async def _close(self, auction: Auction, early: bool, cancelled_by: Optional[discord.abc.User]):
+        if auction.close_state == CLOSE_ENDING:
+            self._announce(auction, early, cancelled_by)
+            self.manager.set_close_state(auction.id, CLOSE_ANNOUNCED)
+        
+        if auction.close_state == CLOSE_ANNOUNCED:
+            channel = self.bot.get_channel(auction.channel_id)
+            if channel is None:
+                logger.warning(f"Channel {auction.channel_id} for auction {auction.id} not found")
+                self.manager.set_close_state(auction.id, CLOSE_FINALIZED)
+                return
+            
+            # Replace the auction message with the final result
+            embed = self._create_result_embed(auction, early)
+            await self.publisher.publish_final(channel, auction, embed)
+            self.manager.set_close_state(auction.id, CLOSE_FINALIZED)
+    
+    def _create_result_embed(self, auction: Auction, early: bool) -> discord.Embed:
+        """Create the embed that replaces the auction message once it has closed"""
+        if auction.cancelled:
+            return discord.Embed(
+                title=f"Auction: {auction.item_name} [CANCELLED]",
+                description="This auction has been cancelled by an administrator.",
+                color=discord.Color.red()
+            )
+        
+        if early:
+            embed = discord.Embed(
+                title=f"Auction: {auction.item_name} [ENDED EARLY]",
+                description=f"This auction was ended early by an administrator.",
+                color=discord.Color.orange()
+            )
+        else:
+            embed = discord.Embed(
+                title=f"Auction: {auction.item_name} [ENDED]",
+                description=f"This auction has ended.",
+                color=discord.Color.blue()
+            )
+        
+        if auction.highest_bidder_id:
+            # Display winner according to anonymous setting
+            if auction.anonymous_bidding:
+                winner_display = "Anonymous"
+            else:
+                winner_display = self._winner_mention(auction)
+            
+            embed.add_field(
+                name="Winner", 
+                value=winner_display,
+                inline=True
+            )
+            embed.add_field(
+                name="Winning Bid", 
+                value=f"{auction.highest_bid} {auction.currency}",
+                inline=True
+            )
+        else:
+            embed.add_field(
+                name="Result", 
+                value="No bids were placed.",
+                inline=False
+            )
+        
+        return embed
+    
+    def _announce(self, auction: Auction, early: bool, cancelled_by: Optional[discord.abc.User]):
+        """Queue the result announcement and the winner's notification
+
+        The messages are written to the outbox before the closing moves on,
+        and the dedupe keys stop a resumed closing from queueing them twice.
+        """
+        # Auction IDs are only unique within a guild
+        prefix = f"auction:{auction.id}" if self.manager.guild_id is None else f"auction:{self.manager.guild_id}:{auction.id}"
+        announce_key = f"{prefix}:announce"
+        if auction.cancelled:
+            cancelled_by = cancelled_by.mention if cancelled_by else "an administrator"
+            self.notifier.notify_channel(
+                auction.channel_id,
+                f"⚠️ **Auction Cancelled!** The auction for **{auction.item_name}** has been cancelled by {cancelled_by}.",
+                dedupe_key=announce_key
+            )
+            return
+        
+        heading = "Auction Ended Early!" if early else "Auction Ended!"
+        
+        if not auction.highest_bidder_id:
+            # Announce no winner
+            self.notifier.notify_channel(
+                auction.channel_id,
+                f"⏱️ **{heading}** The auction for **{auction.item_name}** has ended with no bids.",
+                dedupe_key=announce_key
+            )
+            return
+        
+        if auction.anonymous_bidding:
+            # Private notification to winner
+            self.notifier.notify_user(
+                auction.highest_bidder_id,
+                f"🏆 Congratulations! You won the auction for **{auction.item_name}** with a bid of **{auction.highest_bid} {auction.currency}**!",
+                dedupe_key=f"{prefix}:winner"
+            )
+            
+            # Public announcement without mentioning the winner
+            self.notifier.notify_channel(
+                auction.channel_id,
+                f"🏆 **{heading}** The auction for **{auction.item_name}** has ended with a winning bid of **{auction.highest_bid} {auction.currency}**. The winner has been notified.",
+                dedupe_key=announce_key
+            )
+        else:
+            # Announce the winner publicly
+            self.notifier.notify_channel(
+                auction.channel_id,
+                f"🏆 **{heading}** Congratulations to {self._winner_mention(auction)} for winning the **{auction.item_name}** with a bid of **{auction.highest_bid} {auction.currency}**!",
+                dedupe_key=announce_key
+            )
+    
+    def _winner_mention(self, auction: Auction) -> str:
+        # A mention pings the winner without needing their name
+        return f"<@{auction.highest_bidder_id}>"
+
+
+class BackgroundJobs:
+    """Runs the Discord I/O that follows an interaction response
+
+    Handlers acknowledge the interaction straight away and hand the slow part
+    to run(). Whatever the job returns is sent to the user as an ephemeral
+    follow-up message, as is the error if it fails.
+    """
+    # Jobs that may talk to Discord at the same time
+    MAX_CONCURRENT = 20
+    
+    def __init__(self):
+        self._slots = asyncio.Semaphore(self.MAX_CONCURRENT)
+        self._tasks: Set[asyncio.Task] = set()
+    
+    def run(self, interaction: discord.Interaction, job: Awaitable[Optional[str]], error_message: str):
+        """Run a job in the background and report its result to the interaction's user"""
+        task = asyncio.create_task(self._run(interaction, job, error_message))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+    
+    async def _run(self, interaction: discord.Interaction, job: Awaitable[Optional[str]], error_message: str):
+        try:
+            async with self._slots:
+                result = await job
+        except Exception as e:
+            logger.error(f"Error in background job for interaction {interaction.id}: {e}")
+            result = f"{error_message}: {e}"
+        if not result:
+            return
+        try:
+            await interaction.followup.send(result, ephemeral=True)
+        except discord.HTTPException as e:
+            # The interaction token expires after 15 minutes
+            logger.warning(f"Could not send follow-up for interaction {interaction.id}: {e}")
+    
+    def close(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+
+async def _closing_result(closing: "asyncio.Task[bool]", auction: Auction, action: str) -> str:
+    """Wait for a closing and describe how it went"""
+    if await closing:
+        return f"Auction #{auction.id} for **{auction.item_name}** has been {action} and its message updated."
+    return (
+        f"⚠️ Auction #{auction.id} for **{auction.item_name}** has been {action}, "
+        f"but its message could not be updated."
+    )
+
+
+class GuildAuctions:
+    """A guild's auction manager together with the publisher and closer working on it"""
+    def __init__(
+        self,
+        bot,
+        manager: AuctionManager,
+        notifier: NotificationDispatcher,
+        slots: asyncio.Semaphore,
+        jobs: BackgroundJobs
+    ):
+        self.manager = manager
+        self.jobs = jobs
+        # New auctions whose message is still being sent. Their clock starts
+        # once it is, so the scheduler leaves them alone until then.
+        self.posting: Set[int] = set()
+        self.publisher = AuctionMessagePublisher(manager)
+        self.closer = AuctionCloser(bot, manager, self.publisher, notifier, slots)
+    
+    def close(self):
+        self.manager.on_schedule_change = None
+        self.closer.close()
+        self.publisher.close()
+
+
+@app_commands.guild_only()
 class AuctionCog(commands.GroupCog, group_name="auction"):
+    # Upper bound on how long the scheduler sleeps between checks, so a
+    # wall-clock jump can't delay closing auctions indefinitely
+    MAX_SCHEDULER_SLEEP = 300
+    # Window used by /auction list ending_soon:yes
+    ENDING_SOON_SECONDS = 3600
+    # Most auctions a single /auction batch manifest may start
+    MAX_BATCH_SIZE = 500
+    # Largest manifest attachment /auction batch reads, in bytes
+    MAX_MANIFEST_BYTES = 1024 * 1024
+    # How often the autosave loop checks for guilds that are due a save
+    AUTOSAVE_POLL_SECONDS = 5
+    # Bids per page of /auction history
+    HISTORY_PAGE_SIZE = 10
+    
     def __init__(self, bot):
         self.bot = bot
-        self.auction_manager = AuctionManager()
-        self.check_auctions.start()
+        # Auctions are kept per guild under AUCTION_DATA_DIR, so shards running
+        # in separate processes each load only their own guilds.
+        # AUCTION_STORAGE=sqlite keeps them in indexed databases instead of the
+        # default snapshot and journal (AUCTION_STORAGE=snapshot, formerly
+        # "pickle").
+        # Every embed and announcement looks names up through this one cache
+        self.user_names = UserNameCache(bot)
+        self.partitions = AuctionPartitions(
+            os.getenv("AUCTION_DATA_DIR", "auction_data"),
+            os.getenv("AUCTION_STORAGE", "snapshot").lower(),
+            name_resolver=self.user_names.get
+        )
+        self.storage = self.partitions.storage
+        self.guilds: Dict[int, GuildAuctions] = {}
+        # One outbox per process, so processes don't share the file
+        shard_ids = self._shard_ids()
+        default_outbox = "auction_outbox.db"
+        if shard_ids is not None:
+            default_outbox = f"auction_outbox.shard{'-'.join(map(str, shard_ids))}.db"
+        self.outbox = NotificationOutbox(os.getenv("AUCTION_OUTBOX_FILE", default_outbox))
+        self.notifier = NotificationDispatcher(bot, self.outbox)
+        self._closing_slots = asyncio.Semaphore(AuctionCloser.MAX_CONCURRENT)
+        self.jobs = BackgroundJobs()
+        self._scheduler_wakeup = asyncio.Event()
+        self._scheduler_task = None
+        # A guild's auctions are saved once AUCTION_AUTOSAVE_CHANGES changes have
+        # piled up, or once AUCTION_AUTOSAVE_SECONDS have passed since the last
+        # save with anything changed at all
+        self.autosave_seconds = float(os.getenv("AUCTION_AUTOSAVE_SECONDS", "300"))
+        self.autosave_changes = int(os.getenv("AUCTION_AUTOSAVE_CHANGES", "1000"))
+        self._autosave_task = None
+        # AUCTION_METRICS_PORT serves the metrics over HTTP for scrapers
+        self.metrics_server = None
+        metrics_port = os.getenv("AUCTION_METRICS_PORT")
+        if metrics_port:
+            self.metrics_server = MetricsServer(
+                registry, os.getenv("AUCTION_METRICS_HOST", "127.0.0.1"), int(metrics_port)
+            )
         super().__init__()
     
+    def _shard_ids(self) -> Optional[List[int]]:
+        """Get the shards run by this process, or None if not known (yet)"""
+        shard_ids = getattr(self.bot, "shard_ids", None)
+        if shard_ids is None and getattr(self.bot, "shard_id", None) is not None:
+            shard_ids = [self.bot.shard_id]
+        return shard_ids
+    
+    def _guild(self, guild_id: int) -> GuildAuctions:
+        """Get the auctions of a guild, loading its partition on first use"""
+        guild = self.guilds.get(guild_id)
+        if guild is None:
+            manager = self.partitions.get(guild_id)
+            guild = self.guilds[guild_id] = GuildAuctions(
+                self.bot, manager, self.notifier, self._closing_slots, self.jobs
+            )
+            manager.on_schedule_change = self._scheduler_wakeup.set
+            # Bidder names stored on the auctions save fetching them later
+            self.user_names.warm(
+                (auction.highest_bidder_id, auction.highest_bidder_name)
+                for auction in manager.auctions.values()
+            )
+            # The partition may bring deadlines of its own
+            self._scheduler_wakeup.set()
+        return guild
+    
+    def _guild_for_channel(self, channel_id: int) -> Optional[int]:
+        channel = self.bot.get_channel(channel_id)
+        guild = getattr(channel, "guild", None)
+        return guild.id if guild else None
+    
+    async def cog_load(self):
+        # One handler for the buttons of every auction message, including
+        # messages sent before a restart
+        self.bot.add_dynamic_items(BidButton, QuickBidButton, CancelButton)
+        # Count REST calls made by the bot and by interaction responses
+        instrument_rest(self.bot.http)
+        instrument_rest(webhook_async_context.get())
+        if self.metrics_server:
+            await self.metrics_server.start()
+        self.notifier.start()
+        self._scheduler_task = asyncio.create_task(self.run_scheduler())
+        self._autosave_task = asyncio.create_task(self.run_autosave())
+    
     def cog_unload(self):
-        self.check_auctions.cancel()
+        self.bot.remove_dynamic_items(BidButton, QuickBidButton, CancelButton)
+        if self._scheduler_task:
+            self._scheduler_task.cancel()
+        if self._autosave_task:
+            self._autosave_task.cancel()
+        self.jobs.close()
+        for guild in self.guilds.values():
+            guild.close()
+        self.guilds.clear()
+        self.notifier.close()
+        self.outbox.close()
+        self.user_names.close()
+        if self.metrics_server:
+            self.metrics_server.close()
+        self.partitions.close()
     
-    @tasks.loop(seconds=10)
-    async def check_auctions(self):
-        """Task to check for ended auctions"""
-        ended_auctions = self.auction_manager.get_ended_auctions()
-        for auction_id in ended_auctions:
-            auction = self.auction_manager.get_auction(auction_id)
-            if not auction:
-                continue
+    def load_partitions(self):
+        """Load the guilds owned by this process, migrating pre-partitioning data first"""
+        self.partitions.shard_ids = self._shard_ids()
+        self.partitions.shard_count = self.bot.shard_count
+        self._migrate_legacy_data()
+        for manager in self.partitions.load_owned():
+            self._guild(manager.guild_id)
+    
+    def _migrate_legacy_data(self):
+        """Split the single data file used before auctions were partitioned by guild
+
+        Each process migrates the guilds of its own shards once and then
+        leaves a marker, so later startups don't read the legacy files again.
+        Errors are logged and retried on the next startup; they must not keep
+        the partitions from loading.
+        """
+        if self.partitions.legacy_migrated():
+            return
+        try:
+            if self.storage == "sqlite":
+                legacy_file = os.getenv("AUCTION_DB_FILE", "auction_data.db")
+                if not os.path.exists(legacy_file):
+                    return
+                store, archive = SQLiteAuctionStore(legacy_file), None
+            else:
+                if not any(os.path.exists(path) for path in ("auction_data.snap", "auction_data.pickle", "auction_data.journal")):
+                    return
+                store = SnapshotJournalStore()
+                archive = AuctionArchive() if os.path.exists("auction_archive.dat") else None
+            try:
+                self.partitions.migrate_legacy(store, archive, self._guild_for_channel)
+            finally:
+                store.close()
+        except Exception as e:
+            logger.error(f"Error migrating legacy auction data: {e}")
+            return
+        self.partitions.mark_legacy_migrated()
+    
+    async def run_scheduler(self):
+        """Sleep until the next auction deadline and close due auctions"""
+        await self.bot.wait_until_ready()
+        # Shards and channels are known once the bot is ready
+        self.load_partitions()
+        # Finish closings that a previous run didn't get to complete
+        for guild in list(self.guilds.values()):
+            guild.closer.resume()
+        while True:
+            self._scheduler_wakeup.clear()
+            try:
+                await self.check_auctions()
+            except Exception as e:
+                logger.error(f"Error checking ended auctions: {e}")
             
-            # Mark the auction as ended
-            self.auction_manager.end_auction(auction_id)
+            timeout = self.MAX_SCHEDULER_SLEEP
+            deadlines = [
+                deadline for deadline in (guild.manager.next_deadline() for guild in self.guilds.values())
+                if deadline is not None
+            ]
+            if deadlines:
+                remaining = (min(deadlines) - datetime.datetime.now()).total_seconds()
+                timeout = min(max(remaining, 0), timeout)
             
-            # Try to get the channel and message
             try:
-                channel = self.bot.get_channel(auction.channel_id)
-                if channel:
-                    # Update the original auction message
-                    message = await channel.fetch_message(auction.message_id)
-                    if message:
-                        embed = discord.Embed(
-                            title=f"Auction: {auction.item_name} [ENDED]",
-                            description=f"This auction has ended.",
-                            color=discord.Color.blue()
-                        )
-                        
-                        if auction.highest_bidder_id:
-                            winner = self.bot.get_user(auction.highest_bidder_id)
-                            winner_mention = winner.mention if winner else f"User ID: {auction.highest_bidder_id}"
-                            
-                            # Display winner according to anonymous setting
-                            if auction.anonymous_bidding:
-                                embed.add_field(
-                                    name="Winner", 
-                                    value="Anonymous",
-                                    inline=True
-                                )
-                                
-                                # Private notification to winner
-                                try:
-                                    if winner:
-                                        await winner.send(f"🏆 Congratulations! You won the auction for **{auction.item_name}** with a bid of **{auction.highest_bid} {auction.currency}**!")
-                                except:
-                                    # Could not DM the winner
-                                    pass
-                                    
-                                # Public announcement without mentioning the winner
-                                await channel.send(
-                                    f"🏆 **Auction Ended!** The auction for **{auction.item_name}** has ended with a winning bid of **{auction.highest_bid} {auction.currency}**. The winner has been notified."
-                                )
-                            else:
-                                embed.add_field(
-                                    name="Winner", 
-                                    value=winner_mention,
-                                    inline=True
-                                )
-                                
-                                # Announce the winner publicly
-                                await channel.send(
-                                    f"🏆 **Auction Ended!** Congratulations to {winner_mention} for winning the **{auction.item_name}** with a bid of **{auction.highest_bid} {auction.currency}**!"
-                                )
-                                
-                            embed.add_field(
-                                name="Winning Bid", 
-                                value=f"{auction.highest_bid} {auction.currency}",
-                                inline=True
-                            )
-                        else:
-                            embed.add_field(
-                                name="Result", 
-                                value="No bids were placed.",
-                                inline=False
-                            )
-                            
-                            # Announce no winner
-                            await channel.send(
-                                f"⏱️ **Auction Ended!** The auction for **{auction.item_name}** has ended with no bids."
-                            )
-                        
-                        await message.edit(embed=embed, view=None)
-            except Exception as e:
-                print(f"Error processing ended auction {auction_id}: {e}")
+                # Created, cancelled or manually ended auctions wake us early
+                await asyncio.wait_for(self._scheduler_wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
     
-    @check_auctions.before_loop
-    async def before_check_auctions(self):
-        await self.bot.wait_until_ready()
+    async def run_autosave(self):
+        """Save guilds' auction data in the background when they are due
+
+        Each save captures the data on the event loop, which only encodes the
+        auctions changed since the last save, and writes it in a worker
+        thread along with any pending archive pages. A full archive page
+        makes a save due. Saving also folds the journal into the snapshot,
+        which keeps replay at startup short.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.AUTOSAVE_POLL_SECONDS)
+            now = time.monotonic()
+            for guild in list(self.guilds.values()):
+                manager = guild.manager
+                if not manager.unsaved_changes:
+                    continue
+                due = (
+                    manager.unsaved_changes >= self.autosave_changes
+                    or now - manager.last_saved >= self.autosave_seconds
+                    or manager.archive_page_full()
+                )
+                if not due:
+                    continue
+                save = manager.prepare_save()
+                if save:
+                    await loop.run_in_executor(None, save)
+    
+    async def check_auctions(self):
+        """Close auctions whose end time has passed"""
+        for guild in list(self.guilds.values()):
+            manager = guild.manager
+            for auction_id in manager.get_ended_auctions():
+                auction = manager.get_auction(auction_id)
+                if not auction:
+                    continue
+                if auction_id in guild.posting:
+                    # Its clock starts over once its message is sent
+                    continue
+                
+                # How late the auction is being closed after its end time
+                scheduler_lag_seconds.set(max(0.0, time.time() - auction.end_ts))
+                
+                # Mark the auction as ended and hand it to the closing pipeline
+                manager.end_auction(auction_id)
+                guild.closer.start(auction)
     
     # Slash command for starting auctions
     @app_commands.command(name="start", description="Start a new auction")
@@ -277,29 +1083,10 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
         """Start a new auction"""
         # Parse duration
         try:
-            duration_seconds = 0
-            duration_copy = duration  # Keep a copy for error handling
-            
-            if 'd' in duration:
-                days = int(duration.split('d')[0])
-                duration_seconds += days * 86400
-                duration = duration.split('d')[1]
-            
-            if 'h' in duration:
-                hours = int(duration.split('h')[0])
-                duration_seconds += hours * 3600
-                duration = duration.split('h')[1]
-            
-            if 'm' in duration:
-                minutes = int(duration.split('m')[0])
-                duration_seconds += minutes * 60
-            
-            if duration_seconds == 0:
-                raise ValueError("Invalid duration")
-                
-        except Exception as e:
+            duration_seconds = _parse_duration(duration)
+        except ValueError:
             await interaction.response.send_message(
-                f"❌ Invalid duration format '{duration_copy}'. Use format like: 1h, 30m, 1d, 1d12h, etc.",
+                f"❌ Invalid duration format '{duration}'. Use format like: 1h, 30m, 1d, 1d12h, etc.",
                 ephemeral=True
             )
             return
@@ -308,8 +1095,12 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
         anonymous_bidding = anonymous.lower() == "yes"
         auto_delete_emblem_bool = auto_delete_emblem.lower() == "yes"
         
+        # The embed shows the creator as the owner
+        self.user_names.remember(interaction.user.id, interaction.user.name)
+        
         # Create the auction
-        auction_id = self.auction_manager.create_auction(
+        guild = self._guild(interaction.guild_id)
+        auction_id = guild.manager.create_auction(
             item_name=item_name,
             starting_bid=starting_bid,
             bid_increment=bid_increment,
@@ -322,17 +1113,11 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
             auto_delete_emblem=auto_delete_emblem_bool
         )
         
-        auction = self.auction_manager.get_auction(auction_id)
-        
-        # Create embed
-        embed = self.auction_manager.create_auction_embed(auction)
+        guild.posting.add(auction_id)
+        auction = guild.manager.get_auction(auction_id)
         
-        # Create view with bid button
-        view = AuctionView(auction_id, self.auction_manager)
-        
-        # Add cancel button for admins
-        cancel_button = CancelButton(auction_id, self.auction_manager)
-        view.add_item(cancel_button)
+        # Create view with bid and cancel buttons
+        view = AuctionView(auction_id)
         
         # Send initial response to the interaction
         await interaction.response.send_message(
@@ -340,24 +1125,157 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
             ephemeral=True
         )
         
-        # Send the auction embed to the channel
-        message = await interaction.channel.send(embed=embed, view=view)
-        
-        # Update the auction with the message ID
-        self.auction_manager.set_message_id(auction_id, message.id)
+        # Post the auction in the background; the creator hears back through
+        # a follow-up message
+        guild.jobs.run(
+            interaction,
+            self._post_auction(interaction, guild, auction, view),
+            f"❌ Could not announce auction #{auction_id}"
+        )
+    
+    async def _post_auction(
+        self,
+        interaction: discord.Interaction,
+        guild: GuildAuctions,
+        auction: Auction,
+        view: View
+    ) -> str:
+        """Send a new auction's message and announce it"""
+        try:
+            # Send the auction embed to the channel
+            message = await self._send_auction(guild, interaction.channel, auction.id, view)
+        except discord.HTTPException as e:
+            return f"❌ Could not post auction #{auction.id} in this channel, so it has been cancelled: {e}"
         
         # Send public confirmation
         await interaction.channel.send(
-            f"✅ Auction for **{item_name}** has been started by {interaction.user.mention}! It will end <t:{int(auction.end_time.timestamp())}:R>."
+            f"✅ Auction for **{auction.item_name}** has been started by {interaction.user.mention}! It will end <t:{auction.end_ts}:R>."
+        )
+        return f"✅ Auction #{auction.id} is live: {message.jump_url}"
+    
+    async def _send_auction(
+        self,
+        guild: GuildAuctions,
+        channel: discord.abc.Messageable,
+        auction_id: int,
+        view: View
+    ) -> discord.Message:
+        """Send a new auction's message, cancelling the auction if that fails
+
+        The auction's clock starts when its message is sent, so auctions
+        waiting their turn in a batch keep their full duration.
+        """
+        try:
+            guild.manager.restart_clock(auction_id)
+            embed = guild.manager.create_auction_embed(guild.manager.get_auction(auction_id))
+            message = await channel.send(embed=embed, view=view)
+        except discord.HTTPException:
+            self._drop_unposted(guild, auction_id)
+            raise
+        finally:
+            guild.posting.discard(auction_id)
+        guild.publisher.messages.remember(message)
+        
+        # Update the auction with the message ID, which opens it for bids
+        guild.manager.set_message_id(auction_id, message.id)
+        return message
+    
+    def _drop_unposted(self, guild: GuildAuctions, auction_id: int):
+        """Cancel a new auction whose message could not be posted"""
+        # Nobody can bid on an auction without a message, so drop it
+        guild.manager.end_auction(auction_id, cancelled=True)
+        guild.manager.set_close_state(auction_id, CLOSE_FINALIZED)
+    
+    # Slash command for starting many auctions at once
+    @app_commands.command(name="batch", description="Start many auctions from a CSV or JSON manifest")
+    @app_commands.describe(manifest="CSV or JSON file with one auction per row")
+    @app_commands.checks.has_permissions(manage_messages=True)
+    async def auction_batch(self, interaction: discord.Interaction, manifest: discord.Attachment):
+        """Start every auction in a manifest, or none if any of them is invalid"""
+        if manifest.size > self.MAX_MANIFEST_BYTES:
+            await interaction.response.send_message(
+                f"❌ The manifest is too large (at most {self.MAX_MANIFEST_BYTES // 1024} KB).",
+                ephemeral=True
+            )
+            return
+        
+        # Downloading the attachment may take longer than Discord waits for a response
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        try:
+            data = await manifest.read()
+        except discord.HTTPException as e:
+            await interaction.followup.send(f"❌ Could not download the manifest: {e}", ephemeral=True)
+            return
+        
+        specs, errors = _parse_manifest(manifest.filename, data)
+        if not specs and not errors:
+            errors.append("The manifest does not contain any auctions.")
+        if len(specs) > self.MAX_BATCH_SIZE:
+            errors.append(f"A batch can start at most {self.MAX_BATCH_SIZE} auctions, this one has {len(specs)}.")
+        if errors:
+            shown = "\n".join(f"- {error}" for error in errors[:10])
+            if len(errors) > 10:
+                shown += f"\n- ...and {len(errors) - 10} more"
+            await interaction.followup.send(f"❌ No auctions were started:\n{shown}", ephemeral=True)
+            return
+        
+        for spec in specs:
+            spec.update(creator_id=interaction.user.id, channel_id=interaction.channel_id)
+        self.user_names.remember(interaction.user.id, interaction.user.name)
+        guild = self._guild(interaction.guild_id)
+        auction_ids = guild.manager.create_auctions(specs)
+        guild.posting.update(auction_ids)
+        
+        await interaction.followup.send(f"✅ Starting {len(auction_ids)} auctions...", ephemeral=True)
+        guild.jobs.run(
+            interaction,
+            self._post_batch(interaction, guild, auction_ids),
+            "❌ Could not announce all auctions of the batch"
         )
     
+    async def _post_batch(self, interaction: discord.Interaction, guild: GuildAuctions, auction_ids: List[int]) -> str:
+        """Send the messages of a batch of new auctions and announce them
+
+        The messages are sent one after another. discord.py holds each send
+        until the channel's rate limit allows it, so the batch goes out as
+        fast as Discord permits without tripping 429s.
+        """
+        posted = []
+        failed = []
+        try:
+            for auction_id in auction_ids:
+                try:
+                    await self._send_auction(guild, interaction.channel, auction_id, AuctionView(auction_id))
+                except discord.HTTPException as e:
+                    logger.error(f"Error posting batch auction {auction_id}: {e}")
+                    failed.append(auction_id)
+                    continue
+                posted.append(guild.manager.get_auction(auction_id))
+        finally:
+            # Auctions the batch never got to, e.g. because the job was cancelled
+            for auction_id in auction_ids:
+                if auction_id in guild.posting:
+                    guild.posting.discard(auction_id)
+                    self._drop_unposted(guild, auction_id)
+        
+        if posted:
+            await interaction.channel.send(
+                f"✅ {len(posted)} auctions have been started by {interaction.user.mention}! "
+                f"The first ends <t:{min(auction.end_ts for auction in posted)}:R>."
+            )
+        result = f"✅ Started {len(posted)} of {len(auction_ids)} auctions."
+        if failed:
+            result += f"\n⚠️ These could not be posted and were cancelled: {', '.join(f'#{i}' for i in failed)}"
+        return result
+    
     # Slash command for ending auctions early
     @app_commands.command(name="end", description="End an auction early (admin only)")
     @app_commands.describe(auction_id="ID of the auction to end")
     @app_commands.checks.has_permissions(administrator=True)
     async def auction_end(self, interaction: discord.Interaction, auction_id: int):
         """End an auction early (admin only)"""
-        auction = self.auction_manager.get_auction(auction_id)
+        guild = self._guild(interaction.guild_id)
+        auction = guild.manager.get_auction(auction_id)
         if not auction:
             await interaction.response.send_message("❌ Auction not found.", ephemeral=True)
             return
@@ -366,134 +1284,136 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
             await interaction.response.send_message("❌ This auction has already ended.", ephemeral=True)
             return
         
-        # End the auction
-        self.auction_manager.end_auction(auction_id)
+        if auction.message_id is None:
+            await interaction.response.send_message(
+                "❌ This auction is still being posted. Try again once its message is up.",
+                ephemeral=True
+            )
+            return
         
-        # Update the auction message
-        try:
-            channel = self.bot.get_channel(auction.channel_id)
-            if channel:
-                message = await channel.fetch_message(auction.message_id)
-                if message:
-                    embed = discord.Embed(
-                        title=f"Auction: {auction.item_name} [ENDED EARLY]",
-                        description=f"This auction was ended early by an administrator.",
-                        color=discord.Color.orange()
-                    )
-                    
-                    if auction.highest_bidder_id:
-                        winner = self.bot.get_user(auction.highest_bidder_id)
-                        winner_mention = winner.mention if winner else f"User ID: {auction.highest_bidder_id}"
-                        
-                        # Display winner according to anonymous setting
-                        if auction.anonymous_bidding:
-                            embed.add_field(
-                                name="Winner", 
-                                value="Anonymous",
-                                inline=True
-                            )
-                            
-                            # Private notification to winner
-                            try:
-                                if winner:
-                                    await winner.send(f"🏆 Congratulations! You won the auction for **{auction.item_name}** with a bid of **{auction.highest_bid} {auction.currency}**!")
-                            except:
-                                # Could not DM the winner
-                                pass
-                                
-                            # Public announcement without mentioning the winner
-                            await channel.send(
-                                f"🏆 **Auction Ended Early!** The auction for **{auction.item_name}** has ended with a winning bid of **{auction.highest_bid} {auction.currency}**. The winner has been notified."
-                            )
-                        else:
-                            embed.add_field(
-                                name="Winner", 
-                                value=winner_mention,
-                                inline=True
-                            )
-                            
-                            # Announce the winner publicly
-                            await channel.send(
-                                f"🏆 **Auction Ended Early!** Congratulations to {winner_mention} for winning the **{auction.item_name}** with a bid of **{auction.highest_bid} {auction.currency}**!"
-                            )
-                            
-                        embed.add_field(
-                            name="Winning Bid", 
-                            value=f"{auction.highest_bid} {auction.currency}",
-                            inline=True
-                        )
-                    else:
-                        embed.add_field(
-                            name="Result", 
-                            value="No bids were placed.",
-                            inline=False
-                        )
-                        
-                        # Announce no winner
-                        await channel.send(
-                            f"⏱️ **Auction Ended Early!** The auction for **{auction.item_name}** has ended with no bids."
-                        )
-                    
-                    await message.edit(embed=embed, view=None)
-                    
-                    await interaction.response.send_message(
-                        f"✅ Auction #{auction_id} for **{auction.item_name}** has been ended.",
-                        ephemeral=True
-                    )
-        except Exception as e:
+        # End the auction; the message is updated and the result announced
+        # in the background
+        guild.manager.end_auction(auction_id, early=True)
+        closing = guild.closer.start(auction, early=True)
+        
+        await interaction.response.send_message(
+            f"✅ Auction #{auction_id} for **{auction.item_name}** has been ended.",
+            ephemeral=True
+        )
+        guild.jobs.run(
+            interaction,
+            _closing_result(closing, auction, "ended"),
+            f"❌ Failed to close auction #{auction_id}"
+        )
+    
+    # Slash command for bidding without the modal
+    @app_commands.command(name="bid", description="Place a bid on an auction")
+    @app_commands.describe(auction_id="ID of the auction to bid on", amount="Amount to bid")
+    async def auction_bid(self, interaction: discord.Interaction, auction_id: int, amount: int):
+        """Place a bid in a single interaction"""
+        with bid_submit_seconds.time():
+            guild = self._guild(interaction.guild_id)
+            await _submit_bid(interaction, guild.manager, guild.publisher, auction_id, amount)
+    
+    # Slash command for registering a hidden maximum bid
+    @app_commands.command(name="maxbid", description="Bid automatically up to a hidden maximum")
+    @app_commands.describe(auction_id="ID of the auction to bid on", amount="The most you are willing to pay")
+    async def auction_maxbid(self, interaction: discord.Interaction, auction_id: int, amount: int):
+        """Register a maximum bid; the bot bids for the user up to it"""
+        guild = self._guild(interaction.guild_id)
+        auction = guild.manager.get_auction(auction_id)
+        if not auction or auction.is_ended():
+            await interaction.response.send_message("This auction is not running.", ephemeral=True)
+            return
+        if auction.message_id is None:
+            await interaction.response.send_message(
+                "This auction is still being posted. Try again in a moment.",
+                ephemeral=True
+            )
+            return
+        
+        current_max = auction.proxy_bids.get(interaction.user.id) if auction.proxy_bids else None
+        if current_max is not None and amount <= current_max:
             await interaction.response.send_message(
-                f"⚠️ Could not update the original auction message: {e}",
+                f"Your maximum bid is already {current_max} {auction.currency}; you can only raise it.",
                 ephemeral=True
             )
+            return
+        
+        leading = auction.highest_bidder_id == interaction.user.id
+        min_max = auction.highest_bid + 1 if leading else auction.min_next_bid()
+        if amount < min_max:
+            await interaction.response.send_message(
+                f"Your maximum bid must be at least {min_max} {auction.currency}.",
+                ephemeral=True
+            )
+            return
+        
+        version = auction.version
+        if not guild.manager.set_max_bid(auction.id, interaction.user.id, interaction.user.name, amount):
+            await interaction.response.send_message("Failed to set your maximum bid.", ephemeral=True)
+            return
+        if auction.version != version:
+            channel = self.bot.get_channel(auction.channel_id) or interaction.channel
+            guild.publisher.schedule(channel, auction)
+        
+        if auction.highest_bidder_id == interaction.user.id:
+            status = f"You are the highest bidder at {auction.highest_bid} {auction.currency}."
+        else:
+            status = (
+                f"Another bidder's maximum is higher, so you are not leading. "
+                f"The current bid is {auction.highest_bid} {auction.currency}."
+            )
+        await interaction.response.send_message(
+            f"Maximum bid of {amount} {auction.currency} set for auction #{auction.id}. {status} "
+            f"Only you can see your maximum.",
+            ephemeral=True
+        )
     
     # Slash command for listing active auctions
     @app_commands.command(name="list", description="List all active auctions")
-    async def auction_list(self, interaction: discord.Interaction):
-        """List all active auctions"""
-        active_auctions = self.auction_manager.get_active_auctions()
+    @app_commands.describe(
+        order="Sort by soonest ending or newest (default: ending)",
+        channel="Only show auctions in this channel",
+        currency="Only show auctions in this currency",
+        ending_soon="Only show auctions ending within the next hour"
+    )
+    async def auction_list(
+        self,
+        interaction: discord.Interaction,
+        order: Literal["ending", "newest"] = "ending",
+        channel: Optional[discord.TextChannel] = None,
+        currency: Optional[str] = None,
+        ending_soon: Literal["yes", "no"] = "no"
+    ):
+        """List active auctions one page at a time"""
+        view = AuctionListView(
+            self._guild(interaction.guild_id).manager,
+            interaction.user.id,
+            interaction.guild_id,
+            order,
+            channel.id if channel else None,
+            currency,
+            self.ENDING_SOON_SECONDS if ending_soon == "yes" else None
+        )
+        embed = view.render()
         
-        if not active_auctions:
+        if embed is None:
             await interaction.response.send_message("📢 There are no active auctions at the moment.", ephemeral=True)
             return
         
-        embed = discord.Embed(
-            title="Active Auctions",
-            description="Here are all the current active auctions:",
-            color=discord.Color.blue()
-        )
-        
-        for auction_id, auction in active_auctions.items():
-            # Display emblem if available and not auto-deleted
-            embed_str = ""
-            if auction.emblem_url and not (auction.ended and auction.auto_delete_emblem):
-                embed_str = f"[📷]({auction.emblem_url}) "
-                
-            # Handle highest bidder display based on anonymous setting
-            if auction.highest_bidder_name and auction.anonymous_bidding:
-                bidder_display = "Anonymous"
-            else:
-                bidder_display = auction.highest_bidder_name if auction.highest_bidder_name else 'None'
-                
-            embed.add_field(
-                name=f"{embed_str}#{auction_id}: {auction.item_name}",
-                value=(
-                    f"Owner: <@{auction.creator_id}>\n"
-                    f"Current Bid: {auction.highest_bid} {auction.currency}\n"
-                    f"Highest Bidder: {bidder_display}\n"
-                    f"Ends: <t:{int(auction.end_time.timestamp())}:R>\n"
-                    f"[Jump to Auction](https://discord.com/channels/{interaction.guild_id}/{auction.channel_id}/{auction.message_id})"
-                ),
-                inline=False
-            )
-        
-        await interaction.response.send_message(embed=embed)
+        if view.next_cursor is None:
+            # Everything fits on one page
+            await interaction.response.send_message(embed=embed)
+            return
+        await interaction.response.send_message(embed=embed, view=view)
     
     # Slash command for getting auction info
     @app_commands.command(name="info", description="Get detailed information about an auction")
     @app_commands.describe(auction_id="ID of the auction to get info about")
     async def auction_info(self, interaction: discord.Interaction, auction_id: int):
         """Get detailed information about an auction"""
-        auction = self.auction_manager.get_auction(auction_id)
+        auction = self._guild(interaction.guild_id).manager.get_auction(auction_id)
         if not auction:
             await interaction.response.send_message("❌ Auction not found.", ephemeral=True)
             return
@@ -507,12 +1427,8 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
         if auction.emblem_url and not (auction.ended and auction.auto_delete_emblem):
             embed.set_thumbnail(url=auction.emblem_url)
         
-        # Get owner name
-        try:
-            owner = self.bot.get_user(auction.creator_id)
-            owner_name = owner.name if owner else f"User ID: {auction.creator_id}"
-        except:
-            owner_name = f"User ID: {auction.creator_id}"
+        # Get owner name without waiting; an unknown owner is fetched for next time
+        owner_name = self.user_names.get(auction.creator_id) or f"User ID: {auction.creator_id}"
         
         # Add owner field
         embed.add_field(
@@ -560,8 +1476,7 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
             if auction.anonymous_bidding:
                 bidder_name = "Anonymous"
             else:
-                highest_bidder = self.bot.get_user(auction.highest_bidder_id)
-                bidder_name = highest_bidder.name if highest_bidder else auction.highest_bidder_name
+                bidder_name = self.user_names.get(auction.highest_bidder_id) or auction.highest_bidder_name
                 
             embed.add_field(
                 name="Highest Bidder", 
@@ -586,14 +1501,14 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
             )
         
         # Add time information
-        created_at = int(auction.created_at.timestamp())
+        created_at = auction.created_ts
         embed.add_field(
             name="Created At", 
             value=f"<t:{created_at}:F> (<t:{created_at}:R>)", 
             inline=False
         )
         
-        end_time = int(auction.end_time.timestamp())
+        end_time = auction.end_ts
         embed.add_field(
             name="Ends At", 
             value=f"<t:{end_time}:F> (<t:{end_time}:R>)", 
@@ -609,6 +1524,147 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
         
         await interaction.response.send_message(embed=embed)
     
+    # Slash command for browsing the bids of an auction
+    @app_commands.command(name="history", description="Show the bid history of an auction")
+    @app_commands.describe(auction_id="ID of the auction", page="Page of bids to show, newest first (default: 1)")
+    async def auction_history(self, interaction: discord.Interaction, auction_id: int, page: int = 1):
+        """Show one page of an auction's bids, newest first"""
+        auction = self._guild(interaction.guild_id).manager.get_auction(auction_id)
+        if not auction:
+            await interaction.response.send_message("❌ Auction not found.", ephemeral=True)
+            return
+        
+        history = auction.bid_history
+        pages = max(1, -(-len(history) // self.HISTORY_PAGE_SIZE))
+        if not 1 <= page <= pages:
+            await interaction.response.send_message(f"❌ Page must be between 1 and {pages}.", ephemeral=True)
+            return
+        
+        # Only the bids on this page are read, counting back from the newest
+        newest = len(history) - 1 - (page - 1) * self.HISTORY_PAGE_SIZE
+        lines = []
+        for index in range(newest, max(-1, newest - self.HISTORY_PAGE_SIZE), -1):
+            bid = history[index]
+            if auction.anonymous_bidding:
+                bidder = f"Bidder {history.name_indexes[index] + 1}"
+            else:
+                bidder = bid.bidder_name
+            lines.append(f"`#{index + 1}` {bid.amount} {auction.currency} by {bidder} <t:{bid.time_ms // 1000}:R>")
+        
+        embed = discord.Embed(
+            title=f"Bid History: {auction.item_name}",
+            description="\n".join(lines) or "No bids yet.",
+            color=discord.Color.blue()
+        )
+        
+        # Rate over the auction's running time so far
+        elapsed_minutes = max(1.0, (min(time.time(), auction.end_ts) - auction.created_ts) / 60)
+        embed.add_field(name="Bids", value=str(len(history)), inline=True)
+        embed.add_field(name="Bidders", value=str(history.bidder_count), inline=True)
+        embed.add_field(name="Bids per Minute", value=f"{len(history) / elapsed_minutes:.2f}", inline=True)
+        embed.set_footer(text=f"Auction ID: {auction_id} | Page {page}/{pages}")
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    # Slash command for guild-wide auction statistics
+    @app_commands.command(name="stats", description="Show auction statistics for this server")
+    @app_commands.checks.has_permissions(manage_messages=True)
+    async def auction_stats(self, interaction: discord.Interaction):
+        """Show the running auction statistics of this guild"""
+        stats = self._guild(interaction.guild_id).manager.stats
+        embed = discord.Embed(title="Auction Statistics", color=discord.Color.blue())
+        
+        embed.add_field(
+            name="Bids",
+            value=(
+                f"Total: {stats.total_bids}\n"
+                f"Unique bidders: {len(stats.bidders)}\n"
+                f"Last {stats.RATE_WINDOW} min: {stats.bids_per_minute():.2f}/min"
+            ),
+            inline=False
+        )
+        
+        top = stats.top_bidders(10)
+        embed.add_field(
+            name="Top Bidders",
+            value="\n".join(
+                f"{rank}. {name or f'User ID: {bidder_id}'}: {count} bids"
+                for rank, (bidder_id, name, count) in enumerate(top, start=1)
+            ) or "None yet",
+            inline=False
+        )
+        
+        for currency, totals in sorted(stats.currencies.items())[:20]:
+            value = (
+                f"Sold: {totals['sold']}\n"
+                f"Average final price: {totals['final_total'] / totals['sold']:.2f} {currency}"
+            )
+            if totals['ratio_count']:
+                value += f"\nAverage final/starting: {totals['ratio_total'] / totals['ratio_count']:.2f}×"
+            embed.add_field(name=f"Sales in {currency}"[:256], value=value, inline=True)
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
+    # Slash command for viewing runtime metrics
+    @app_commands.command(name="metrics", description="Show auction bot runtime metrics (admin only)")
+    @app_commands.checks.has_permissions(administrator=True)
+    async def auction_metrics(self, interaction: discord.Interaction):
+        """Show a summary of the runtime metrics"""
+        embed = discord.Embed(title="Auction Bot Metrics", color=discord.Color.blue())
+        
+        rejected = sorted(bids_rejected.series(), key=lambda item: -item[1])
+        embed.add_field(
+            name="Bids",
+            value=(
+                f"Accepted: {int(bids_accepted.get())}\n"
+                f"Rejected: {int(sum(value for _, value in rejected))}\n"
+                + "".join(f"- {labels['reason']}: {int(value)}\n" for labels, value in rejected)
+            ),
+            inline=False
+        )
+        
+        for name, histogram in (
+            ("Bid submit", bid_submit_seconds),
+            ("Embed render", embed_render_seconds),
+            ("Save data", save_data_seconds),
+        ):
+            if histogram.count():
+                value = (
+                    f"Count: {histogram.count()}\n"
+                    f"p50 ≤ {_format_seconds(histogram.quantile(0.5))}\n"
+                    f"p99 ≤ {_format_seconds(histogram.quantile(0.99))}"
+                )
+            else:
+                value = "No data yet"
+            embed.add_field(name=name, value=value, inline=True)
+        
+        embed.add_field(
+            name="Scheduler lag",
+            value=_format_seconds(scheduler_lag_seconds.get()),
+            inline=True
+        )
+        
+        routes = sorted(rest_requests.series(), key=lambda item: -item[1])[:10]
+        embed.add_field(
+            name="REST calls by route",
+            value="\n".join(f"`{labels['route']}`: {int(value)}" for labels, value in routes)[:1024] or "None yet",
+            inline=False
+        )
+        
+        # Notifications that gave up, most recent first
+        dead_letters = self.outbox.dead_letters(5)
+        lines = [
+            f"#{notification.id} to {notification.kind} {notification.destination_id}: {(error or 'unknown error')[:100]}"
+            for notification, error in dead_letters
+        ]
+        embed.add_field(
+            name=f"Undelivered notifications ({self.outbox.dead_letter_count()})",
+            value="\n".join(lines)[:1024] or "None",
+            inline=False
+        )
+        
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+    
     # Slash command for help
     @app_commands.command(name="help", description="Show help for auction commands")
     async def auction_help(self, interaction: discord.Interaction):
@@ -636,6 +1692,17 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
             inline=False
         )
         
+        embed.add_field(
+            name="/auction batch <manifest>",
+            value=(
+                "Start many auctions from an attached CSV or JSON file (requires Manage Messages permission)\n"
+                "- Columns: item_name, starting_bid, bid_increment, duration, and optionally "
+                "currency, emblem_url, anonymous, auto_delete_emblem\n"
+                "- Nothing is started unless every row is valid"
+            ),
+            inline=False
+        )
+        
         embed.add_field(
             name="/auction end <auction_id>",
             value="End an auction early (admin only)",
@@ -643,8 +1710,25 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
         )
         
         embed.add_field(
-            name="/auction list",
-            value="List all active auctions",
+            name="/auction bid <auction_id> <amount>",
+            value="Place a bid without opening the bid form. The auction message also has +1× and +5× increment buttons",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="/auction maxbid <auction_id> <amount>",
+            value="Set a hidden maximum. The bot outbids others for you, one increment at a time, up to it",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="/auction list [order] [channel] [currency] [ending_soon]",
+            value=(
+                "List active auctions, 10 per page\n"
+                "- order: 'ending' or 'newest' (default: 'ending')\n"
+                "- channel, currency: Optional filters\n"
+                "- ending_soon: 'yes' to only show auctions ending within an hour"
+            ),
             inline=False
         )
         
@@ -654,7 +1738,157 @@ class AuctionCog(commands.GroupCog, group_name="auction"):
             inline=False
         )
         
+        embed.add_field(
+            name="/auction history <auction_id> [page]",
+            value="Show an auction's bids, newest first, 10 per page. Anonymous auctions show numbered bidders",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="/auction stats",
+            value="Show bid totals, top bidders and sale prices per currency for this server (requires Manage Messages permission)",
+            inline=False
+        )
+        
+        embed.add_field(
+            name="/auction metrics",
+            value="Show bid, latency, scheduler and REST call metrics (admin only)",
+            inline=False
+        )
+        
         await interaction.response.send_message(embed=embed)
 
+def _parse_duration(duration: str) -> int:
+    """Parse a duration like 1h, 30m, 1d or 1d12h into seconds"""
+    duration_seconds = 0
+    
+    if 'd' in duration:
+        days = int(duration.split('d')[0])
+        duration_seconds += days * 86400
+        duration = duration.split('d')[1]
+    
+    if 'h' in duration:
+        hours = int(duration.split('h')[0])
+        duration_seconds += hours * 3600
+        duration = duration.split('h')[1]
+    
+    if 'm' in duration:
+        minutes = int(duration.split('m')[0])
+        duration_seconds += minutes * 60
+    
+    if duration_seconds <= 0:
+        raise ValueError("Invalid duration")
+    return duration_seconds
+
+# Columns of an /auction batch manifest; the first four are required
+MANIFEST_COLUMNS = (
+    "item_name", "starting_bid", "bid_increment", "duration",
+    "currency", "emblem_url", "anonymous", "auto_delete_emblem"
+)
+
+def _parse_manifest(filename: str, data: bytes) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Read auctions from a CSV or JSON manifest
+
+    Returns keyword arguments for AuctionManager.create_auctions, without
+    creator and channel, and one error per invalid row.
+    """
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return [], ["The manifest must be a UTF-8 text file."]
+    
+    if filename.lower().endswith(".json"):
+        try:
+            rows = json.loads(text, object_pairs_hook=_unique_keys)
+        except json.JSONDecodeError as e:
+            return [], [f"The manifest is not valid JSON: {e}"]
+        except ValueError as e:
+            return [], [f"The manifest has a {e}."]
+        if isinstance(rows, dict):
+            rows = rows.get("auctions")
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            return [], ['A JSON manifest must be a list of auctions, or an object with an "auctions" list.']
+    else:
+        reader = csv.DictReader(io.StringIO(text))
+        columns = reader.fieldnames or []
+        duplicates = sorted({name for name in columns if columns.count(name) > 1})
+        if duplicates:
+            # csv.DictReader would silently keep only the last of them
+            return [], [f"The manifest header repeats the column {', '.join(duplicates)}."]
+        rows = list(reader)
+    
+    specs = []
+    errors = []
+    for number, row in enumerate(rows, start=1):
+        try:
+            specs.append(_manifest_row(row))
+        except ValueError as e:
+            errors.append(f"Row {number}: {e}")
+    return specs, errors
+
+def _unique_keys(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    """Build a JSON object, refusing keys that appear twice instead of keeping the last"""
+    keys = [key for key, _ in pairs]
+    duplicates = sorted({key for key in keys if keys.count(key) > 1})
+    if duplicates:
+        raise ValueError(f"duplicate key {', '.join(duplicates)}")
+    return dict(pairs)
+
+def _manifest_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    if None in row:
+        # csv.DictReader files surplus values under None
+        raise ValueError("more values than columns")
+    unknown = [str(name) for name in row if name not in MANIFEST_COLUMNS]
+    if unknown:
+        raise ValueError(f"unknown column {', '.join(unknown)}")
+    
+    values = {name: str(value).strip() for name, value in row.items() if value is not None and str(value).strip()}
+    missing = [name for name in MANIFEST_COLUMNS[:4] if name not in values]
+    if missing:
+        raise ValueError(f"missing {', '.join(missing)}")
+    
+    item_name = values["item_name"]
+    if len(item_name) > 256:
+        raise ValueError("item_name is longer than 256 characters")
+    try:
+        starting_bid = int(values["starting_bid"])
+        bid_increment = int(values["bid_increment"])
+    except ValueError:
+        raise ValueError("starting_bid and bid_increment must be whole numbers")
+    if starting_bid < 0 or bid_increment < 1:
+        raise ValueError("starting_bid can't be negative and bid_increment must be at least 1")
+    try:
+        duration_seconds = _parse_duration(values["duration"])
+    except ValueError:
+        raise ValueError(f"invalid duration '{values['duration']}', use a format like 1h, 30m, 1d or 1d12h")
+    emblem_url = values.get("emblem_url")
+    if emblem_url and not emblem_url.startswith(("http://", "https://")):
+        raise ValueError("emblem_url must be an http(s) URL")
+    
+    flags = {}
+    for name in ("anonymous", "auto_delete_emblem"):
+        flag = values.get(name, "no").lower()
+        if flag not in ("yes", "no", "true", "false"):
+            raise ValueError(f"{name} must be yes or no")
+        flags[name] = flag in ("yes", "true")
+    
+    return {
+        "item_name": item_name,
+        "starting_bid": starting_bid,
+        "bid_increment": bid_increment,
+        "duration_seconds": duration_seconds,
+        "currency": values.get("currency", "coins"),
+        "emblem_url": emblem_url,
+        "anonymous_bidding": flags["anonymous"],
+        "auto_delete_emblem": flags["auto_delete_emblem"]
+    }
+
+def _format_seconds(seconds: float) -> str:
+    if seconds == float("inf"):
+        return "> 10 s"
+    if seconds < 1:
+        return f"{seconds * 1000:.3g} ms"
+    return f"{seconds:.3g} s"
+
 async def setup(bot):
     await bot.add_cog(AuctionCog(bot))
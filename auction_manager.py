@@ -1,15 +1,225 @@
 import datetime
 import discord
+import heapq
 import json
+import mmap
 import os
 import pickle
 import logging
-from typing import Dict, Optional, List, Tuple
+import sqlite3
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, defaultdict
+from typing import Any, Callable, Dict, Iterator, Optional, List, Set, Tuple
+
+from utils.metrics import embed_render_seconds, save_data_seconds
 
 logger = logging.getLogger('auction_bot')
 
+# Closing states of an ended auction. A closing moves from ending (announcements
+# pending) to announced (final message edit pending) to finalized.
+CLOSE_ENDING = "ending"
+CLOSE_ANNOUNCED = "announced"
+CLOSE_FINALIZED = "finalized"
+
+class BidView:
+    """Read-only view of one bid in a BidHistory
+
+    Supports both attribute access and the dict-style access used by the
+    original list-of-dicts history, e.g. bid["amount"].
+    """
+    __slots__ = ('_history', '_index')
+    
+    FIELDS = ("bidder_id", "bidder_name", "amount", "time")
+    
+    def __init__(self, history: "BidHistory", index: int):
+        self._history = history
+        self._index = index
+    
+    @property
+    def bidder_id(self) -> int:
+        return self._history.bidder_ids[self._index]
+    
+    @property
+    def bidder_name(self) -> str:
+        return self._history.names[self._history.name_indexes[self._index]]
+    
+    @property
+    def amount(self) -> int:
+        return self._history.amounts[self._index]
+    
+    @property
+    def time_ms(self) -> int:
+        return self._history.times_ms[self._index]
+    
+    @property
+    def time(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.time_ms / 1000)
+    
+    def __getitem__(self, key: str):
+        if key not in self.FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+
+class BidHistory:
+    """Column-wise bid history stored in compact typed arrays
+
+    Each bid costs a few machine words instead of a dict and a datetime.
+    Bidder names are stored once per auction and referenced by index.
+    Indexing and iterating yield BidView objects. The number of distinct
+    bidders is kept as bids are appended.
+    """
+    __slots__ = (
+        'bidder_ids', 'amounts', 'times_ms', 'name_indexes', 'names', 'bidder_count',
+        '_name_lookup', '_bidders'
+    )
+    
+    def __init__(self):
+        self.bidder_ids = array('q')
+        self.amounts = array('q')
+        self.times_ms = array('q')  # Epoch milliseconds
+        self.name_indexes = array('I')
+        self.names: List[str] = []
+        self.bidder_count = 0
+        self._name_lookup: Dict[str, int] = {}
+        # Distinct bidder IDs, or None until a decoded history gets a new bid
+        self._bidders: Optional[Set[int]] = set()
+    
+    def append(self, bidder_id: int, bidder_name: str, amount: int, time_ms: int):
+        """Record a bid"""
+        name_index = self._name_lookup.get(bidder_name)
+        if name_index is None:
+            name_index = len(self.names)
+            self.names.append(sys.intern(bidder_name))
+            self._name_lookup[bidder_name] = name_index
+        if self._bidders is None:
+            self._bidders = set(self.bidder_ids)
+        if bidder_id not in self._bidders:
+            self._bidders.add(bidder_id)
+            self.bidder_count += 1
+        self.bidder_ids.append(bidder_id)
+        self.amounts.append(amount)
+        self.times_ms.append(time_ms)
+        self.name_indexes.append(name_index)
+    
+    def __len__(self) -> int:
+        return len(self.amounts)
+    
+    def __getitem__(self, index: int) -> BidView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("bid index out of range")
+        return BidView(self, index)
+    
+    def __iter__(self) -> Iterator[BidView]:
+        for index in range(len(self)):
+            yield BidView(self, index)
+    
+    def __getstate__(self):
+        # The name lookup is rebuilt from the names on load
+        return (self.bidder_ids, self.amounts, self.times_ms, self.name_indexes, self.names)
+    
+    def __setstate__(self, state):
+        self.bidder_ids, self.amounts, self.times_ms, self.name_indexes, self.names = state
+        self._name_lookup = {name: index for index, name in enumerate(self.names)}
+        self._bidders = set(self.bidder_ids)
+        self.bidder_count = len(self._bidders)
+
+
+class ProxyBids:
+    """Private maximum bids registered for an auction
+
+    Maximums sit in a heap ordered by amount and then by registration order,
+    so the two highest are found in O(log n). Replaced maximums are dropped
+    lazily when they reach the top of the heap.
+    """
+    __slots__ = ('maxes', 'names', 'seq', '_heap')
+    
+    def __init__(self):
+        # bidder_id -> (maximum amount, registration sequence number)
+        self.maxes: Dict[int, Tuple[int, int]] = {}
+        self.names: Dict[int, str] = {}
+        self.seq = 0
+        self._heap: List[Tuple[int, int, int]] = []
+    
+    def set(self, bidder_id: int, bidder_name: str, amount: int, seq: Optional[int] = None) -> int:
+        """Register or replace a bidder's maximum and return its sequence number"""
+        if seq is None:
+            seq = self.seq + 1
+        self.seq = max(self.seq, seq)
+        self.maxes[bidder_id] = (amount, seq)
+        self.names[bidder_id] = bidder_name
+        # Higher amounts first; on equal amounts the earlier maximum wins
+        heapq.heappush(self._heap, (-amount, seq, bidder_id))
+        return seq
+    
+    def get(self, bidder_id: int) -> Optional[int]:
+        entry = self.maxes.get(bidder_id)
+        return entry[0] if entry else None
+    
+    def top_two(self) -> Tuple[Optional[int], Optional[int], Optional[int]]:
+        """Get the leading bidder, their maximum and the runner-up's maximum"""
+        leader = self._pop_current()
+        if leader is None:
+            return None, None, None
+        runner_up = self._pop_current()
+        heapq.heappush(self._heap, leader)
+        if runner_up is None:
+            return leader[2], -leader[0], None
+        heapq.heappush(self._heap, runner_up)
+        return leader[2], -leader[0], -runner_up[0]
+    
+    def _pop_current(self) -> Optional[Tuple[int, int, int]]:
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            negative_amount, seq, bidder_id = entry
+            if self.maxes.get(bidder_id) == (-negative_amount, seq):
+                return entry
+        return None
+    
+    def __len__(self) -> int:
+        return len(self.maxes)
+    
+    def __getstate__(self):
+        # The heap is rebuilt from the maximums on load
+        return (self.maxes, self.names, self.seq)
+    
+    def __setstate__(self, state):
+        self.maxes, self.names, self.seq = state
+        self._heap = [(-amount, seq, bidder_id) for bidder_id, (amount, seq) in self.maxes.items()]
+        heapq.heapify(self._heap)
+
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+
 class Auction:
-    """Class representing an auction"""
+    """Class representing an auction
+
+    Auctions use __slots__ and store times as integer epoch seconds, since a
+    bot can hold many thousands of them. created_at and end_time are still
+    available as datetimes.
+    """
+    __slots__ = (
+        'id', 'item_name', 'starting_bid', 'bid_increment', 'highest_bid',
+        'highest_bidder_id', 'highest_bidder_name', 'created_ts', 'end_ts',
+        'ended', 'cancelled', 'creator_id', 'channel_id', 'message_id',
+        'bid_history', 'currency', 'emblem_url', 'best_offer',
+        'anonymous_bidding', 'auto_delete_emblem', 'version', 'close_state',
+        'proxy_bids', 'ended_early'
+    )
+    
     def __init__(
         self, 
         id: int, 
@@ -31,24 +241,80 @@ class Auction:
         self.highest_bid = starting_bid
         self.highest_bidder_id = None
         self.highest_bidder_name = None
-        self.created_at = datetime.datetime.now()
-        self.end_time = self.created_at + datetime.timedelta(seconds=duration_seconds)
+        self.created_ts = int(time.time())
+        self.end_ts = self.created_ts + duration_seconds
         self.ended = False
         self.cancelled = False
         self.creator_id = creator_id
         self.channel_id = channel_id
         self.message_id = None
-        self.bid_history = []
+        self.bid_history = BidHistory()
         self.currency = currency
         self.emblem_url = emblem_url
         self.best_offer = starting_bid  # Track best offer separately
         self.anonymous_bidding = anonymous_bidding  # Whether bidders remain anonymous
         self.auto_delete_emblem = auto_delete_emblem  # Whether to delete emblem when auction ends
+        self.version = 0  # Bumped on every visible state change, used to order message updates
+        self.close_state = None  # Progress of closing once the auction has ended
+        self.proxy_bids: Optional[ProxyBids] = None  # Private maximum bids, created on first use
+        self.ended_early = False  # Ended by an administrator, announced as such when closing resumes
+    
+    @property
+    def created_at(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.created_ts)
+    
+    @created_at.setter
+    def created_at(self, value: datetime.datetime):
+        self.created_ts = int(value.timestamp())
+    
+    @property
+    def end_time(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.end_ts)
+    
+    @end_time.setter
+    def end_time(self, value: datetime.datetime):
+        self.end_ts = int(value.timestamp())
+    
+    def __getstate__(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+    
+    def __setstate__(self, state):
+        if 'created_at' in state:
+            state = self._upgrade_state(state)
+        # Auctions pickled before maximum bids or early ends existed have neither
+        self.proxy_bids = None
+        self.ended_early = False
+        for slot, value in state.items():
+            setattr(self, slot, value)
+    
+    @staticmethod
+    def _upgrade_state(state: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert the __dict__ of an auction pickled before __slots__ were used"""
+        state = dict(state)
+        state['created_ts'] = int(state.pop('created_at').timestamp())
+        state['end_ts'] = int(state.pop('end_time').timestamp())
+        history = BidHistory()
+        for bid in state.get('bid_history', []):
+            history.append(bid["bidder_id"], bid["bidder_name"], bid["amount"], int(bid["time"].timestamp() * 1000))
+        state['bid_history'] = history
+        # Auctions pickled before versioning was added have no version yet
+        state.setdefault('version', 0)
+        # Auctions that ended before close states existed were already announced
+        state.setdefault('close_state', CLOSE_FINALIZED if state.get('ended') else None)
+        return state
+    
+    def min_next_bid(self) -> int:
+        """Get the minimum amount the next bid must reach"""
+        return self.highest_bid + self.bid_increment
     
     def place_bid(self, bidder_id: int, bidder_name: str, bid_amount: int) -> bool:
-        """Place a bid on this auction"""
-        # Don't allow bids on ended auctions
-        if self.ended:
+        """Place a bid on this auction
+
+        The checks and the update run without yielding to the event loop, so
+        this is an atomic compare-and-set against the live highest bid.
+        """
+        # Don't allow bids on ended auctions, even if they haven't been closed yet
+        if self.is_ended():
             return False
         
         # Don't allow bids that aren't higher than the current highest bid
@@ -65,12 +331,8 @@ class Auction:
         self.highest_bidder_name = bidder_name
         
         # Add to bid history
-        self.bid_history.append({
-            "bidder_id": bidder_id,
-            "bidder_name": bidder_name,
-            "amount": bid_amount,
-            "time": datetime.datetime.now()
-        })
+        self.bid_history.append(bidder_id, bidder_name, bid_amount, _now_ms())
+        self.version += 1
         
         return True
     
@@ -80,52 +342,1691 @@ class Auction:
             return True
         
         # Check if the end time has passed
-        now = datetime.datetime.now()
-        if now >= self.end_time:
-            return True
+        return time.time() >= self.end_ts
+
+
+class AuctionStats:
+    """Running totals behind /auction stats
+
+    Updated as bids are placed and auctions end, so answering never walks
+    bid histories. Bids on anonymous auctions count towards the totals but
+    are not attributed to their bidders.
+    """
+    # Minutes of per-minute bid counts kept for the recent bid rate
+    RATE_WINDOW = 60
+    
+    def __init__(self):
+        self.total_bids = 0
+        self.bidders: Set[int] = set()
+        # Bids per bidder on auctions that show bidders, their latest names,
+        # and the same counts ranked as sorted (-bids, bidder_id)
+        self.public_bids: Dict[int, int] = {}
+        self.names: Dict[int, str] = {}
+        self._ranking: List[Tuple[int, int]] = []
+        # currency -> sold, total of final prices, and total and count of
+        # final/starting price ratios (auctions starting at 0 have none)
+        self.currencies: Dict[str, Dict[str, float]] = {}
+        # Epoch minute -> bids, for the RATE_WINDOW minutes up to the latest bid
+        self.minutes: Dict[int, int] = {}
+        self.latest_minute = 0
+    
+    def add_bid(self, auction: Auction, bidder_id: int, bidder_name: str, time_ms: int):
+        self.total_bids += 1
+        self.bidders.add(bidder_id)
+        
+        minute = time_ms // 60000
+        if minute > self.latest_minute:
+            self.latest_minute = minute
+            for old in [m for m in self.minutes if m <= minute - self.RATE_WINDOW]:
+                del self.minutes[old]
+        if minute > self.latest_minute - self.RATE_WINDOW:
+            self.minutes[minute] = self.minutes.get(minute, 0) + 1
+        
+        if auction.anonymous_bidding:
+            return
+        count = self.public_bids.get(bidder_id, 0)
+        if count:
+            del self._ranking[bisect_left(self._ranking, (-count, bidder_id))]
+        self.public_bids[bidder_id] = count + 1
+        insort(self._ranking, (-count - 1, bidder_id))
+        self.names[bidder_id] = bidder_name
+    
+    def add_sale(self, auction: Auction):
+        """Count an ended auction's final price, if it sold"""
+        if auction.cancelled or auction.highest_bidder_id is None:
+            return
+        totals = self.currencies.setdefault(
+            auction.currency, {'sold': 0, 'final_total': 0, 'ratio_total': 0.0, 'ratio_count': 0}
+        )
+        totals['sold'] += 1
+        totals['final_total'] += auction.highest_bid
+        if auction.starting_bid > 0:
+            totals['ratio_total'] += auction.highest_bid / auction.starting_bid
+            totals['ratio_count'] += 1
+    
+    def add_auction(self, auction: Auction):
+        """Count everything an existing auction contributes, e.g. when rebuilding"""
+        for bid in auction.bid_history:
+            self.add_bid(auction, bid.bidder_id, bid.bidder_name, bid.time_ms)
+        if auction.ended:
+            self.add_sale(auction)
+    
+    def top_bidders(self, limit: int = 10) -> List[Tuple[int, str, int]]:
+        """Get (bidder_id, name, bids) of the bidders with the most public bids"""
+        return [
+            (bidder_id, self.names.get(bidder_id), -negative_count)
+            for negative_count, bidder_id in self._ranking[:limit]
+        ]
+    
+    def bids_per_minute(self, now_ms: Optional[int] = None) -> float:
+        """Get the average bid rate over the last RATE_WINDOW minutes"""
+        current = (now_ms if now_ms is not None else _now_ms()) // 60000
+        recent = sum(count for minute, count in self.minutes.items() if minute > current - self.RATE_WINDOW)
+        return recent / self.RATE_WINDOW
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_bids': self.total_bids,
+            'bidders': list(self.bidders),
+            'public_bids': [[bidder_id, count, self.names.get(bidder_id)] for bidder_id, count in self.public_bids.items()],
+            'currencies': {currency: dict(totals) for currency, totals in self.currencies.items()},
+            'minutes': list(self.minutes.items())
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AuctionStats":
+        stats = cls()
+        stats.total_bids = data['total_bids']
+        stats.bidders = set(data['bidders'])
+        for bidder_id, count, name in data['public_bids']:
+            stats.public_bids[bidder_id] = count
+            stats.names[bidder_id] = name
+        stats._ranking = sorted((-count, bidder_id) for bidder_id, count in stats.public_bids.items())
+        stats.currencies = data['currencies']
+        stats.minutes = {minute: count for minute, count in data['minutes']}
+        stats.latest_minute = max(stats.minutes, default=0)
+        return stats
+
+
+class AuctionJournal:
+    """Append-only log of auction state changes
+
+    Every change is written as one JSON line and fsync'd before returning, so
+    it survives a crash. On startup the journal is replayed on top of the last
+    snapshot. When it grows too long it is rotated into a segment file that a
+    background compaction folds into a new snapshot.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        self.segment_path = path + ".1"
+        self.seq = 0
+        # Sequence number of the last record in the rotated segment
+        self.segment_seq = 0
+        self.records = 0
+        self._file = None
+    
+    def open(self, seq: int):
+        """Open the journal for appending, continuing after sequence number seq"""
+        self.close()
+        self.seq = seq
+        # New records must start on a line of their own
+        self._truncate_torn_tail(self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+    
+    def close(self):
+        """Close the journal file"""
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def append(self, op: str, **fields) -> int:
+        """Durably append a record and return its sequence number"""
+        return self.append_many([(op, fields)])
+    
+    def append_many(self, records: List[Tuple[str, Dict[str, Any]]]) -> int:
+        """Durably append several (op, fields) records with a single fsync
+
+        Returns the sequence number of the last record.
+        """
+        lines = []
+        for op, fields in records:
+            self.seq += 1
+            lines.append(json.dumps({'seq': self.seq, 'op': op, **fields}, default=_json_default) + "\n")
+        self._file.write("".join(lines))
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self.records += len(lines)
+        return self.seq
+    
+    def rotate(self) -> bool:
+        """Move the current journal to the segment file for compaction
+
+        Returns False if a previous segment is still waiting to be compacted.
+        """
+        if os.path.exists(self.segment_path):
+            return False
+        self.close()
+        if os.path.exists(self.path):
+            os.replace(self.path, self.segment_path)
+            self.segment_seq = self.seq
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.records = 0
+        return True
+    
+    def discard_segment(self, seq: int):
+        """Remove the rotated segment if a snapshot up to seq covers all of it"""
+        if os.path.exists(self.segment_path) and self.segment_seq <= seq:
+            os.remove(self.segment_path)
+    
+    def reset(self):
+        """Discard all journal records after they were written to a snapshot"""
+        self.close()
+        for path in (self.segment_path, self.path):
+            if os.path.exists(path):
+                os.remove(path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self.records = 0
+    
+    @staticmethod
+    def _truncate_torn_tail(path: str):
+        """Cut off a partial last line left by a crash mid-write"""
+        if not os.path.exists(path):
+            return
+        with open(path, 'rb+') as f:
+            end = position = f.seek(0, os.SEEK_END)
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            if position < end:
+                logger.warning(f"Truncating {end - position} bytes of a torn record at the end of {path}")
+                f.truncate(position)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    @staticmethod
+    def read(path: str) -> Iterator[Dict[str, Any]]:
+        """Yield the records stored in a journal file"""
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # A crash mid-write can leave a torn last line
+                    logger.warning(f"Skipping unreadable journal record in {path}")
+
+
+def _json_default(value):
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__} to the journal")
+
+
+def _apply_journal_record(state: Dict[str, Any], record: Dict[str, Any]):
+    """Apply a single journal record to a snapshot state dict"""
+    auctions = state['auctions']
+    op = record['op']
+    if op == 'create':
+        auction = Auction(
+            id=record['id'],
+            item_name=record['item_name'],
+            starting_bid=record['starting_bid'],
+            bid_increment=record['bid_increment'],
+            duration_seconds=0,
+            creator_id=record['creator_id'],
+            channel_id=record['channel_id'],
+            currency=record['currency'],
+            emblem_url=record['emblem_url'],
+            anonymous_bidding=record['anonymous_bidding'],
+            auto_delete_emblem=record['auto_delete_emblem']
+        )
+        if 'created_ts' in record:
+            auction.created_ts = record['created_ts']
+            auction.end_ts = record['end_ts']
+        else:
+            auction.created_at = datetime.datetime.fromisoformat(record['created_at'])
+            auction.end_time = datetime.datetime.fromisoformat(record['end_time'])
+        auctions[auction.id] = auction
+        state['next_id'] = max(state['next_id'], auction.id + 1)
+        return
+    
+    unloaded = state.get('unloaded', {})
+    if op == 'archive':
+        # The auction was moved to the archive and no longer belongs in the snapshot
+        auctions.pop(record['id'], None)
+        unloaded.pop(record['id'], None)
+        return
+    
+    auction = auctions.get(record['id'])
+    if auction is None and record['id'] in unloaded:
+        # Auctions still encoded in the snapshot are decoded once a change reaches them
+        del unloaded[record['id']]
+        auction = auctions[record['id']] = state['snapshot'].get(record['id'])
+    if not auction:
+        logger.warning(f"Journal record {record['seq']} refers to unknown auction {record['id']}")
+        return
+    
+    if op == 'bid':
+        auction.highest_bid = record['amount']
+        auction.highest_bidder_id = record['bidder_id']
+        auction.highest_bidder_name = record['bidder_name']
+        if 'time_ms' in record:
+            time_ms = record['time_ms']
+        else:
+            time_ms = int(datetime.datetime.fromisoformat(record['time']).timestamp() * 1000)
+        auction.bid_history.append(record['bidder_id'], record['bidder_name'], record['amount'], time_ms)
+        auction.version += 1
+        if state.get('stats'):
+            state['stats'].add_bid(auction, record['bidder_id'], record['bidder_name'], time_ms)
+    elif op == 'message':
+        auction.message_id = record['message_id']
+    elif op == 'clock':
+        auction.created_ts = record['created_ts']
+        auction.end_ts = record['end_ts']
+    elif op == 'max_bid':
+        if auction.proxy_bids is None:
+            auction.proxy_bids = ProxyBids()
+        auction.proxy_bids.set(record['bidder_id'], record['bidder_name'], record['amount'], record['max_seq'])
+    elif op == 'end':
+        already_ended = auction.ended
+        auction.ended = True
+        auction.cancelled = record['cancelled']
+        auction.ended_early = record.get('early', False)
+        # Maximum bids mean nothing once the auction is over
+        auction.proxy_bids = None
+        auction.close_state = record.get('close_state', CLOSE_FINALIZED)
+        auction.version += 1
+        if state.get('stats') and not already_ended:
+            state['stats'].add_sale(auction)
+    elif op == 'close':
+        auction.close_state = record['close_state']
+    else:
+        logger.warning(f"Unknown journal operation '{op}' in record {record['seq']}")
+
+
+# Encoding of one auction in a snapshot: the fixed-size fields, then
+# length-prefixed UTF-8 strings, the bid history columns and maximum bids.
+# Optional IDs are stored as 0 with a flag bit saying whether they are set.
+_AUCTION_FIELDS = struct.Struct('<qqqqqqqqqqqIBB')
+_STRING_LENGTH = struct.Struct('<I')
+_NO_STRING = 0xFFFFFFFF
+_HISTORY_HEADER = struct.Struct('<III')
+_HISTORY_HEADER_V2 = struct.Struct('<II')
+_PROXY_HEADER = struct.Struct('<Iq')
+_PROXY_ENTRY = struct.Struct('<qqq')
+_ENDED, _CANCELLED, _ANONYMOUS, _AUTO_DELETE, _HAS_BIDDER, _HAS_MESSAGE, _ENDED_EARLY = (1 << bit for bit in range(7))
+_CLOSE_STATES = (None, CLOSE_ENDING, CLOSE_ANNOUNCED, CLOSE_FINALIZED)
+
+
+def _encode_string(value: Optional[str]) -> bytes:
+    if value is None:
+        return _STRING_LENGTH.pack(_NO_STRING)
+    data = value.encode('utf-8')
+    return _STRING_LENGTH.pack(len(data)) + data
+
+
+def _decode_string(data, offset: int) -> Tuple[Optional[str], int]:
+    (length,) = _STRING_LENGTH.unpack_from(data, offset)
+    offset += _STRING_LENGTH.size
+    if length == _NO_STRING:
+        return None, offset
+    return str(data[offset:offset + length], 'utf-8'), offset + length
+
+
+def _column_bytes(column: array) -> bytes:
+    # Columns are stored little-endian whatever the machine
+    if sys.byteorder != 'little':
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column.tobytes()
+
+
+def _read_column(typecode: str, data, offset: int, count: int) -> Tuple[array, int]:
+    column = array(typecode)
+    end = offset + count * column.itemsize
+    column.frombytes(data[offset:end])
+    if sys.byteorder != 'little':
+        column.byteswap()
+    return column, end
+
+
+def _encode_auction(auction: Auction) -> bytes:
+    """Encode an auction for a snapshot, without pickle"""
+    flags = (
+        (_ENDED if auction.ended else 0)
+        | (_CANCELLED if auction.cancelled else 0)
+        | (_ANONYMOUS if auction.anonymous_bidding else 0)
+        | (_AUTO_DELETE if auction.auto_delete_emblem else 0)
+        | (_HAS_BIDDER if auction.highest_bidder_id is not None else 0)
+        | (_HAS_MESSAGE if auction.message_id is not None else 0)
+        | (_ENDED_EARLY if auction.ended_early else 0)
+    )
+    parts = [_AUCTION_FIELDS.pack(
+        auction.id, auction.starting_bid, auction.bid_increment, auction.highest_bid,
+        auction.best_offer, auction.highest_bidder_id or 0, auction.created_ts, auction.end_ts,
+        auction.creator_id, auction.channel_id, auction.message_id or 0,
+        auction.version, flags, _CLOSE_STATES.index(auction.close_state)
+    )]
+    for value in (auction.item_name, auction.highest_bidder_name, auction.currency, auction.emblem_url):
+        parts.append(_encode_string(value))
+    
+    history = auction.bid_history
+    parts.append(_HISTORY_HEADER.pack(len(history), len(history.names), history.bidder_count))
+    parts.extend(_encode_string(name) for name in history.names)
+    for column in (history.bidder_ids, history.amounts, history.times_ms, history.name_indexes):
+        parts.append(_column_bytes(column))
+    
+    proxy_bids = auction.proxy_bids
+    if proxy_bids:
+        parts.append(_PROXY_HEADER.pack(len(proxy_bids), proxy_bids.seq))
+        for bidder_id, (amount, seq) in proxy_bids.maxes.items():
+            parts.append(_PROXY_ENTRY.pack(bidder_id, amount, seq))
+            parts.append(_encode_string(proxy_bids.names[bidder_id]))
+    else:
+        parts.append(_PROXY_HEADER.pack(0, 0))
+    return b"".join(parts)
+
+
+def _decode_auction(data, version: int) -> Auction:
+    """Decode an auction encoded by _encode_auction in the given snapshot version"""
+    # Versions 1 and 2 differ only in the file header; version 3 added the bidder count
+    if version not in (1, 2, 3):
+        raise ValueError(f"Unsupported auction snapshot version {version}")
+    (
+        auction_id, starting_bid, bid_increment, highest_bid, best_offer, highest_bidder_id,
+        created_ts, end_ts, creator_id, channel_id, message_id, auction_version, flags, close_state
+    ) = _AUCTION_FIELDS.unpack_from(data, 0)
+    offset = _AUCTION_FIELDS.size
+    item_name, offset = _decode_string(data, offset)
+    highest_bidder_name, offset = _decode_string(data, offset)
+    currency, offset = _decode_string(data, offset)
+    emblem_url, offset = _decode_string(data, offset)
+    
+    # Built field by field, like unpickling does, rather than through __init__
+    auction = Auction.__new__(Auction)
+    auction.id = auction_id
+    auction.item_name = item_name
+    auction.starting_bid = starting_bid
+    auction.bid_increment = bid_increment
+    auction.highest_bid = highest_bid
+    auction.highest_bidder_id = highest_bidder_id if flags & _HAS_BIDDER else None
+    auction.highest_bidder_name = highest_bidder_name
+    auction.created_ts = created_ts
+    auction.end_ts = end_ts
+    auction.ended = bool(flags & _ENDED)
+    auction.cancelled = bool(flags & _CANCELLED)
+    auction.ended_early = bool(flags & _ENDED_EARLY)
+    auction.creator_id = creator_id
+    auction.channel_id = channel_id
+    auction.message_id = message_id if flags & _HAS_MESSAGE else None
+    auction.currency = currency
+    auction.emblem_url = emblem_url
+    auction.best_offer = best_offer
+    auction.anonymous_bidding = bool(flags & _ANONYMOUS)
+    auction.auto_delete_emblem = bool(flags & _AUTO_DELETE)
+    auction.version = auction_version
+    auction.close_state = _CLOSE_STATES[close_state]
+    
+    history = auction.bid_history = BidHistory()
+    if version >= 3:
+        bid_count, name_count, history.bidder_count = _HISTORY_HEADER.unpack_from(data, offset)
+        offset += _HISTORY_HEADER.size
+    else:
+        bid_count, name_count = _HISTORY_HEADER_V2.unpack_from(data, offset)
+        offset += _HISTORY_HEADER_V2.size
+    for _ in range(name_count):
+        name, offset = _decode_string(data, offset)
+        history._name_lookup[name] = len(history.names)
+        history.names.append(sys.intern(name))
+    history.bidder_ids, offset = _read_column('q', data, offset, bid_count)
+    history.amounts, offset = _read_column('q', data, offset, bid_count)
+    history.times_ms, offset = _read_column('q', data, offset, bid_count)
+    history.name_indexes, offset = _read_column('I', data, offset, bid_count)
+    if version < 3:
+        history.bidder_count = len(set(history.bidder_ids))
+    # The bidder set is only needed for new bids, so it is built on the first one
+    history._bidders = None
+    
+    auction.proxy_bids = None
+    proxy_count, proxy_seq = _PROXY_HEADER.unpack_from(data, offset)
+    offset += _PROXY_HEADER.size
+    if proxy_count:
+        auction.proxy_bids = ProxyBids()
+        for _ in range(proxy_count):
+            bidder_id, amount, seq = _PROXY_ENTRY.unpack_from(data, offset)
+            name, offset = _decode_string(data, offset + _PROXY_ENTRY.size)
+            auction.proxy_bids.set(bidder_id, name, amount, seq)
+        auction.proxy_bids.seq = proxy_seq
+    return auction
+
+
+class AuctionSnapshot:
+    """Versioned binary snapshot file of encoded auctions
+
+    The file holds a header, the encoded auctions, an index of (auction ID,
+    offset, length, state) entries and the AuctionStats as JSON; the header
+    points to the last two. The format carries a version number and doesn't
+    depend on module or class paths. The file is memory-mapped, so opening
+    it reads only the header, the index and the stats, and auctions are
+    decoded one at a time when asked for.
+    """
+    MAGIC = b"AUCSNAP\0"
+    # Version 2 added the stats, version 3 the distinct bidder count of each auction
+    VERSION = 3
+    
+    # Auction states kept in the index, so a loader can pick auctions without decoding them
+    RUNNING = 0
+    CLOSING = 1
+    FINALIZED = 2
+    
+    _HEADER_V1 = struct.Struct('<8sHqqIQ')
+    _HEADER = struct.Struct('<8sHqqIQQI')
+    _INDEX_ENTRY = struct.Struct('<qQIB')
+    
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.version, self.next_id, self.journal_seq, count, index_offset = (
+                self._HEADER_V1.unpack_from(self._mmap, 0)
+            )
+            if magic != self.MAGIC:
+                raise ValueError(f"{path} is not an auction snapshot")
+            if self.version > self.VERSION:
+                raise ValueError(f"{path} was written by a newer version (format {self.version})")
+            # Snapshots without stats leave them to be rebuilt
+            self.stats: Optional[AuctionStats] = None
+            if self.version >= 2:
+                stats_offset, stats_length = self._HEADER.unpack_from(self._mmap, 0)[-2:]
+                if stats_length:
+                    stats = json.loads(str(self._mmap[stats_offset:stats_offset + stats_length], 'utf-8'))
+                    self.stats = AuctionStats.from_dict(stats)
+            # auction_id -> (offset, length, state)
+            self.entries: Dict[int, Tuple[int, int, int]] = {}
+            index_end = index_offset + count * self._INDEX_ENTRY.size
+            for auction_id, offset, length, state in self._INDEX_ENTRY.iter_unpack(self._mmap[index_offset:index_end]):
+                self.entries[auction_id] = (offset, length, state)
+        except Exception:
+            self._mmap.close()
+            raise
+    
+    @staticmethod
+    def state_of(auction: Auction) -> int:
+        if not auction.ended:
+            return AuctionSnapshot.RUNNING
+        if auction.close_state == CLOSE_FINALIZED:
+            return AuctionSnapshot.FINALIZED
+        return AuctionSnapshot.CLOSING
+    
+    def raw(self, auction_id: int) -> bytes:
+        """Get an auction's encoded bytes"""
+        offset, length, _ = self.entries[auction_id]
+        return self._mmap[offset:offset + length]
+    
+    def current(self, auction_id: int) -> bytes:
+        """Get an auction's bytes in the current encoding, re-encoding those of older versions"""
+        if self.version == self.VERSION:
+            return self.raw(auction_id)
+        return _encode_auction(self.get(auction_id))
+    
+    def get(self, auction_id: int) -> Auction:
+        """Decode a single auction"""
+        offset, length, _ = self.entries[auction_id]
+        with memoryview(self._mmap) as view:
+            return _decode_auction(view[offset:offset + length], self.version)
+    
+    def close(self):
+        self._mmap.close()
+    
+    @classmethod
+    def write(
+        cls,
+        path: str,
+        records: List[Tuple[int, int, bytes]],
+        next_id: int,
+        journal_seq: int,
+        stats: Optional[Dict[str, Any]]
+    ):
+        """Atomically replace a snapshot with (auction ID, state, encoded auction) records
+
+        Writes a temporary file, fsyncs it and renames it over the old one,
+        so a crash leaves either the old or the new snapshot, never a torn one.
+        stats is the output of AuctionStats.to_dict(), or None if they are
+        unknown and have to be rebuilt on load.
+        """
+        tmp_file = path + ".tmp"
+        index = []
+        with open(tmp_file, 'wb') as f:
+            # The header is written last, once the index offset is known
+            f.write(bytes(cls._HEADER.size))
+            offset = cls._HEADER.size
+            for auction_id, state, data in records:
+                f.write(data)
+                index.append(cls._INDEX_ENTRY.pack(auction_id, offset, len(data), state))
+                offset += len(data)
+            f.write(b"".join(index))
+            stats_data = b"" if stats is None else json.dumps(stats, separators=(',', ':')).encode('utf-8')
+            f.write(stats_data)
+            f.seek(0)
+            f.write(cls._HEADER.pack(
+                cls.MAGIC, cls.VERSION, next_id, journal_seq, len(index), offset,
+                offset + len(index) * cls._INDEX_ENTRY.size, len(stats_data)
+            ))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+
+
+class SnapshotJournalStore:
+    """Stores auctions in a binary snapshot plus an append-only journal
+
+    Running and closing auctions are loaded into memory. Finalized ones left
+    in the snapshot are never decoded: the manager hands their encoded bytes
+    straight to its archive with fetch_raw(). Every change is appended to the
+    journal, and the journal is folded into the snapshot on save or by
+    background compaction. Pickle snapshots written by older versions are
+    converted on first load.
+    """
+    # Whether auctions missing from the in-memory cache can be fetched on demand
+    lazy = False
+    
+    # Number of journal records after which the journal is compacted into a snapshot
+    COMPACT_THRESHOLD = 1000
+    
+    def __init__(
+        self,
+        data_file: str = "auction_data.snap",
+        journal_file: str = "auction_data.journal",
+        legacy_file: str = None
+    ):
+        self.data_file = data_file
+        # Pickle snapshot from older versions, converted on first load
+        self.legacy_file = legacy_file or os.path.splitext(data_file)[0] + ".pickle"
+        self.journal = AuctionJournal(journal_file)
+        # Serializes snapshot writes between saves and background compaction
+        self._snapshot_lock = threading.Lock()
+        self._compaction_thread: Optional[threading.Thread] = None
+        # Journal position covered by the snapshot on disk
+        self._snapshot_seq = 0
+        # Encoded auctions from the last snapshot, and the auctions changed
+        # since, so saving only encodes what changed
+        self._records: Dict[int, bytes] = {}
+        self._dirty: Set[int] = set()
+        # Auctions left in the snapshot at load (ID -> index state), and the
+        # mapped snapshot they are read from
+        self._unloaded: Dict[int, int] = {}
+        self._snapshot: Optional[AuctionSnapshot] = None
+        # Stats as of load(), handed to the manager by load_stats()
+        self._stats: Optional[AuctionStats] = None
+    
+    def load(self) -> Tuple[Dict[int, Auction], int]:
+        """Load the running and closing auctions of the last snapshot and replay the journal on top"""
+        seq = 0
+        if self._snapshot:
+            self._snapshot.close()
+            self._snapshot = None
+        self._records = {}
+        try:
+            state = self._read_snapshot()
+            seq = self._snapshot_seq = state['journal_seq']
+            snapshot = state['snapshot']
+            if snapshot:
+                for auction_id, (_, _, index_state) in snapshot.entries.items():
+                    if index_state != AuctionSnapshot.FINALIZED:
+                        state['auctions'][auction_id] = snapshot.get(auction_id)
+                        # Records of an older version are encoded again on save
+                        if snapshot.version == AuctionSnapshot.VERSION:
+                            self._records[auction_id] = snapshot.raw(auction_id)
+                        del state['unloaded'][auction_id]
+            replayed = 0
+            for path in (self.journal.segment_path, self.journal.path):
+                for record in AuctionJournal.read(path):
+                    if path == self.journal.segment_path:
+                        self.journal.segment_seq = record['seq']
+                    # Records already folded into the snapshot are skipped
+                    if record['seq'] <= seq:
+                        continue
+                    _apply_journal_record(state, record)
+                    self._dirty.add(record['id'])
+                    seq = record['seq']
+                    replayed += 1
+            logger.info(f"Replayed {replayed} journal records on top of {self.data_file}")
+            self._stats = state['stats']
+            self._unloaded = state['unloaded']
+            if self._unloaded:
+                self._snapshot = snapshot
+            elif snapshot:
+                snapshot.close()
+        finally:
+            # Keep the journal writable even if the snapshot could not be read
+            self.journal.open(seq)
+        return state['auctions'], state['next_id']
+    
+    def load_all(self) -> Tuple[Dict[int, Auction], int]:
+        """Load every auction, finalized ones included, without writing any file
+
+        Used to read the single pre-partitioning store, which shard processes
+        read at the same time: a pickle snapshot is read as is instead of
+        being converted, and the journal is only replayed, not opened.
+        """
+        if os.path.exists(self.data_file):
+            state = self._read_snapshot()
+            snapshot = state['snapshot']
+            for auction_id in state.pop('unloaded'):
+                state['auctions'][auction_id] = snapshot.get(auction_id)
+            snapshot.close()
+        elif os.path.exists(self.legacy_file):
+            auctions, next_id, journal_seq = self._read_legacy_snapshot()
+            state = {'auctions': auctions, 'stats': None, 'next_id': next_id, 'journal_seq': journal_seq}
+        else:
+            state = {'auctions': {}, 'next_id': 1, 'journal_seq': 0}
+        state['stats'] = None
+        for path in (self.journal.segment_path, self.journal.path):
+            for record in AuctionJournal.read(path):
+                if record['seq'] > state['journal_seq']:
+                    _apply_journal_record(state, record)
+        return state['auctions'], state['next_id']
+    
+    def unloaded_ids(self) -> List[int]:
+        """Get the finalized auctions left in the snapshot by load()"""
+        return list(self._unloaded)
+    
+    def load_stats(self) -> Optional[AuctionStats]:
+        """Get the stats as of load(), or None if the snapshot predates them"""
+        stats, self._stats = self._stats, None
+        return stats
+    
+    def save(self, auctions: Dict[int, Auction], next_id: int, stats: AuctionStats = None):
+        """Write a full snapshot and clear the journal"""
+        state = self._capture(auctions, next_id, stats)
+        with self._snapshot_lock:
+            self._write_records(state)
+            self.journal.reset()
+    
+    def prepare_save(self, auctions: Dict[int, Auction], next_id: int, stats: AuctionStats = None) -> Callable[[], None]:
+        """Capture a snapshot and return the function that writes it
+
+        The capture is cheap: only auctions changed since the last snapshot
+        are encoded. The returned function does the slow part, writing and
+        fsyncing the file, and is safe to run in a worker thread while the
+        auctions keep changing. The journal is rotated here, so the segment
+        holding the records the snapshot covers can be dropped once it is
+        written.
+        """
+        state = self._capture(auctions, next_id, stats)
+        self.journal.rotate()
+        
+        def write():
+            with self._snapshot_lock:
+                # A later save or compaction may have got here first
+                if self._snapshot_seq >= state['journal_seq']:
+                    return
+                self._write_records(state)
+                self.journal.discard_segment(state['journal_seq'])
+        
+        return write
+    
+    def fetch_raw(self, auction_id: int) -> Optional[Tuple[bytes, int]]:
+        """Hand over an auction left in the snapshot by load(), without decoding it
+
+        Returns the encoded auction and the snapshot format version it is in.
+        The auction is no longer carried into new snapshots, so the caller
+        must archive it.
+        """
+        if auction_id not in self._unloaded:
+            return None
+        data, version = self._snapshot.raw(auction_id), self._snapshot.version
+        del self._unloaded[auction_id]
+        if not self._unloaded:
+            self._snapshot.close()
+            self._snapshot = None
+        return data, version
+    
+    def record_create(self, auction: Auction):
+        self._log('create', **self._create_fields(auction))
+    
+    def record_create_many(self, auctions: List[Auction]):
+        """Journal several new auctions with a single fsync"""
+        self.journal.append_many([('create', self._create_fields(auction)) for auction in auctions])
+        self._dirty.update(auction.id for auction in auctions)
+        if self.journal.records >= self.COMPACT_THRESHOLD:
+            self._start_compaction()
+    
+    @staticmethod
+    def _create_fields(auction: Auction) -> Dict[str, Any]:
+        return dict(
+            id=auction.id,
+            item_name=auction.item_name,
+            starting_bid=auction.starting_bid,
+            bid_increment=auction.bid_increment,
+            creator_id=auction.creator_id,
+            channel_id=auction.channel_id,
+            currency=auction.currency,
+            emblem_url=auction.emblem_url,
+            anonymous_bidding=auction.anonymous_bidding,
+            auto_delete_emblem=auction.auto_delete_emblem,
+            created_ts=auction.created_ts,
+            end_ts=auction.end_ts
+        )
+    
+    def record_bid(self, auction: Auction, bid: BidView):
+        self._log(
+            'bid',
+            id=auction.id,
+            bidder_id=bid.bidder_id,
+            bidder_name=bid.bidder_name,
+            amount=bid.amount,
+            time_ms=bid.time_ms
+        )
+    
+    def record_max_bid(self, auction: Auction, bidder_id: int):
+        amount, seq = auction.proxy_bids.maxes[bidder_id]
+        self._log(
+            'max_bid',
+            id=auction.id,
+            bidder_id=bidder_id,
+            bidder_name=auction.proxy_bids.names[bidder_id],
+            amount=amount,
+            max_seq=seq
+        )
+    
+    def record_message_id(self, auction: Auction):
+        self._log('message', id=auction.id, message_id=auction.message_id)
+    
+    def record_clock(self, auction: Auction):
+        self._log('clock', id=auction.id, created_ts=auction.created_ts, end_ts=auction.end_ts)
+    
+    def record_end(self, auction: Auction):
+        self._log(
+            'end',
+            id=auction.id,
+            cancelled=auction.cancelled,
+            early=auction.ended_early,
+            close_state=auction.close_state
+        )
+    
+    def record_close_state(self, auction: Auction):
+        self._log('close', id=auction.id, close_state=auction.close_state)
+    
+    def record_archive(self, auction_id: int):
+        self._log('archive', id=auction_id)
+    
+    def close(self):
+        if self._compaction_thread:
+            self._compaction_thread.join()
+        self.journal.close()
+        if self._snapshot:
+            self._snapshot.close()
+            self._snapshot = None
+    
+    def _read_snapshot(self) -> Dict[str, Any]:
+        """Open the snapshot file with every auction still encoded
+
+        Returns a state dict for _apply_journal_record. Its auctions start
+        out empty, and 'unloaded' maps the IDs in the file to their index
+        state.
+        """
+        if not os.path.exists(self.data_file) and os.path.exists(self.legacy_file):
+            self._migrate_legacy_snapshot()
+        if not os.path.exists(self.data_file):
+            logger.info(f"No auction data file found at {self.data_file}")
+            return {
+                'auctions': {}, 'unloaded': {}, 'snapshot': None, 'stats': AuctionStats(),
+                'next_id': 1, 'journal_seq': 0
+            }
+        snapshot = AuctionSnapshot(self.data_file)
+        return {
+            'auctions': {},
+            'unloaded': {auction_id: entry[2] for auction_id, entry in snapshot.entries.items()},
+            'snapshot': snapshot,
+            'stats': snapshot.stats,
+            'next_id': snapshot.next_id,
+            'journal_seq': snapshot.journal_seq
+        }
+    
+    def _read_legacy_snapshot(self) -> Tuple[Dict[int, Auction], int, int]:
+        """Read a pickle snapshot from an older version as (auctions, next_id, journal_seq)"""
+        with open(self.legacy_file, 'rb') as f:
+            data = pickle.load(f)
+        records = data.get('records', {})
+        auctions = data.get('auctions') or {
+            auction_id: pickle.loads(record) for auction_id, record in records.items()
+        }
+        return auctions, data.get('next_id', 1), data.get('journal_seq', 0)
+    
+    def _migrate_legacy_snapshot(self):
+        """Convert a pickle snapshot from an older version, keeping the old file as a backup"""
+        auctions, next_id, journal_seq = self._read_legacy_snapshot()
+        AuctionSnapshot.write(
+            self.data_file,
+            [(auction_id, AuctionSnapshot.state_of(auction), _encode_auction(auction)) for auction_id, auction in auctions.items()],
+            next_id,
+            journal_seq,
+            None
+        )
+        os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        logger.info(f"Converted {len(auctions)} auctions from {self.legacy_file} to {self.data_file}")
+    
+    def _capture(self, auctions: Dict[int, Auction], next_id: int, stats: Optional[AuctionStats]) -> Dict[str, Any]:
+        """Encode the auctions changed since the last capture and collect the rest from the cache"""
+        cache = {}
+        records = []
+        for auction_id, auction in auctions.items():
+            data = self._records.get(auction_id)
+            if data is None or auction_id in self._dirty:
+                data = _encode_auction(auction)
+            cache[auction_id] = data
+            records.append((auction_id, AuctionSnapshot.state_of(auction), data))
+        for auction_id, index_state in self._unloaded.items():
+            records.append((auction_id, index_state, self._snapshot.current(auction_id)))
+        # A new dict each time, so earlier captures stay untouched
+        self._records = cache
+        self._dirty.clear()
+        return {
+            'records': records,
+            'stats': stats.to_dict() if stats else None,
+            'next_id': next_id,
+            'journal_seq': self.journal.seq
+        }
+    
+    def _write_snapshot(self, state: Dict[str, Any]):
+        """Atomically replace the snapshot file with a state from _read_snapshot"""
+        records = [
+            (auction_id, AuctionSnapshot.state_of(auction), _encode_auction(auction))
+            for auction_id, auction in state['auctions'].items()
+        ]
+        snapshot = state['snapshot']
+        if snapshot:
+            # Untouched auctions are copied over without decoding them
+            records.extend(
+                (auction_id, index_state, snapshot.current(auction_id))
+                for auction_id, index_state in state['unloaded'].items()
+            )
+            snapshot.close()
+        self._write_records({
+            'records': records,
+            'stats': state['stats'].to_dict() if state['stats'] else None,
+            'next_id': state['next_id'],
+            'journal_seq': state['journal_seq']
+        })
+    
+    def _write_records(self, state: Dict[str, Any]):
+        AuctionSnapshot.write(self.data_file, state['records'], state['next_id'], state['journal_seq'], state['stats'])
+        self._snapshot_seq = state['journal_seq']
+    
+    def _log(self, op: str, **fields):
+        """Write a state change to the journal, compacting it when it gets long"""
+        self.journal.append(op, **fields)
+        self._dirty.add(fields['id'])
+        if self.journal.records >= self.COMPACT_THRESHOLD:
+            self._start_compaction()
+    
+    def _start_compaction(self):
+        """Rotate the journal and fold the old segment into the snapshot in the background"""
+        if self._compaction_thread and self._compaction_thread.is_alive():
+            return
+        if not self.journal.rotate():
+            return
+        self._compaction_thread = threading.Thread(
+            target=self._compact_segment,
+            name="auction-journal-compaction",
+            daemon=True
+        )
+        self._compaction_thread.start()
+    
+    def _compact_segment(self):
+        """Build a new snapshot from the old snapshot and the rotated journal segment
+
+        Runs on a worker thread and never touches the live auction objects.
+        """
+        try:
+            with self._snapshot_lock:
+                segment_path = self.journal.segment_path
+                if not os.path.exists(segment_path):
+                    return
+                state = self._read_snapshot()
+                seq = state['journal_seq']
+                for record in AuctionJournal.read(segment_path):
+                    if record['seq'] <= seq:
+                        continue
+                    _apply_journal_record(state, record)
+                    seq = record['seq']
+                state['journal_seq'] = seq
+                self._write_snapshot(state)
+                os.remove(segment_path)
+            logger.info(f"Compacted auction journal into {self.data_file}")
+        except Exception as e:
+            logger.error(f"Failed to compact auction journal: {e}")
+
+
+class AuctionArchive:
+    """Compressed, paged cold storage for finalized auctions
+
+    Finalized auctions are collected into pages of PAGE_SIZE, and each page is
+    appended to the archive file as one zlib-compressed block of auctions in
+    the snapshot encoding, behind a header with the encoding's version. A
+    sidecar index maps auction IDs to page offsets. It is held in memory as
+    two sorted arrays, 16 bytes per archived auction. Archived auctions are
+    loaded on demand and kept in a small LRU cache. Pickled pages written by
+    older versions are still read.
+    
+    Adding an auction never writes to disk, so it is cheap enough for the
+    event loop. Pending auctions are written by flush(), or taken on the
+    event loop with take_page() and written from a worker thread with
+    write_page(); the auctions stay readable meanwhile. page_full() tells
+    the owner when a write is due.
+    """
+    PAGE_SIZE = 64
+    CACHE_SIZE = 128
+    MAGIC = b"AUCA"
+    
+    _PAGE_HEADER = struct.Struct('<4sHI')
+    _LEGACY_PAGE_HEADER = struct.Struct('<I')
+    _RECORD_HEADER = struct.Struct('<qI')
+    _INDEX_RECORD = struct.Struct('<qQ')
+    
+    def __init__(self, path: str = "auction_archive.dat"):
+        self.path = path
+        self.index_path = path + ".idx"
+        self._ids = array('q')
+        self._offsets = array('Q')
+        # Encoded finalized auctions waiting for a full page, and those in a
+        # page that is being written
+        self.pending: Dict[int, bytes] = {}
+        self._writing: Dict[int, bytes] = {}
+        self._cache: "OrderedDict[int, Auction]" = OrderedDict()
+        # Guards the structures above against a page written from a worker
+        # thread; _write_lock keeps page writes in order
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._load_index()
+    
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        # Ignore a torn trailing record left by a crash
+        usable = len(data) - len(data) % self._INDEX_RECORD.size
+        offsets: Dict[int, int] = {}
+        for auction_id, offset in self._INDEX_RECORD.iter_unpack(data[:usable]):
+            # A later record for the same auction wins
+            offsets[auction_id] = offset
+        for auction_id in sorted(offsets):
+            self._ids.append(auction_id)
+            self._offsets.append(offsets[auction_id])
+        logger.info(f"Loaded archive index with {len(self._ids)} auctions from {self.index_path}")
+    
+    def __contains__(self, auction_id: int) -> bool:
+        with self._lock:
+            return auction_id in self.pending or auction_id in self._writing or self._find(auction_id) is not None
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._ids) + len(self.pending) + len(self._writing)
+    
+    def ids(self) -> List[int]:
+        """Get the IDs of all archived auctions"""
+        with self._lock:
+            return sorted(set(self._ids) | set(self.pending) | set(self._writing))
+    
+    def add(self, auction: Auction):
+        """Archive a finalized auction; it is written to disk with the next page"""
+        self.add_encoded(auction.id, _encode_auction(auction), AuctionSnapshot.VERSION)
+    
+    def add_encoded(self, auction_id: int, data: bytes, version: int):
+        """Archive a finalized auction in the encoding of snapshot format version, without decoding it"""
+        if version != AuctionSnapshot.VERSION:
+            data = _encode_auction(_decode_auction(data, version))
+        with self._lock:
+            self.pending[auction_id] = data
+            self._cache.pop(auction_id, None)
+    
+    def page_full(self) -> bool:
+        """Whether enough auctions are pending to fill a page"""
+        with self._lock:
+            return len(self.pending) >= self.PAGE_SIZE
+    
+    def flush(self) -> List[int]:
+        """Write pending auctions as pages and return their IDs"""
+        with self._write_lock:
+            return self._write(self.take_page())
+    
+    def take_page(self) -> Dict[int, bytes]:
+        """Take the pending auctions to be written with write_page()"""
+        with self._lock:
+            page, self.pending = self.pending, {}
+            self._writing.update(page)
+        return page
+    
+    def write_page(self, page: Dict[int, bytes]) -> List[int]:
+        """Write auctions from take_page() and return their IDs; safe to call from a worker thread
+
+        More than PAGE_SIZE auctions are split over several pages. If writing
+        fails, the auctions go back to pending.
+        """
+        with self._write_lock:
+            return self._write(page)
+    
+    def _write(self, page: Dict[int, bytes]) -> List[int]:
+        if not page:
+            return []
+        items = list(page.items())
+        offsets = {}
+        try:
+            with open(self.path, 'ab') as f:
+                for start in range(0, len(items), self.PAGE_SIZE):
+                    chunk = items[start:start + self.PAGE_SIZE]
+                    body = b"".join(
+                        self._RECORD_HEADER.pack(auction_id, len(data)) + data
+                        for auction_id, data in chunk
+                    )
+                    compressed = zlib.compress(body)
+                    offset = f.tell()
+                    f.write(self._PAGE_HEADER.pack(self.MAGIC, AuctionSnapshot.VERSION, len(compressed)))
+                    f.write(compressed)
+                    for auction_id, _ in chunk:
+                        offsets[auction_id] = offset
+                f.flush()
+                os.fsync(f.fileno())
+            
+            with open(self.index_path, 'ab') as f:
+                for auction_id, offset in offsets.items():
+                    f.write(self._INDEX_RECORD.pack(auction_id, offset))
+                f.flush()
+                os.fsync(f.fileno())
+        except Exception:
+            with self._lock:
+                for auction_id, data in page.items():
+                    self._writing.pop(auction_id, None)
+                    # A newer copy added meanwhile wins
+                    self.pending.setdefault(auction_id, data)
+            raise
+        
+        with self._lock:
+            for auction_id, offset in offsets.items():
+                self._set_offset(auction_id, offset)
+                self._writing.pop(auction_id, None)
+        return list(page)
+    
+    def get(self, auction_id: int) -> Optional[Auction]:
+        """Load an archived auction, or return None if it isn't archived"""
+        with self._lock:
+            auction = self._cache.get(auction_id)
+            if auction is not None:
+                self._cache.move_to_end(auction_id)
+                return auction
+            data = self.pending.get(auction_id) or self._writing.get(auction_id)
+            offset = self._find(auction_id)
+        
+        if data is not None:
+            auction = _decode_auction(data, AuctionSnapshot.VERSION)
+        else:
+            if offset is None:
+                return None
+            auction = self._read_page(offset, auction_id)
+            if auction is None:
+                return None
+        
+        with self._lock:
+            self._cache[auction_id] = auction
+            if len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
+        return auction
+    
+    def _read_page(self, offset: int, auction_id: int) -> Optional[Auction]:
+        """Decode one auction from the page at offset"""
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            header = f.read(self._PAGE_HEADER.size)
+            if header[:len(self.MAGIC)] != self.MAGIC:
+                # Pages written before the versioned format hold a pickled list
+                (length,) = self._LEGACY_PAGE_HEADER.unpack_from(header)
+                f.seek(offset + self._LEGACY_PAGE_HEADER.size)
+                for auction in pickle.loads(zlib.decompress(f.read(length))):
+                    if auction.id == auction_id:
+                        return auction
+                return None
+            _, version, length = self._PAGE_HEADER.unpack(header)
+            body = zlib.decompress(f.read(length))
+        position = 0
+        while position < len(body):
+            record_id, record_length = self._RECORD_HEADER.unpack_from(body, position)
+            position += self._RECORD_HEADER.size
+            if record_id == auction_id:
+                return _decode_auction(body[position:position + record_length], version)
+            position += record_length
+        return None
+    
+    def _find(self, auction_id: int) -> Optional[int]:
+        position = bisect_left(self._ids, auction_id)
+        if position < len(self._ids) and self._ids[position] == auction_id:
+            return self._offsets[position]
+        return None
+    
+    def _set_offset(self, auction_id: int, offset: int):
+        position = bisect_left(self._ids, auction_id)
+        if position < len(self._ids) and self._ids[position] == auction_id:
+            self._offsets[position] = offset
+            self._cache.pop(auction_id, None)
+        else:
+            self._ids.insert(position, auction_id)
+            self._offsets.insert(position, offset)
+
+
+class SQLiteAuctionStore:
+    """Stores auctions and their bid history in an indexed SQLite database
+
+    Only running auctions are loaded at startup. Ended auctions stay on disk
+    and are fetched by ID when they are asked for, so the closed history can
+    grow without growing memory use or startup time.
+    """
+    lazy = True
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS auctions (
+            id INTEGER PRIMARY KEY,
+            item_name TEXT NOT NULL,
+            starting_bid INTEGER NOT NULL,
+            bid_increment INTEGER NOT NULL,
+            highest_bid INTEGER NOT NULL,
+            highest_bidder_id INTEGER,
+            highest_bidder_name TEXT,
+            created_at REAL NOT NULL,
+            end_time REAL NOT NULL,
+            ended INTEGER NOT NULL DEFAULT 0,
+            cancelled INTEGER NOT NULL DEFAULT 0,
+            creator_id INTEGER NOT NULL,
+            channel_id INTEGER NOT NULL,
+            message_id INTEGER,
+            currency TEXT NOT NULL,
+            emblem_url TEXT,
+            best_offer INTEGER NOT NULL,
+            anonymous_bidding INTEGER NOT NULL DEFAULT 0,
+            auto_delete_emblem INTEGER NOT NULL DEFAULT 0,
+            close_state TEXT,
+            ended_early INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS bids (
+            auction_id INTEGER NOT NULL REFERENCES auctions(id),
+            seq INTEGER NOT NULL,
+            bidder_id INTEGER NOT NULL,
+            bidder_name TEXT,
+            amount INTEGER NOT NULL,
+            time REAL NOT NULL,
+            PRIMARY KEY (auction_id, seq)
+        );
+        CREATE TABLE IF NOT EXISTS max_bids (
+            auction_id INTEGER NOT NULL REFERENCES auctions(id),
+            bidder_id INTEGER NOT NULL,
+            bidder_name TEXT,
+            amount INTEGER NOT NULL,
+            seq INTEGER NOT NULL,
+            PRIMARY KEY (auction_id, bidder_id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_auctions_ended_end_time ON auctions(ended, end_time);
+        CREATE INDEX IF NOT EXISTS idx_auctions_channel ON auctions(channel_id);
+        CREATE INDEX IF NOT EXISTS idx_auctions_creator ON auctions(creator_id);
+        CREATE INDEX IF NOT EXISTS idx_bids_bidder ON bids(bidder_id);
+        CREATE INDEX IF NOT EXISTS idx_auctions_close_state ON auctions(close_state);
+    """
+    
+    AUCTION_COLUMNS = (
+        "id", "item_name", "starting_bid", "bid_increment", "highest_bid",
+        "highest_bidder_id", "highest_bidder_name", "created_at", "end_time",
+        "ended", "cancelled", "creator_id", "channel_id", "message_id",
+        "currency", "emblem_url", "best_offer", "anonymous_bidding",
+        "auto_delete_emblem", "close_state", "ended_early"
+    )
+    
+    def __init__(self, db_file: str = "auction_data.db"):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL with synchronous=NORMAL keeps commits durable across process crashes
+        # without an fsync on every write
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+        self.conn.executescript(self.SCHEMA)
+        self.conn.commit()
+    
+    def _migrate(self):
+        """Bring databases created by older versions up to the current schema"""
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(auctions)")}
+        if columns and "close_state" not in columns:
+            self.conn.execute("ALTER TABLE auctions ADD COLUMN close_state TEXT")
+            self.conn.execute("UPDATE auctions SET close_state = ? WHERE ended = 1", (CLOSE_FINALIZED,))
+        if columns and "ended_early" not in columns:
+            self.conn.execute("ALTER TABLE auctions ADD COLUMN ended_early INTEGER NOT NULL DEFAULT 0")
+    
+    def load(self) -> Tuple[Dict[int, Auction], int]:
+        """Load running auctions, unfinished closings and the next auction ID"""
+        rows = self.conn.execute(
+            f"SELECT {', '.join(self.AUCTION_COLUMNS)} FROM auctions "
+            "WHERE ended = 0 OR close_state IN (?, ?) ORDER BY end_time",
+            (CLOSE_ENDING, CLOSE_ANNOUNCED)
+        ).fetchall()
+        auctions = {row[0]: self._auction_from_row(row) for row in rows}
+        logger.info(f"Loaded {len(auctions)} active auctions from {self.db_file}")
+        return auctions, self._next_id()
+    
+    def load_all(self) -> Tuple[Dict[int, Auction], int]:
+        """Load every auction, ended ones included"""
+        rows = self.conn.execute(f"SELECT {', '.join(self.AUCTION_COLUMNS)} FROM auctions ORDER BY id").fetchall()
+        return {row[0]: self._auction_from_row(row) for row in rows}, self._next_id()
+    
+    def _next_id(self) -> int:
+        next_id = self._get_meta('next_id')
+        if next_id is None:
+            max_id = self.conn.execute("SELECT MAX(id) FROM auctions").fetchone()[0]
+            next_id = (max_id or 0) + 1
+        return next_id
+    
+    def save(self, auctions: Dict[int, Auction], next_id: int, stats: AuctionStats = None):
+        """Write the cached auctions and the next ID in a single transaction
+
+        The stats are derived from the tables, so they are not written.
+        """
+        with self.conn:
+            for auction in auctions.values():
+                self._upsert_auction(auction)
+            self._set_meta('next_id', next_id)
+    
+    def prepare_save(
+        self,
+        auctions: Dict[int, Auction],
+        next_id: int,
+        stats: AuctionStats = None
+    ) -> Optional[Callable[[], None]]:
+        """Every change is committed as it happens, so there is nothing left to write"""
+        return None
+    
+    def unloaded_ids(self) -> List[int]:
+        """Ended auctions are fetched by ID when needed, so none are waiting to be archived"""
+        return []
+    
+    def load_stats(self) -> AuctionStats:
+        """Aggregate the stats from the tables with a few grouped queries"""
+        stats = AuctionStats()
+        stats.total_bids = self.conn.execute("SELECT COUNT(*) FROM bids").fetchone()[0]
+        stats.bidders = {row[0] for row in self.conn.execute("SELECT DISTINCT bidder_id FROM bids")}
+        # The name comes from each bidder's latest public bid
+        rows = self.conn.execute(
+            "SELECT bids.bidder_id, COUNT(*), MAX(bids.time), bids.bidder_name FROM bids "
+            "JOIN auctions ON auctions.id = bids.auction_id WHERE auctions.anonymous_bidding = 0 "
+            "GROUP BY bids.bidder_id"
+        )
+        for bidder_id, count, _, name in rows:
+            stats.public_bids[bidder_id] = count
+            stats.names[bidder_id] = name
+        stats._ranking = sorted((-count, bidder_id) for bidder_id, count in stats.public_bids.items())
+        rows = self.conn.execute(
+            "SELECT currency, COUNT(*), SUM(highest_bid), "
+            "TOTAL(CASE WHEN starting_bid > 0 THEN CAST(highest_bid AS REAL) / starting_bid END), "
+            "COUNT(CASE WHEN starting_bid > 0 THEN 1 END) FROM auctions "
+            "WHERE ended = 1 AND cancelled = 0 AND highest_bidder_id IS NOT NULL GROUP BY currency"
+        )
+        for currency, sold, final_total, ratio_total, ratio_count in rows:
+            stats.currencies[currency] = {
+                'sold': sold, 'final_total': final_total, 'ratio_total': ratio_total, 'ratio_count': ratio_count
+            }
+        latest = self.conn.execute("SELECT MAX(time) FROM bids").fetchone()[0]
+        if latest is not None:
+            stats.latest_minute = int(latest) // 60
+            rows = self.conn.execute(
+                "SELECT CAST(time / 60 AS INTEGER), COUNT(*) FROM bids WHERE time >= ? GROUP BY 1",
+                ((stats.latest_minute - AuctionStats.RATE_WINDOW + 1) * 60,)
+            )
+            stats.minutes = dict(rows.fetchall())
+        return stats
+    
+    def fetch(self, auction_id: int) -> Optional[Auction]:
+        """Load a single auction, including its bid history"""
+        row = self.conn.execute(
+            f"SELECT {', '.join(self.AUCTION_COLUMNS)} FROM auctions WHERE id = ?",
+            (auction_id,)
+        ).fetchone()
+        if not row:
+            return None
+        return self._auction_from_row(row)
+    
+    def auction_ids_by_channel(self, channel_id: int) -> List[int]:
+        rows = self.conn.execute("SELECT id FROM auctions WHERE channel_id = ?", (channel_id,)).fetchall()
+        return [row[0] for row in rows]
+    
+    def auction_ids_by_creator(self, creator_id: int) -> List[int]:
+        rows = self.conn.execute("SELECT id FROM auctions WHERE creator_id = ?", (creator_id,)).fetchall()
+        return [row[0] for row in rows]
+    
+    def auction_ids_by_bidder(self, bidder_id: int) -> List[int]:
+        rows = self.conn.execute(
+            "SELECT DISTINCT auction_id FROM bids WHERE bidder_id = ?", (bidder_id,)
+        ).fetchall()
+        return [row[0] for row in rows]
+    
+    def record_create(self, auction: Auction):
+        with self.conn:
+            self._upsert_auction(auction)
+            self._set_meta('next_id', auction.id + 1)
+    
+    def record_create_many(self, auctions: List[Auction]):
+        """Insert several new auctions in a single transaction"""
+        with self.conn:
+            for auction in auctions:
+                self._upsert_auction(auction)
+            self._set_meta('next_id', max(auction.id for auction in auctions) + 1)
+    
+    def record_bid(self, auction: Auction, bid: BidView):
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO bids (auction_id, seq, bidder_id, bidder_name, amount, time) VALUES (?, ?, ?, ?, ?, ?)",
+                (auction.id, len(auction.bid_history), bid.bidder_id, bid.bidder_name,
+                 bid.amount, bid.time_ms / 1000)
+            )
+            self.conn.execute(
+                "UPDATE auctions SET highest_bid = ?, highest_bidder_id = ?, highest_bidder_name = ? WHERE id = ?",
+                (auction.highest_bid, auction.highest_bidder_id, auction.highest_bidder_name, auction.id)
+            )
+    
+    def record_max_bid(self, auction: Auction, bidder_id: int):
+        amount, seq = auction.proxy_bids.maxes[bidder_id]
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO max_bids (auction_id, bidder_id, bidder_name, amount, seq) VALUES (?, ?, ?, ?, ?)",
+                (auction.id, bidder_id, auction.proxy_bids.names[bidder_id], amount, seq)
+            )
+    
+    def record_message_id(self, auction: Auction):
+        with self.conn:
+            self.conn.execute("UPDATE auctions SET message_id = ? WHERE id = ?", (auction.message_id, auction.id))
+    
+    def record_clock(self, auction: Auction):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE auctions SET created_at = ?, end_time = ? WHERE id = ?",
+                (auction.created_ts, auction.end_ts, auction.id)
+            )
+    
+    def record_end(self, auction: Auction):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE auctions SET ended = ?, cancelled = ?, ended_early = ?, close_state = ? WHERE id = ?",
+                (int(auction.ended), int(auction.cancelled), int(auction.ended_early), auction.close_state, auction.id)
+            )
+            self.conn.execute("DELETE FROM max_bids WHERE auction_id = ?", (auction.id,))
+    
+    def record_close_state(self, auction: Auction):
+        with self.conn:
+            self.conn.execute("UPDATE auctions SET close_state = ? WHERE id = ?", (auction.close_state, auction.id))
+    
+    def close(self):
+        self.conn.close()
+    
+    def _upsert_auction(self, auction: Auction):
+        values = (
+            auction.id, auction.item_name, auction.starting_bid, auction.bid_increment,
+            auction.highest_bid, auction.highest_bidder_id, auction.highest_bidder_name,
+            auction.created_ts, auction.end_ts,
+            int(auction.ended), int(auction.cancelled), auction.creator_id, auction.channel_id,
+            auction.message_id, auction.currency, auction.emblem_url, auction.best_offer,
+            int(auction.anonymous_bidding), int(auction.auto_delete_emblem), auction.close_state,
+            int(auction.ended_early)
+        )
+        placeholders = ", ".join("?" for _ in self.AUCTION_COLUMNS)
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO auctions ({', '.join(self.AUCTION_COLUMNS)}) VALUES ({placeholders})",
+            values
+        )
+    
+    def _auction_from_row(self, row: tuple) -> Auction:
+        fields = dict(zip(self.AUCTION_COLUMNS, row))
+        auction = Auction(
+            id=fields['id'],
+            item_name=fields['item_name'],
+            starting_bid=fields['starting_bid'],
+            bid_increment=fields['bid_increment'],
+            duration_seconds=0,
+            creator_id=fields['creator_id'],
+            channel_id=fields['channel_id'],
+            currency=fields['currency'],
+            emblem_url=fields['emblem_url'],
+            anonymous_bidding=bool(fields['anonymous_bidding']),
+            auto_delete_emblem=bool(fields['auto_delete_emblem'])
+        )
+        auction.highest_bid = fields['highest_bid']
+        auction.highest_bidder_id = fields['highest_bidder_id']
+        auction.highest_bidder_name = fields['highest_bidder_name']
+        auction.created_ts = int(fields['created_at'])
+        auction.end_ts = int(fields['end_time'])
+        auction.ended = bool(fields['ended'])
+        auction.cancelled = bool(fields['cancelled'])
+        auction.message_id = fields['message_id']
+        auction.best_offer = fields['best_offer']
+        auction.close_state = fields['close_state']
+        auction.ended_early = bool(fields['ended_early'])
+        
+        bids = self.conn.execute(
+            "SELECT bidder_id, bidder_name, amount, time FROM bids WHERE auction_id = ? ORDER BY seq",
+            (auction.id,)
+        ).fetchall()
+        for bidder_id, bidder_name, amount, bid_time in bids:
+            auction.bid_history.append(bidder_id, bidder_name, amount, int(bid_time * 1000))
         
-        return False
+        if not auction.ended:
+            max_bids = self.conn.execute(
+                "SELECT bidder_id, bidder_name, amount, seq FROM max_bids WHERE auction_id = ?",
+                (auction.id,)
+            ).fetchall()
+            if max_bids:
+                auction.proxy_bids = ProxyBids()
+                for bidder_id, bidder_name, amount, seq in max_bids:
+                    auction.proxy_bids.set(bidder_id, bidder_name, amount, seq)
+        return auction
+    
+    def _get_meta(self, key: str) -> Optional[int]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+    
+    def _set_meta(self, key: str, value: int):
+        self.conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = MAX(value, excluded.value)",
+            (key, value)
+        )
 
 
 class AuctionManager:
     """Class for managing multiple auctions"""
-    def __init__(self):
+    # Positions of the fields in the auction embed that change between versions
+    BEST_OFFER_FIELD = 3
+    HIGHEST_BIDDER_FIELD = 6
+    
+    def __init__(
+        self,
+        store=None,
+        name_resolver: Optional[Callable[[int], Optional[str]]] = None,
+        archive: Optional[AuctionArchive] = None,
+        guild_id: Optional[int] = None
+    ):
+        # Guild whose auctions this manager holds, if partitioned by guild
+        self.guild_id = guild_id
         self.auctions: Dict[int, Auction] = {}
         self.next_id = 1
-        self.data_file = "auction_data.pickle"
+        # Persistence backend; defaults to a binary snapshot plus journal
+        self.store = store or SnapshotJournalStore()
+        # Cold tier for finalized auctions. Lazy stores already keep finished
+        # auctions out of memory, so they don't need one.
+        if archive is None and not self.store.lazy:
+            archive = AuctionArchive()
+        self.archive = archive
+        # Maps a user ID to a display name, or None if the user is unknown
+        self.name_resolver = name_resolver
+        # auction_id -> (version, rendered embed, static template, owner resolved)
+        self._embed_cache: Dict[int, Tuple[int, discord.Embed, discord.Embed, bool]] = {}
+        # Min-heap of (end_ts, auction_id) for auctions that are still running.
+        # Entries are removed lazily, so an ended or missing auction may linger
+        # until it reaches the top of the heap.
+        self._deadlines: List[Tuple[int, int]] = []
+        # Called whenever the set of pending deadlines changes, so a scheduler
+        # sleeping until the next deadline can wake up and re-check
+        self.on_schedule_change: Optional[Callable[[], None]] = None
+        # Secondary indexes over the auctions held in memory, kept up to date
+        # as auctions are created, bid on, ended and evicted
+        self._active_ids: Set[int] = set()
+        # Active auctions in list order: (end_ts, id) for "ending", id for "newest"
+        self._active_by_end: List[Tuple[int, int]] = []
+        self._active_by_id: List[int] = []
+        self._channel_index: Dict[int, Set[int]] = defaultdict(set)
+        self._creator_index: Dict[int, Set[int]] = defaultdict(set)
+        self._bidder_index: Dict[int, Set[int]] = defaultdict(set)
+        # Running totals for /auction stats, kept up to date by place_bid and end_auction
+        self.stats = AuctionStats()
+        # Changes persisted since the last save, and when that was (monotonic)
+        self.unsaved_changes = 0
+        self.last_saved = time.monotonic()
         self.load_data()
         
     def save_data(self):
-        """Save auction data to file"""
+        """Save auction data to the store"""
         try:
-            with open(self.data_file, 'wb') as f:
-                pickle.dump({
-                    'auctions': self.auctions,
-                    'next_id': self.next_id
-                }, f)
-            logger.info(f"Saved auction data to {self.data_file}")
+            with save_data_seconds.time():
+                # Auctions waiting for an archive page are not in the hot set, so
+                # they must reach the archive before the snapshot drops them
+                self._flush_archive()
+                self.store.save(self.auctions, self.next_id, self.stats)
+            self._mark_saved()
+            logger.info("Saved auction data")
             return True
         except Exception as e:
             logger.error(f"Failed to save auction data: {e}")
             return False
+    
+    def prepare_save(self) -> Optional[Callable[[], bool]]:
+        """Capture auction data for saving without blocking the event loop
+
+        Only the capture runs here. The returned function writes it to disk,
+        is meant for a worker thread and returns whether that worked. None
+        means the store has nothing to write.
+        """
+        try:
+            write = self.store.prepare_save(self.auctions, self.next_id, self.stats)
+        except Exception as e:
+            logger.error(f"Failed to capture auction data: {e}")
+            return None
+        # Auctions waiting for an archive page are not in the snapshot, so the
+        # worker writes the page before it
+        page = self.archive.take_page() if self.archive is not None else None
+        self._mark_saved()
+        if write is None and not page:
+            return None
+        
+        def save():
+            try:
+                with save_data_seconds.time():
+                    if page:
+                        self.archive.write_page(page)
+                    if write:
+                        write()
+                logger.info("Saved auction data")
+                return True
+            except Exception as e:
+                # Every change is still in the journal, so nothing is lost
+                logger.error(f"Failed to save auction data: {e}")
+                return False
+        
+        return save
+    
+    def archive_page_full(self) -> bool:
+        """Whether a full page of finalized auctions is waiting for the next save"""
+        return self.archive is not None and self.archive.page_full()
+    
+    def _mark_saved(self):
+        self.unsaved_changes = 0
+        self.last_saved = time.monotonic()
             
     def load_data(self):
-        """Load auction data from file"""
-        if not os.path.exists(self.data_file):
-            logger.info(f"No auction data file found at {self.data_file}")
-            return False
-            
+        """Load auction data from the store"""
         try:
-            with open(self.data_file, 'rb') as f:
-                data = pickle.load(f)
-                self.auctions = data.get('auctions', {})
-                self.next_id = data.get('next_id', 1)
-            logger.info(f"Loaded auction data from {self.data_file}")
+            self.auctions, self.next_id = self.store.load()
+            if self.archive is not None:
+                # Finalized auctions still in the snapshot move to the archive,
+                # which also migrates data saved before archiving existed
+                for auction in [a for a in self.auctions.values() if a.close_state == CLOSE_FINALIZED]:
+                    self._archive_auction(self.auctions.pop(auction.id))
+                # Finalized auctions left in the snapshot are archived still encoded
+                for auction_id in self.store.unloaded_ids():
+                    data, version = self.store.fetch_raw(auction_id)
+                    self.archive.add_encoded(auction_id, data, version)
+            self.stats = self.store.load_stats() or self._rebuild_stats()
+            self._rebuild_deadlines()
+            self._rebuild_indexes()
+            logger.info(f"Loaded {len(self.auctions)} auctions")
             return True
         except Exception as e:
             logger.error(f"Failed to load auction data: {e}")
             return False
     
+    def import_auctions(self, auctions: List[Auction], next_id: int):
+        """Take over auctions from another store, keeping their IDs"""
+        for auction in auctions:
+            self.auctions[auction.id] = auction
+            self.stats.add_auction(auction)
+        self.next_id = max(self.next_id, next_id)
+        self.save_data()
+        # Reloading archives the finalized auctions and rebuilds the indexes
+        self.load_data()
+    
+    def _rebuild_stats(self) -> AuctionStats:
+        """Count every auction from scratch, for data saved before stats were kept"""
+        stats = AuctionStats()
+        for auction in self.auctions.values():
+            stats.add_auction(auction)
+        if self.archive is not None:
+            for auction_id in self.archive.ids():
+                if auction_id not in self.auctions:
+                    stats.add_auction(self.archive.get(auction_id))
+        logger.info(f"Rebuilt auction stats from {stats.total_bids} bids")
+        return stats
+    
+    def close(self):
+        """Write out pending archive pages and close the store"""
+        self._flush_archive()
+        self.store.close()
+    
+    def _archive_auction(self, auction: Auction):
+        """Move a finalized auction to the archive
+
+        Only the encoding happens here; the next save writes the page.
+        """
+        self.archive.add(auction)
+    
+    def _flush_archive(self):
+        if self.archive is not None:
+            self._archived(self.archive.flush())
+    
+    def _archived(self, auction_ids: List[int]):
+        """Drop auctions written to the archive from the snapshot"""
+        for auction_id in auction_ids:
+            self._persist('record_archive', auction_id)
+    
+    def _persist(self, method: str, *args):
+        """Forward a state change to the store without letting storage errors escape"""
+        self.unsaved_changes += 1
+        try:
+            getattr(self.store, method)(*args)
+        except Exception as e:
+            logger.error(f"Failed to persist auction change ({method}): {e}")
+    
     def create_auction(
         self, 
         item_name: str, 
@@ -140,11 +2041,7 @@ class AuctionManager:
         auto_delete_emblem: bool = False
     ) -> int:
         """Create a new auction and return its ID"""
-        auction_id = self.next_id
-        self.next_id += 1
-        
-        auction = Auction(
-            id=auction_id,
+        auction = self._new_auction(
             item_name=item_name,
             starting_bid=starting_bid,
             bid_increment=bid_increment,
@@ -156,13 +2053,40 @@ class AuctionManager:
             anonymous_bidding=anonymous_bidding,
             auto_delete_emblem=auto_delete_emblem
         )
-        
-        self.auctions[auction_id] = auction
-        return auction_id
+        self._persist('record_create', auction)
+        self._notify_schedule_change()
+        return auction.id
+    
+    def create_auctions(self, specs: List[Dict[str, Any]]) -> List[int]:
+        """Create several auctions and return their IDs
+
+        Each spec holds the keyword arguments of create_auction. The new
+        auctions are persisted together, in one journal write or one
+        transaction, and the scheduler is woken once.
+        """
+        auctions = [self._new_auction(**spec) for spec in specs]
+        if auctions:
+            self._persist('record_create_many', auctions)
+            self._notify_schedule_change()
+        return [auction.id for auction in auctions]
+    
+    def _new_auction(self, **fields) -> Auction:
+        """Build an auction with the next ID and add it to the cache and indexes"""
+        auction = Auction(id=self.next_id, **fields)
+        self.next_id += 1
+        self.auctions[auction.id] = auction
+        self._index_auction(auction)
+        heapq.heappush(self._deadlines, (auction.end_ts, auction.id))
+        return auction
     
     def get_auction(self, auction_id: int) -> Optional[Auction]:
         """Get an auction by ID"""
-        return self.auctions.get(auction_id)
+        auction = self.auctions.get(auction_id)
+        if auction is None and self.archive is not None:
+            auction = self.archive.get(auction_id)
+        if auction is None and self.store.lazy:
+            auction = self.store.fetch(auction_id)
+        return auction
     
     def set_message_id(self, auction_id: int, message_id: int) -> bool:
         """Set the message ID for an auction"""
@@ -171,62 +2095,409 @@ class AuctionManager:
             return False
         
         auction.message_id = message_id
+        self._persist('record_message_id', auction)
+        return True
+    
+    def restart_clock(self, auction_id: int) -> bool:
+        """Start a running auction's duration over from now
+
+        Used when an auction is posted, so time spent waiting for its
+        message doesn't count against it.
+        """
+        auction = self.auctions.get(auction_id)
+        if not auction or auction.ended:
+            return False
+        
+        duration = auction.end_ts - auction.created_ts
+        self._remove_active(auction)
+        auction.created_ts = int(time.time())
+        auction.end_ts = auction.created_ts + duration
+        self._add_active(auction)
+        # The old deadline is left in the heap and skipped once it comes up
+        heapq.heappush(self._deadlines, (auction.end_ts, auction.id))
+        # The cached embed shows the old end time
+        self._embed_cache.pop(auction_id, None)
+        self._persist('record_clock', auction)
+        self._notify_schedule_change()
+        return True
+    
+    def place_bid(self, auction_id: int, bidder_id: int, bidder_name: str, bid_amount: int) -> bool:
+        """Place a bid on an auction and persist it
+
+        If another bidder's maximum bid is higher, it answers the bid straight away.
+        """
+        auction = self.get_auction(auction_id)
+        if not auction:
+            return False
+        
+        if not self._place_bid(auction, bidder_id, bidder_name, bid_amount):
+            return False
+        self._resolve_proxy_bids(auction)
+        return True
+    
+    def set_max_bid(self, auction_id: int, bidder_id: int, bidder_name: str, amount: int) -> bool:
+        """Register a private maximum bid
+
+        The bidder is then kept in the lead automatically, up to the maximum.
+        Competing maximums are settled at once. The leader pays one increment
+        over the runner-up's maximum, which takes one bid however many
+        maximums compete. Returns False if the auction is over, the maximum
+        can't beat the current bid, or it would lower the bidder's maximum.
+        """
+        auction = self.get_auction(auction_id)
+        if not auction or auction.is_ended():
+            return False
+        
+        proxy_bids = auction.proxy_bids
+        current = proxy_bids.get(bidder_id) if proxy_bids else None
+        if current is not None and amount <= current:
+            return False
+        if auction.highest_bidder_id == bidder_id:
+            if amount <= auction.highest_bid:
+                return False
+        elif amount < auction.min_next_bid():
+            return False
+        
+        if proxy_bids is None:
+            proxy_bids = auction.proxy_bids = ProxyBids()
+        proxy_bids.set(bidder_id, bidder_name, amount)
+        self._persist('record_max_bid', auction, bidder_id)
+        self._resolve_proxy_bids(auction)
         return True
     
-    def end_auction(self, auction_id: int, cancelled: bool = False) -> bool:
-        """End an auction"""
+    def _place_bid(self, auction: Auction, bidder_id: int, bidder_name: str, bid_amount: int) -> bool:
+        if not auction.place_bid(bidder_id, bidder_name, bid_amount):
+            return False
+        
+        if auction.id in self.auctions:
+            self._bidder_index[bidder_id].add(auction.id)
+        bid = auction.bid_history[-1]
+        self.stats.add_bid(auction, bidder_id, bidder_name, bid.time_ms)
+        self._persist('record_bid', auction, bid)
+        return True
+    
+    def _resolve_proxy_bids(self, auction: Auction) -> bool:
+        """Bid for the highest maximum if it is no longer leading at the right price"""
+        if not auction.proxy_bids:
+            return False
+        
+        leader_id, leader_max, runner_up_max = auction.proxy_bids.top_two()
+        if auction.highest_bidder_id == leader_id and (runner_up_max is None or runner_up_max <= auction.highest_bid):
+            return False
+        
+        # One increment over the runner-up's maximum, but never more than the
+        # leader's own maximum
+        amount = auction.min_next_bid()
+        if runner_up_max is not None:
+            amount = max(amount, min(leader_max, runner_up_max + auction.bid_increment))
+        if amount > leader_max:
+            return False
+        return self._place_bid(auction, leader_id, auction.proxy_bids.names[leader_id], amount)
+    
+    def end_auction(self, auction_id: int, cancelled: bool = False, early: bool = False) -> bool:
+        """End an auction; early marks an administrator ending it before its end time"""
         auction = self.get_auction(auction_id)
         if not auction:
             return False
         
+        already_ended = auction.ended
         auction.ended = True
         auction.cancelled = cancelled
+        auction.ended_early = early
+        auction.close_state = CLOSE_ENDING
+        auction.proxy_bids = None
+        auction.version += 1
+        self._remove_active(auction)
+        if not already_ended:
+            self.stats.add_sale(auction)
+        self._persist('record_end', auction)
+        self._embed_cache.pop(auction_id, None)
+        self._notify_schedule_change()
         return True
     
+    def set_close_state(self, auction_id: int, close_state: str) -> bool:
+        """Record how far closing an ended auction has got"""
+        auction = self.get_auction(auction_id)
+        if not auction:
+            return False
+        
+        auction.close_state = close_state
+        self._persist('record_close_state', auction)
+        if close_state == CLOSE_FINALIZED and auction_id in self.auctions:
+            # Finished auctions leave memory; get_auction loads them on demand
+            self._unindex_auction(self.auctions.pop(auction_id))
+            if self.archive is not None:
+                self._archive_auction(auction)
+        return True
+    
+    def get_unfinished_closings(self) -> List[int]:
+        """Get IDs of ended auctions whose closing hasn't been finalized"""
+        return [
+            auction_id for auction_id, auction in self.auctions.items()
+            if auction.ended and auction.close_state != CLOSE_FINALIZED
+        ]
+    
     def get_active_auctions(self) -> Dict[int, Auction]:
         """Get all active auctions"""
-        return {id: auction for id, auction in self.auctions.items() if not auction.ended}
+        return {auction_id: self.auctions[auction_id] for auction_id in self._active_ids}
+    
+    def get_channel_auction_ids(self, channel_id: int, active_only: bool = False) -> List[int]:
+        """Get IDs of the auctions held in a channel
+
+        Without a lazy store, archived auctions are not included.
+        """
+        if self.store.lazy and not active_only:
+            return self.store.auction_ids_by_channel(channel_id)
+        return self._filter_ids(self._channel_index.get(channel_id, ()), active_only)
+    
+    def get_creator_auction_ids(self, creator_id: int, active_only: bool = False) -> List[int]:
+        """Get IDs of the auctions a user has created
+
+        Without a lazy store, archived auctions are not included.
+        """
+        if self.store.lazy and not active_only:
+            return self.store.auction_ids_by_creator(creator_id)
+        return self._filter_ids(self._creator_index.get(creator_id, ()), active_only)
+    
+    def get_bidder_auction_ids(self, bidder_id: int, active_only: bool = False) -> List[int]:
+        """Get IDs of the auctions a user has bid on
+
+        Without a lazy store, archived auctions are not included.
+        """
+        if self.store.lazy and not active_only:
+            return self.store.auction_ids_by_bidder(bidder_id)
+        return self._filter_ids(self._bidder_index.get(bidder_id, ()), active_only)
+    
+    def get_winning_auction_ids(self, bidder_id: int) -> List[int]:
+        """Get IDs of the active auctions a user is currently the highest bidder on"""
+        return [
+            auction_id for auction_id in self.get_bidder_auction_ids(bidder_id, active_only=True)
+            if self.auctions[auction_id].highest_bidder_id == bidder_id
+        ]
+    
+    def list_active_auctions(
+        self,
+        order: str = "ending",
+        after: Optional[Tuple[int, ...]] = None,
+        limit: int = 10,
+        channel_id: Optional[int] = None,
+        currency: Optional[str] = None,
+        ending_within: Optional[int] = None
+    ) -> Tuple[List[Auction], Optional[Tuple[int, ...]]]:
+        """Get one page of active auctions
+
+        order is "ending" (soonest end first) or "newest". after is the cursor
+        returned with the previous page. Returns the auctions and the cursor
+        for the next page, or None if this is the last page. The cost depends
+        on the page size and the entries skipped by filters, not on how many
+        auctions exist.
+        """
+        deadline = time.time() + ending_within if ending_within is not None else None
+        currency = currency.lower() if currency else None
+        
+        if order == "ending":
+            start = bisect_right(self._active_by_end, after) if after else 0
+            keys = ((key, key[1]) for key in self._active_by_end[start:])
+        else:
+            start = bisect_left(self._active_by_id, after[0]) if after else len(self._active_by_id)
+            keys = (((self._active_by_id[i],), self._active_by_id[i]) for i in range(start - 1, -1, -1))
+        
+        page: List[Auction] = []
+        cursor = None
+        for key, auction_id in keys:
+            auction = self.auctions[auction_id]
+            if deadline is not None and auction.end_ts > deadline:
+                if order == "ending":
+                    # Everything after this ends later too
+                    break
+                continue
+            if channel_id is not None and auction.channel_id != channel_id:
+                continue
+            if currency is not None and auction.currency.lower() != currency:
+                continue
+            if len(page) == limit:
+                # There is at least one more match, so there is a next page
+                return page, cursor
+            page.append(auction)
+            cursor = key
+        return page, None
+    
+    def _add_active(self, auction: Auction):
+        self._active_ids.add(auction.id)
+        insort(self._active_by_end, (auction.end_ts, auction.id))
+        insort(self._active_by_id, auction.id)
+    
+    def _remove_active(self, auction: Auction):
+        if auction.id not in self._active_ids:
+            return
+        self._active_ids.discard(auction.id)
+        self._remove_sorted(self._active_by_end, (auction.end_ts, auction.id))
+        self._remove_sorted(self._active_by_id, auction.id)
+    
+    @staticmethod
+    def _remove_sorted(values: list, value):
+        position = bisect_left(values, value)
+        if position < len(values) and values[position] == value:
+            del values[position]
+    
+    def _filter_ids(self, auction_ids, active_only: bool) -> List[int]:
+        if active_only:
+            return sorted(auction_id for auction_id in auction_ids if auction_id in self._active_ids)
+        return sorted(auction_ids)
+    
+    def _index_auction(self, auction: Auction):
+        """Add an in-memory auction to the secondary indexes"""
+        if not auction.ended:
+            self._add_active(auction)
+        self._channel_index[auction.channel_id].add(auction.id)
+        self._creator_index[auction.creator_id].add(auction.id)
+        for bidder_id in set(auction.bid_history.bidder_ids):
+            self._bidder_index[bidder_id].add(auction.id)
+    
+    def _unindex_auction(self, auction: Auction):
+        """Remove an auction that is leaving memory from the secondary indexes"""
+        self._remove_active(auction)
+        for index, key in (
+            (self._channel_index, auction.channel_id),
+            (self._creator_index, auction.creator_id),
+        ):
+            self._discard_from_index(index, key, auction.id)
+        for bidder_id in set(auction.bid_history.bidder_ids):
+            self._discard_from_index(self._bidder_index, bidder_id, auction.id)
+    
+    @staticmethod
+    def _discard_from_index(index: Dict[int, Set[int]], key: int, auction_id: int):
+        ids = index.get(key)
+        if ids is not None:
+            ids.discard(auction_id)
+            if not ids:
+                del index[key]
+    
+    def _rebuild_indexes(self):
+        """Rebuild the secondary indexes from the auctions in memory"""
+        self._active_ids = set()
+        self._active_by_end = []
+        self._active_by_id = []
+        self._channel_index = defaultdict(set)
+        self._creator_index = defaultdict(set)
+        self._bidder_index = defaultdict(set)
+        for auction in self.auctions.values():
+            self._index_auction(auction)
     
     def get_ended_auctions(self) -> List[int]:
-        """Get IDs of auctions that have ended but haven't been processed yet"""
+        """Get IDs of auctions that have ended but haven't been processed yet
+
+        Due auctions are popped off the deadline heap, so each auction is
+        returned once and the cost only depends on how many are due.
+        """
+        now = time.time()
         ended_auctions = []
-        for auction_id, auction in self.auctions.items():
-            if not auction.ended and auction.is_ended():
+        while self._deadlines and self._deadlines[0][0] <= now:
+            end_ts, auction_id = heapq.heappop(self._deadlines)
+            auction = self.auctions.get(auction_id)
+            # Entries left behind by restart_clock no longer match the end time
+            if auction and not auction.ended and auction.end_ts == end_ts:
                 ended_auctions.append(auction_id)
         return ended_auctions
     
+    def next_deadline(self) -> Optional[datetime.datetime]:
+        """Get the end time of the next auction due to close, if any"""
+        while self._deadlines:
+            end_ts, auction_id = self._deadlines[0]
+            auction = self.auctions.get(auction_id)
+            if auction and not auction.ended and auction.end_ts == end_ts:
+                return datetime.datetime.fromtimestamp(end_ts)
+            # Drop entries for auctions that were ended by hand, removed or rescheduled
+            heapq.heappop(self._deadlines)
+        return None
+    
+    def _notify_schedule_change(self):
+        """Let the scheduler know that the next deadline may have changed"""
+        if self.on_schedule_change:
+            self.on_schedule_change()
+    
+    def _rebuild_deadlines(self):
+        """Rebuild the deadline heap from the running auctions"""
+        self._deadlines = [
+            (auction.end_ts, auction_id)
+            for auction_id, auction in self.auctions.items()
+            if not auction.ended
+        ]
+        heapq.heapify(self._deadlines)
+    
     def create_auction_embed(self, auction: Auction) -> discord.Embed:
-        """Create an embed for an auction"""
+        """Create an embed for an auction
+
+        Renders are cached per auction version. The fields that never change
+        are built once per auction; a new version only updates the title,
+        best offer and highest bidder. The returned embed is shared between
+        callers and must not be modified.
+        """
+        cached = self._embed_cache.get(auction.id)
+        if cached and cached[0] == auction.version:
+            return cached[1]
+        
+        started = time.perf_counter()
+        if cached and cached[3]:
+            template, owner_resolved = cached[2], True
+        else:
+            # Build the static part once, or again if the owner is still unknown
+            template, owner_resolved = self._create_static_embed(auction)
+        
+        embed = template.copy()
+        # copy() shares the field dicts with the template, and set_field_at
+        # edits them in place, so each render gets its own
+        embed._fields = [dict(field) for field in template._fields]
         if auction.ended:
-            title = f"Auction: {auction.item_name} [ENDED]"
-            color = discord.Color.red()
+            embed.title = f"Auction: {auction.item_name} [ENDED]"
+            embed.colour = discord.Color.red()
+            if auction.auto_delete_emblem:
+                embed.set_thumbnail(url=None)
+        
+        # Add best offer (current highest bid)
+        if auction.highest_bidder_id:
+            best_offer = f"{auction.highest_bid} {auction.currency}"
+        else:
+            best_offer = f"{auction.starting_bid} {auction.currency} (Starting Bid)"
+        embed.set_field_at(self.BEST_OFFER_FIELD, name="Best Offer", value=best_offer, inline=True)
+        
+        # Add highest bidder info
+        if not auction.highest_bidder_id:
+            highest_bidder = "None"
+        elif auction.anonymous_bidding:
+            highest_bidder = "Anonymous"
         else:
-            title = f"Auction: {auction.item_name}"
-            color = discord.Color.gold()
+            highest_bidder = auction.highest_bidder_name
+        embed.set_field_at(self.HIGHEST_BIDDER_FIELD, name="Highest Bidder", value=highest_bidder, inline=True)
         
+        # Ended auctions are rarely rendered again, so they aren't kept around
+        if not auction.ended:
+            self._embed_cache[auction.id] = (auction.version, embed, template, owner_resolved)
+        embed_render_seconds.observe(time.perf_counter() - started)
+        return embed
+    
+    def _create_static_embed(self, auction: Auction) -> Tuple[discord.Embed, bool]:
+        """Build the parts of an auction embed that don't change while it runs
+
+        Returns the embed and whether the owner's name could be resolved.
+        """
         embed = discord.Embed(
-            title=title,
+            title=f"Auction: {auction.item_name}",
             description=f"Place your bids for this item!",
-            color=color
+            color=discord.Color.gold()
         )
         
-        # Set emblem image if available and not auto-deleted
-        if auction.emblem_url and not (auction.ended and auction.auto_delete_emblem):
+        # Set emblem image if available
+        if auction.emblem_url:
             embed.set_thumbnail(url=auction.emblem_url)
         
         # Get owner name
-        try:
-            from discord.ext import commands
-            bot = commands.Bot.get_instance()
-            owner = bot.get_user(auction.creator_id)
-            owner_name = owner.name if owner else f"User ID: {auction.creator_id}"
-        except:
-            owner_name = f"User ID: {auction.creator_id}"
+        owner_name = self.name_resolver(auction.creator_id) if self.name_resolver else None
         
         # Add owner field
         embed.add_field(
             name="Owner", 
-            value=owner_name, 
+            value=owner_name or f"User ID: {auction.creator_id}", 
             inline=True
         )
         
@@ -244,19 +2515,8 @@ class AuctionManager:
             inline=True
         )
         
-        # Add best offer (current highest bid)
-        if auction.highest_bidder_id:
-            embed.add_field(
-                name="Best Offer", 
-                value=f"{auction.highest_bid} {auction.currency}", 
-                inline=True
-            )
-        else:
-            embed.add_field(
-                name="Best Offer", 
-                value=f"{auction.starting_bid} {auction.currency} (Starting Bid)", 
-                inline=True
-            )
+        # Placeholder for the best offer, filled in per version
+        embed.add_field(name="Best Offer", value="-", inline=True)
         
         # Add bid increment
         embed.add_field(
@@ -272,29 +2532,11 @@ class AuctionManager:
             inline=True
         )
         
-        # Add highest bidder info
-        if auction.highest_bidder_id:
-            if auction.anonymous_bidding:
-                embed.add_field(
-                    name="Highest Bidder", 
-                    value="Anonymous", 
-                    inline=True
-                )
-            else:
-                embed.add_field(
-                    name="Highest Bidder", 
-                    value=auction.highest_bidder_name, 
-                    inline=True
-                )
-        else:
-            embed.add_field(
-                name="Highest Bidder", 
-                value="None", 
-                inline=True
-            )
+        # Placeholder for the highest bidder, filled in per version
+        embed.add_field(name="Highest Bidder", value="-", inline=True)
         
         # Add time information
-        end_timestamp = int(auction.end_time.timestamp())
+        end_timestamp = auction.end_ts
         embed.add_field(
             name="End Time", 
             value=f"<t:{end_timestamp}:R> (<t:{end_timestamp}:F>)", 
@@ -306,4 +2548,132 @@ class AuctionManager:
             text=f"Click the 'Place Bid' button to bid. Minimum bid increment: {auction.bid_increment} {auction.currency}"
         )
         
-        return embed
+        return embed, owner_name is not None
+
+
+class AuctionPartitions:
+    """Auction managers partitioned by guild
+
+    Each guild has its own ID space and its own files under data_dir, so
+    shards running in separate processes never share a file or a lock. A
+    process only loads the guilds owned by its shards. storage is "snapshot"
+    for a binary snapshot plus journal, or "sqlite".
+    """
+    def __init__(
+        self,
+        data_dir: str = "auction_data",
+        storage: str = "snapshot",
+        name_resolver: Optional[Callable[[int], Optional[str]]] = None
+    ):
+        self.data_dir = data_dir
+        if storage == "pickle":
+            # Older name of "snapshot", from when snapshots were pickles
+            logger.warning('Auction storage "pickle" is deprecated, use "snapshot"')
+            storage = "snapshot"
+        self.storage = storage
+        self.name_resolver = name_resolver
+        # Shards run by this process; None until known, in which case every
+        # guild counts as owned
+        self.shard_ids: Optional[List[int]] = None
+        self.shard_count: Optional[int] = None
+        self.managers: Dict[int, AuctionManager] = {}
+        os.makedirs(data_dir, exist_ok=True)
+    
+    def owns(self, guild_id: int) -> bool:
+        """Check whether a guild belongs to one of this process's shards"""
+        if not self.shard_count or self.shard_ids is None:
+            return True
+        # Discord's sharding formula
+        return (guild_id >> 22) % self.shard_count in self.shard_ids
+    
+    def get(self, guild_id: int) -> AuctionManager:
+        """Get the manager of a guild, loading or creating its partition"""
+        manager = self.managers.get(guild_id)
+        if manager is None:
+            manager = self.managers[guild_id] = self._open(guild_id)
+        return manager
+    
+    def stored_guild_ids(self) -> List[int]:
+        """Get the guilds that have a partition on disk"""
+        return [int(name) for name in os.listdir(self.data_dir) if name.isdigit()]
+    
+    def load_owned(self) -> List[AuctionManager]:
+        """Load the partitions of all guilds owned by this process"""
+        return [self.get(guild_id) for guild_id in self.stored_guild_ids() if self.owns(guild_id)]
+    
+    def migrate_legacy(
+        self,
+        store,
+        archive: Optional[AuctionArchive],
+        guild_for_channel: Callable[[int], Optional[int]]
+    ) -> int:
+        """Move auctions from the single pre-partitioning store into guild partitions
+
+        Only owned guilds without a partition are migrated, so each process
+        migrates its own guilds and running it again does nothing. Auctions
+        in channels that can't be resolved to a guild are left behind. The
+        legacy store is only read, since every shard process reads it; use
+        legacy_migrated() to skip reading it once this process is done.
+        Returns the number of auctions moved.
+        """
+        auctions, next_id = store.load_all()
+        if archive is not None:
+            for auction_id in archive.ids():
+                auctions.setdefault(auction_id, archive.get(auction_id))
+        
+        by_guild: Dict[int, List[Auction]] = defaultdict(list)
+        for auction in auctions.values():
+            guild_id = guild_for_channel(auction.channel_id)
+            if guild_id is not None and self.owns(guild_id):
+                by_guild[guild_id].append(auction)
+        
+        migrated = 0
+        existing = set(self.stored_guild_ids())
+        for guild_id, guild_auctions in by_guild.items():
+            if guild_id in existing:
+                continue
+            # IDs stay as they were, so the guild's ID space continues after them
+            self.get(guild_id).import_auctions(guild_auctions, next_id)
+            migrated += len(guild_auctions)
+            logger.info(f"Migrated {len(guild_auctions)} auctions into the partition of guild {guild_id}")
+        return migrated
+    
+    def legacy_migrated(self) -> bool:
+        """Check whether the guilds of this process's shards were already migrated"""
+        return any(
+            all(os.path.exists(marker) for marker in markers)
+            for markers in (self._legacy_markers(), [self._legacy_marker("all")])
+        )
+    
+    def mark_legacy_migrated(self):
+        """Record that the guilds of this process's shards have been migrated"""
+        for marker in self._legacy_markers():
+            open(marker, 'w').close()
+    
+    def _legacy_markers(self) -> List[str]:
+        if not self.shard_count or self.shard_ids is None:
+            return [self._legacy_marker("all")]
+        # Resharding assigns guilds differently, so the shard count is part of the name
+        return [self._legacy_marker(f"shard{shard_id}-of-{self.shard_count}") for shard_id in self.shard_ids]
+    
+    def _legacy_marker(self, owner: str) -> str:
+        return os.path.join(self.data_dir, f".legacy_migrated.{owner}")
+    
+    def close(self):
+        for manager in self.managers.values():
+            manager.close()
+        self.managers.clear()
+    
+    def _open(self, guild_id: int) -> AuctionManager:
+        path = os.path.join(self.data_dir, str(guild_id))
+        os.makedirs(path, exist_ok=True)
+        archive = None
+        if self.storage == "sqlite":
+            store = SQLiteAuctionStore(os.path.join(path, "auction_data.db"))
+        else:
+            store = SnapshotJournalStore(
+                os.path.join(path, "auction_data.snap"),
+                os.path.join(path, "auction_data.journal")
+            )
+            archive = AuctionArchive(os.path.join(path, "auction_archive.dat"))
+        return AuctionManager(store=store, name_resolver=self.name_resolver, archive=archive, guild_id=guild_id)
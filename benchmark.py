@@ -0,0 +1,481 @@
+"""Load test and benchmark for the auction bot
+
+Drives the real bid button, bid modal, scheduler and persistence code against
+in-process stand-ins for Discord. The fake REST layer injects latency and
+counts calls, so results show both how fast the bot is and how much it talks
+to Discord. Run it from the bot directory:
+
+    python -m utils.benchmark --sizes 1000,10000,100000 --json bench.json
+    python -m utils.benchmark --compare bench.json
+
+With --compare the run fails if throughput or p99 latency regress by more
+than --tolerance against a previous --json result.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+import discord
+
+from cogs.auction import AuctionCog, BidButton, BidModal
+from utils.auction_manager import AuctionManager, AuctionPartitions
+
+# Share of auctions that are already due when check_auctions runs
+DUE_FRACTION = 0.01
+# Distinct bidders taking part in the bid bursts
+BIDDER_POOL = 5000
+# Zipf exponent for how bids spread over auctions; a few hot auctions get most of them
+ZIPF_EXPONENT = 1.2
+# Mean number of bids in one burst on the same auction
+MEAN_BURST = 8
+# Guild that all benchmark auctions belong to
+GUILD_ID = 1
+
+
+class FakeREST:
+    """Counts Discord REST calls and delays each one like a real round trip"""
+    def __init__(self, latency_ms: float, rng: random.Random):
+        self.latency = latency_ms / 1000
+        self.rng = rng
+        self.calls: Counter = Counter()
+
+    async def request(self, route: str):
+        self.calls[route] += 1
+        if self.latency:
+            # Round trips have a long tail; lognormal with the given median
+            await asyncio.sleep(self.latency * self.rng.lognormvariate(0, 0.5))
+
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+
+class FakeUser:
+    def __init__(self, user_id: int, rest: FakeREST):
+        self.id = user_id
+        self.name = f"bidder{user_id}"
+        self.mention = f"<@{user_id}>"
+        self.rest = rest
+
+    async def send(self, content=None, **kwargs):
+        await self.rest.request("dm.send")
+
+
+class FakeMessage:
+    def __init__(self, channel: "FakeChannel", message_id: int):
+        self.channel = channel
+        self.id = message_id
+
+    async def edit(self, **kwargs):
+        await self.channel.rest.request("message.edit")
+        return self
+
+
+class FakeChannel:
+    def __init__(self, channel_id: int, rest: FakeREST):
+        self.id = channel_id
+        self.rest = rest
+        self._next_message_id = 1
+
+    def get_partial_message(self, message_id: int) -> FakeMessage:
+        return FakeMessage(self, message_id)
+
+    async def fetch_message(self, message_id: int) -> FakeMessage:
+        await self.rest.request("message.fetch")
+        return FakeMessage(self, message_id)
+
+    async def send(self, content=None, **kwargs) -> FakeMessage:
+        await self.rest.request("channel.send")
+        self._next_message_id += 1
+        return FakeMessage(self, self._next_message_id)
+
+
+class FakeResponse:
+    def __init__(self, rest: FakeREST):
+        self.rest = rest
+        self.modal: Optional[discord.ui.Modal] = None
+        self.content: Optional[str] = None
+
+    async def send_message(self, content=None, **kwargs):
+        await self.rest.request("interaction.respond")
+        self.content = content
+
+    async def send_modal(self, modal: discord.ui.Modal):
+        await self.rest.request("interaction.respond")
+        self.modal = modal
+
+    async def edit_message(self, **kwargs):
+        await self.rest.request("interaction.respond")
+
+    async def defer(self, **kwargs):
+        await self.rest.request("interaction.respond")
+
+
+class FakeInteraction:
+    def __init__(self, client: "FakeBot", user: FakeUser, channel: FakeChannel, guild_id: int, rest: FakeREST):
+        self.client = client
+        self.user = user
+        self.channel = channel
+        self.channel_id = channel.id
+        self.guild_id = guild_id
+        self.response = FakeResponse(rest)
+
+
+class FakeBot:
+    def __init__(self, rest: FakeREST, channels: int):
+        self.rest = rest
+        self.channels = {channel_id: FakeChannel(channel_id, rest) for channel_id in range(1, channels + 1)}
+        self.users: Dict[int, FakeUser] = {}
+        self.shard_id = None
+        self.shard_count = None
+        self.cogs: Dict[str, Any] = {}
+
+    def get_channel(self, channel_id: int) -> Optional[FakeChannel]:
+        return self.channels.get(channel_id)
+
+    async def fetch_channel(self, channel_id: int) -> FakeChannel:
+        await self.rest.request("channel.fetch")
+        return self.channels[channel_id]
+
+    def get_user(self, user_id: int) -> FakeUser:
+        user = self.users.get(user_id)
+        if user is None:
+            user = self.users[user_id] = FakeUser(user_id, self.rest)
+        return user
+
+    async def fetch_user(self, user_id: int) -> FakeUser:
+        await self.rest.request("user.fetch")
+        return self.get_user(user_id)
+
+    async def wait_until_ready(self):
+        pass
+
+    def get_cog(self, name: str):
+        return self.cogs.get(name)
+
+    def add_dynamic_items(self, *items):
+        pass
+
+    def remove_dynamic_items(self, *items):
+        pass
+
+
+class Timer:
+    """Collects per-operation latencies"""
+    def __init__(self):
+        self.samples: List[float] = []
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+
+    def stop(self):
+        self.elapsed = time.perf_counter() - self.started
+
+    def summary(self) -> Dict[str, float]:
+        samples = sorted(self.samples)
+        count = len(samples)
+        return {
+            'ops': count,
+            'seconds': round(self.elapsed, 4),
+            'throughput': round(count / self.elapsed, 1) if self.elapsed else 0.0,
+            'p50_ms': round(_percentile(samples, 50) * 1000, 3),
+            'p99_ms': round(_percentile(samples, 99) * 1000, 3),
+        }
+
+
+def _percentile(samples: List[float], percent: float) -> float:
+    if not samples:
+        return 0.0
+    index = min(len(samples) - 1, int(round(percent / 100 * (len(samples) - 1))))
+    return samples[index]
+
+
+def _zipf_weights(count: int) -> List[float]:
+    return [1 / rank ** ZIPF_EXPONENT for rank in range(1, count + 1)]
+
+
+class Benchmark:
+    """Runs every scenario against one cog filled with `size` auctions"""
+    def __init__(self, size: int, args: argparse.Namespace):
+        self.size = size
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.rest = FakeREST(args.latency, self.rng)
+        self.bot = FakeBot(self.rest, args.channels)
+        self.results: Dict[str, Any] = {'size': size}
+
+    async def run(self) -> Dict[str, Any]:
+        # The cog keeps its data files in the working directory
+        with tempfile.TemporaryDirectory() as workdir:
+            cwd = os.getcwd()
+            os.chdir(workdir)
+            try:
+                self.cog = AuctionCog(self.bot)
+                self.bot.cogs[self.cog.qualified_name] = self.cog
+                self.guild = self.cog._guild(GUILD_ID)
+                self.manager: AuctionManager = self.guild.manager
+                self.guild.publisher.UPDATE_DELAY = self.args.update_delay
+                await self._phase('create', self.bench_create)
+                await self._phase('embed', self.bench_embed)
+                await self._phase('bid', self.bench_bids)
+                await self._phase('check_auctions', self.bench_check_auctions)
+                await self._phase('save_data', self.bench_save)
+                await self._phase('load_data', self.bench_load)
+            finally:
+                self.cog.cog_unload()
+                os.chdir(cwd)
+        self.results['peak_rss_mb'] = round(_peak_rss_mb(), 1)
+        return self.results
+
+    async def _phase(self, name: str, scenario):
+        gc.collect()
+        if self.args.tracemalloc:
+            tracemalloc.start()
+        rest_before = self.rest.total()
+        result = await scenario()
+        result['rest_calls'] = self.rest.total() - rest_before
+        if self.args.tracemalloc:
+            result['peak_traced_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 1)
+            tracemalloc.stop()
+        self.results[name] = result
+
+    async def bench_create(self) -> Dict[str, Any]:
+        timer = Timer()
+        due = int(self.size * DUE_FRACTION)
+        for index in range(self.size):
+            started = time.perf_counter()
+            auction_id = self.manager.create_auction(
+                item_name=f"Item {index}",
+                starting_bid=100,
+                bid_increment=self.rng.choice((1, 5, 10)),
+                # The first few are due straight away for the check_auctions run
+                duration_seconds=0 if index < due else self.rng.randint(3600, 7 * 86400),
+                creator_id=self.rng.randint(1, BIDDER_POOL),
+                channel_id=self.rng.randint(1, self.args.channels),
+                currency=self.rng.choice(("coins", "gold", "gems"))
+            )
+            self.manager.set_message_id(auction_id, 10 ** 6 + auction_id)
+            timer.record(time.perf_counter() - started)
+        timer.stop()
+        self.due = due
+        return timer.summary()
+
+    async def bench_embed(self) -> Dict[str, Any]:
+        """Render embeds for random running auctions, as the publisher does"""
+        timer = Timer()
+        auction_ids = self._running_ids()
+        for _ in range(self.args.embeds):
+            auction = self.manager.get_auction(self.rng.choice(auction_ids))
+            started = time.perf_counter()
+            self.manager.create_auction_embed(auction)
+            timer.record(time.perf_counter() - started)
+        timer.stop()
+        return timer.summary()
+
+    async def bench_bids(self) -> Dict[str, Any]:
+        """Click Place Bid and submit the modal in bursts on Zipf-distributed auctions"""
+        auction_ids = self._running_ids()
+        self.rng.shuffle(auction_ids)
+        weights = _zipf_weights(len(auction_ids))
+        bids = self.args.bids or max(1000, self.size // 10)
+
+        button_timer = Timer()
+        submit_timer = Timer()
+        outcomes: Counter = Counter()
+        placed = 0
+        while placed < bids:
+            auction_id = self.rng.choices(auction_ids, weights)[0]
+            burst = min(bids - placed, max(1, int(self.rng.expovariate(1 / MEAN_BURST))))
+            placed += burst
+            # A burst is a group of bidders racing on the same auction
+            await asyncio.gather(*(
+                self._bid(auction_id, button_timer, submit_timer, outcomes)
+                for _ in range(burst)
+            ))
+        button_timer.stop()
+        submit_timer.stop()
+
+        # Let queued message edits go out so they are counted
+        await self._drain_publisher()
+
+        result = submit_timer.summary()
+        result['button_p50_ms'] = button_timer.summary()['p50_ms']
+        result['button_p99_ms'] = button_timer.summary()['p99_ms']
+        result['accepted'] = outcomes['accepted']
+        result['rejected'] = outcomes['rejected']
+        return result
+
+    async def _bid(self, auction_id: int, button_timer: Timer, submit_timer: Timer, outcomes: Counter):
+        user = self.bot.get_user(self.rng.randint(1, BIDDER_POOL))
+        auction = self.manager.get_auction(auction_id)
+        channel = self.bot.get_channel(auction.channel_id)
+
+        interaction = FakeInteraction(self.bot, user, channel, GUILD_ID, self.rest)
+        started = time.perf_counter()
+        # Built the way the dispatcher builds it from the clicked custom_id
+        await BidButton(auction_id).callback(interaction)
+        button_timer.record(time.perf_counter() - started)
+        modal: BidModal = interaction.response.modal
+
+        # Bidders usually outbid the suggested minimum by a few increments
+        amount = modal.min_bid + auction.bid_increment * int(self.rng.expovariate(0.5))
+        # Filled in the same way discord.py does when the modal is submitted
+        modal.bid_amount._value = str(amount)
+
+        interaction = FakeInteraction(self.bot, user, channel, GUILD_ID, self.rest)
+        started = time.perf_counter()
+        await modal.on_submit(interaction)
+        submit_timer.record(time.perf_counter() - started)
+        outcomes['accepted' if interaction.response.content.startswith("Bid of") else 'rejected'] += 1
+
+    async def bench_check_auctions(self) -> Dict[str, Any]:
+        """Close the due auctions and wait for their closing pipeline"""
+        timer = Timer()
+        started = time.perf_counter()
+        await self.cog.check_auctions()
+        timer.record(time.perf_counter() - started)
+        closings = list(self.guild.closer._tasks.values())
+        if closings:
+            await asyncio.gather(*closings, return_exceptions=True)
+        timer.stop()
+        result = timer.summary()
+        result['closed'] = self.due
+        result['throughput'] = round(self.due / timer.elapsed, 1) if timer.elapsed else 0.0
+        result['notifications_queued'] = len(self.cog.outbox.pending())
+        return result
+
+    async def bench_save(self) -> Dict[str, Any]:
+        timer = Timer()
+        for _ in range(self.args.repeat):
+            started = time.perf_counter()
+            if not self.manager.save_data():
+                raise RuntimeError("save_data failed")
+            timer.record(time.perf_counter() - started)
+        timer.stop()
+        return timer.summary()
+
+    async def bench_load(self) -> Dict[str, Any]:
+        timer = Timer()
+        for _ in range(self.args.repeat):
+            partitions = AuctionPartitions(self.cog.partitions.data_dir, self.cog.storage)
+            started = time.perf_counter()
+            # Opening a partition loads it
+            partitions.get(GUILD_ID)
+            timer.record(time.perf_counter() - started)
+            partitions.close()
+        timer.stop()
+        return timer.summary()
+
+    def _running_ids(self) -> List[int]:
+        return [auction.id for auction in self.manager.get_active_auctions().values() if not auction.is_ended()]
+
+    async def _drain_publisher(self):
+        while self.guild.publisher._pending:
+            await asyncio.gather(*self.guild.publisher._pending.values(), return_exceptions=True)
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    lines = []
+    for result in results:
+        lines.append(f"== {result['size']} auctions (peak RSS {result['peak_rss_mb']} MB) ==")
+        for phase in ('create', 'embed', 'bid', 'check_auctions', 'save_data', 'load_data'):
+            stats = result[phase]
+            line = (
+                f"{phase:<15} {stats['ops']:>8} ops  {stats['throughput']:>10.1f}/s  "
+                f"p50 {stats['p50_ms']:>9.3f} ms  p99 {stats['p99_ms']:>9.3f} ms  "
+                f"REST {stats['rest_calls']}"
+            )
+            if 'peak_traced_mb' in stats:
+                line += f"  traced peak {stats['peak_traced_mb']} MB"
+            lines.append(line)
+        bids = result['bid']
+        lines.append(
+            f"bids: {bids['accepted']} accepted, {bids['rejected']} rejected, "
+            f"{bids['rest_calls'] / bids['ops']:.2f} REST calls per bid, "
+            f"button p50 {bids['button_p50_ms']} ms / p99 {bids['button_p99_ms']} ms"
+        )
+        lines.append("")
+    return "\n".join(lines)
+
+
+def compare(results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float) -> List[str]:
+    """List the phases that got slower than the baseline by more than tolerance"""
+    regressions = []
+    previous = {result['size']: result for result in baseline}
+    for result in results:
+        old = previous.get(result['size'])
+        if old is None:
+            continue
+        for phase in ('create', 'embed', 'bid', 'check_auctions', 'save_data', 'load_data'):
+            new_stats, old_stats = result[phase], old[phase]
+            if old_stats['throughput'] and new_stats['throughput'] < old_stats['throughput'] * (1 - tolerance):
+                regressions.append(
+                    f"{result['size']} {phase}: throughput {old_stats['throughput']} -> {new_stats['throughput']}/s"
+                )
+            if old_stats['p99_ms'] and new_stats['p99_ms'] > old_stats['p99_ms'] * (1 + tolerance):
+                regressions.append(
+                    f"{result['size']} {phase}: p99 {old_stats['p99_ms']} -> {new_stats['p99_ms']} ms"
+                )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the auction bot against fake Discord objects")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Comma-separated auction counts")
+    parser.add_argument("--bids", type=int, default=0, help="Bids per size (default: size / 10, at least 1000)")
+    parser.add_argument("--embeds", type=int, default=10000, help="Embeds to render per size")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs of save_data and load_data per size")
+    parser.add_argument("--channels", type=int, default=20, help="Channels the auctions are spread over")
+    parser.add_argument("--latency", type=float, default=50.0, help="Median fake REST latency in ms")
+    parser.add_argument("--update-delay", type=float, default=1.0, help="Publisher coalescing delay in seconds")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tracemalloc", action="store_true", help="Report traced peak memory per phase (slower)")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--output", help="Also write the report to this file")
+    parser.add_argument("--compare", help="Fail if results regress against this --json file")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed regression for --compare (default: 0.2)")
+    args = parser.parse_args(argv)
+
+    results = []
+    for size in (int(value) for value in args.sizes.split(",")):
+        print(f"Running {size} auctions...", file=sys.stderr)
+        results.append(asyncio.run(Benchmark(size, args).run()))
+
+    report = format_report(results)
+    print(report)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,267 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import sqlite3
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger('auction_bot')
+
+# Kinds of notification destinations
+CHANNEL = "channel"
+DIRECT_MESSAGE = "dm"
+
+
+class Notification(NamedTuple):
+    id: int
+    kind: str
+    destination_id: int
+    content: str
+    attempts: int
+    next_attempt_at: float
+
+
+class NotificationOutbox:
+    """Durable queue of outgoing Discord messages
+
+    Notifications are committed here before anything is sent, so they
+    survive restarts. Delivered notifications are kept as sent for a while,
+    so their dedupe keys keep stopping duplicates, and pruned later; ones
+    that keep failing are kept as dead letters for inspection.
+    """
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            dedupe_key TEXT UNIQUE,
+            kind TEXT NOT NULL,
+            destination_id INTEGER NOT NULL,
+            content TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            created_at REAL NOT NULL,
+            sent_at REAL
+        );
+        CREATE INDEX IF NOT EXISTS idx_outbox_status ON outbox(status, next_attempt_at);
+    """
+
+    def __init__(self, db_file: str = "auction_outbox.db"):
+        self.db_file = db_file
+        self.conn = sqlite3.connect(db_file)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(self.SCHEMA)
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(outbox)")}
+        if "sent_at" not in columns:
+            self.conn.execute("ALTER TABLE outbox ADD COLUMN sent_at REAL")
+        self.conn.commit()
+
+    def add(self, kind: str, destination_id: int, content: str, dedupe_key: str = None) -> Optional[Notification]:
+        """Queue a notification
+
+        Returns None if a notification with the same dedupe key was already queued.
+        """
+        now = time.time()
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT OR IGNORE INTO outbox (dedupe_key, kind, destination_id, content, next_attempt_at, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (dedupe_key, kind, destination_id, content, now, now)
+            )
+        if cursor.rowcount == 0:
+            return None
+        return Notification(cursor.lastrowid, kind, destination_id, content, 0, now)
+
+    def pending(self) -> List[Notification]:
+        """Get all notifications that still have to be delivered"""
+        rows = self.conn.execute(
+            "SELECT id, kind, destination_id, content, attempts, next_attempt_at FROM outbox "
+            "WHERE status = 'pending' ORDER BY id"
+        ).fetchall()
+        return [Notification(*row) for row in rows]
+
+    def mark_sent(self, notification_id: int):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET status = 'sent', sent_at = ? WHERE id = ?",
+                (time.time(), notification_id)
+            )
+
+    def prune_sent(self, older_than: float) -> int:
+        """Remove notifications delivered before the given time and return how many"""
+        with self.conn:
+            cursor = self.conn.execute(
+                "DELETE FROM outbox WHERE status = 'sent' AND sent_at < ?",
+                (older_than,)
+            )
+        return cursor.rowcount
+
+    def mark_failed(self, notification_id: int, error: str, next_attempt_at: float):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, last_error = ?, next_attempt_at = ? WHERE id = ?",
+                (error, next_attempt_at, notification_id)
+            )
+
+    def mark_dead(self, notification_id: int, error: str):
+        with self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET status = 'dead', attempts = attempts + 1, last_error = ? WHERE id = ?",
+                (error, notification_id)
+            )
+
+    def dead_letters(self, limit: int = 50) -> List[Tuple[Notification, str]]:
+        """Get the most recent notifications that could not be delivered, with their last error"""
+        rows = self.conn.execute(
+            "SELECT id, kind, destination_id, content, attempts, next_attempt_at, last_error FROM outbox "
+            "WHERE status = 'dead' ORDER BY id DESC LIMIT ?",
+            (limit,)
+        ).fetchall()
+        return [(Notification(*row[:6]), row[6]) for row in rows]
+
+    def dead_letter_count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM outbox WHERE status = 'dead'").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+
+class NotificationDispatcher:
+    """Delivers queued notifications with a pool of workers
+
+    Sends to the same channel or user are spaced at least MIN_INTERVAL apart.
+    Failed sends are retried with exponential backoff and dead-lettered after
+    MAX_ATTEMPTS, or straight away if Discord refuses them outright.
+    """
+    WORKERS = 4
+    MAX_ATTEMPTS = 8
+    # Seconds before the first retry, doubled after every failed attempt
+    RETRY_DELAY = 5
+    # Minimum seconds between two sends to the same destination
+    MIN_INTERVAL = 1.0
+    # Seconds delivered notifications are kept for deduplication, and how
+    # often older ones are pruned
+    SENT_RETENTION = 7 * 24 * 3600
+    PRUNE_INTERVAL = 3600
+
+    def __init__(self, bot, outbox: NotificationOutbox):
+        self.bot = bot
+        self.outbox = outbox
+        # Heap of (due time on the loop clock, tie breaker, notification)
+        self._scheduled: List[Tuple[float, int, Notification]] = []
+        self._counter = itertools.count()
+        self._next_send: Dict[Tuple[str, int], float] = {}
+        self._wakeup = asyncio.Event()
+        self._ready: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+
+    def start(self):
+        """Load undelivered notifications and start the workers"""
+        for notification in self.outbox.pending():
+            self._schedule(notification, notification.next_attempt_at)
+        self._tasks.append(asyncio.create_task(self._schedule_loop()))
+        for _ in range(self.WORKERS):
+            self._tasks.append(asyncio.create_task(self._worker()))
+
+    def close(self):
+        """Stop the workers; undelivered notifications stay in the outbox"""
+        for task in self._tasks:
+            task.cancel()
+        self._tasks.clear()
+
+    def notify_channel(self, channel_id: int, content: str, dedupe_key: str = None):
+        """Queue a message to a channel"""
+        self._add(CHANNEL, channel_id, content, dedupe_key)
+
+    def notify_user(self, user_id: int, content: str, dedupe_key: str = None):
+        """Queue a direct message to a user"""
+        self._add(DIRECT_MESSAGE, user_id, content, dedupe_key)
+
+    def _add(self, kind: str, destination_id: int, content: str, dedupe_key: Optional[str]):
+        notification = self.outbox.add(kind, destination_id, content, dedupe_key)
+        if notification:
+            self._schedule(notification, notification.next_attempt_at)
+
+    def _schedule(self, notification: Notification, wall_time: float):
+        # Persisted times are wall clock; the loop schedules on its own clock
+        loop = asyncio.get_running_loop()
+        due = loop.time() + max(0.0, wall_time - time.time())
+        heapq.heappush(self._scheduled, (due, next(self._counter), notification))
+        self._wakeup.set()
+
+    async def _schedule_loop(self):
+        """Hand due notifications to the workers, respecting per-destination spacing"""
+        loop = asyncio.get_running_loop()
+        next_prune = loop.time()
+        while True:
+            self._wakeup.clear()
+            now = loop.time()
+            if now >= next_prune:
+                self._prune()
+                next_prune = now + self.PRUNE_INTERVAL
+            while self._scheduled and self._scheduled[0][0] <= now:
+                _, _, notification = heapq.heappop(self._scheduled)
+                destination = (notification.kind, notification.destination_id)
+                allowed_at = self._next_send.get(destination, 0.0)
+                if allowed_at > now:
+                    heapq.heappush(self._scheduled, (allowed_at, next(self._counter), notification))
+                    continue
+                self._next_send[destination] = now + self.MIN_INTERVAL
+                self._ready.put_nowait(notification)
+
+            timeout = next_prune - now
+            if self._scheduled:
+                timeout = min(timeout, self._scheduled[0][0] - now)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    def _prune(self):
+        try:
+            pruned = self.outbox.prune_sent(time.time() - self.SENT_RETENTION)
+        except sqlite3.Error as e:
+            logger.error(f"Could not prune sent notifications: {e}")
+            return
+        if pruned:
+            logger.info(f"Pruned {pruned} delivered notifications")
+
+    async def _worker(self):
+        while True:
+            notification = await self._ready.get()
+            try:
+                await self._deliver(notification)
+            except (discord.Forbidden, discord.NotFound) as e:
+                # DMs closed, channel gone or missing permissions; retrying won't help
+                logger.warning(f"Dead-lettering notification {notification.id}: {e}")
+                self.outbox.mark_dead(notification.id, str(e))
+            except Exception as e:
+                self._retry(notification, e)
+            else:
+                self.outbox.mark_sent(notification.id)
+
+    def _retry(self, notification: Notification, error: Exception):
+        attempts = notification.attempts + 1
+        if attempts >= self.MAX_ATTEMPTS:
+            logger.error(f"Dead-lettering notification {notification.id} after {attempts} attempts: {error}")
+            self.outbox.mark_dead(notification.id, str(error))
+            return
+
+        next_attempt_at = time.time() + self.RETRY_DELAY * 2 ** (attempts - 1)
+        logger.warning(f"Notification {notification.id} failed (attempt {attempts}), retrying: {error}")
+        self.outbox.mark_failed(notification.id, str(error), next_attempt_at)
+        self._schedule(notification._replace(attempts=attempts, next_attempt_at=next_attempt_at), next_attempt_at)
+
+    async def _deliver(self, notification: Notification):
+        if notification.kind == CHANNEL:
+            destination = self.bot.get_channel(notification.destination_id)
+            if destination is None:
+                destination = await self.bot.fetch_channel(notification.destination_id)
+        else:
+            destination = self.bot.get_user(notification.destination_id)
+            if destination is None:
+                destination = await self.bot.fetch_user(notification.destination_id)
+        await destination.send(notification.content)
@@ -0,0 +1,156 @@
+import os
+import pickle
+import tempfile
+import unittest
+import zlib
+
+from utils.auction_manager import CLOSE_FINALIZED, Auction, AuctionArchive
+
+
+def _finalized_auction(auction_id: int) -> Auction:
+    auction = Auction(auction_id, f"Item {auction_id}", 10, 5, 3600, 1, 2)
+    auction.place_bid(11, "alice", 10 + auction_id)
+    auction.ended = True
+    auction.close_state = CLOSE_FINALIZED
+    return auction
+
+
+class AuctionArchiveTest(unittest.TestCase):
+    """Finalized auctions stay readable while pending, while being written and once on disk"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "auction_archive.dat")
+        self.archive = AuctionArchive(self.path)
+
+    def _assert_archived(self, archive: AuctionArchive, auction_id: int):
+        auction = archive.get(auction_id)
+        self.assertIsNotNone(auction)
+        self.assertEqual(auction.id, auction_id)
+        self.assertEqual(auction.item_name, f"Item {auction_id}")
+        self.assertEqual(auction.highest_bid, 10 + auction_id)
+        self.assertEqual(list(auction.bid_history.amounts), [10 + auction_id])
+        self.assertEqual(auction.close_state, CLOSE_FINALIZED)
+
+    def test_adding_does_not_write(self):
+        for auction_id in range(1, AuctionArchive.PAGE_SIZE + 1):
+            self.archive.add(_finalized_auction(auction_id))
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(self.archive.page_full())
+        self.assertEqual(len(self.archive), AuctionArchive.PAGE_SIZE)
+        self._assert_archived(self.archive, 1)
+
+    def test_page_full(self):
+        for auction_id in range(1, AuctionArchive.PAGE_SIZE):
+            self.archive.add(_finalized_auction(auction_id))
+        self.assertFalse(self.archive.page_full())
+        self.archive.add(_finalized_auction(AuctionArchive.PAGE_SIZE))
+        self.assertTrue(self.archive.page_full())
+        self.archive.flush()
+        self.assertFalse(self.archive.page_full())
+
+    def test_get_after_flush(self):
+        for auction_id in (1, 2, 3):
+            self.archive.add(_finalized_auction(auction_id))
+        self.assertEqual(sorted(self.archive.flush()), [1, 2, 3])
+        self.assertEqual(self.archive.pending, {})
+        self.assertEqual(self.archive.flush(), [])
+
+        # Once written, auctions are read back from the page
+        self.archive._cache.clear()
+        for auction_id in (1, 2, 3):
+            self._assert_archived(self.archive, auction_id)
+        self.assertIsNone(self.archive.get(4))
+
+    def test_reopened_archive_reads_the_index(self):
+        for auction_id in (5, 1, 3):
+            self.archive.add(_finalized_auction(auction_id))
+        self.archive.flush()
+        self.archive.add(_finalized_auction(2))
+        self.archive.flush()
+
+        archive = AuctionArchive(self.path)
+        self.assertEqual(archive.ids(), [1, 2, 3, 5])
+        self.assertIn(2, archive)
+        self.assertNotIn(4, archive)
+        for auction_id in (1, 2, 3, 5):
+            self._assert_archived(archive, auction_id)
+
+    def test_large_flush_is_split_into_pages(self):
+        count = AuctionArchive.PAGE_SIZE * 2 + 22
+        for auction_id in range(1, count + 1):
+            self.archive.add(_finalized_auction(auction_id))
+        self.archive.flush()
+
+        offsets = {self.archive._find(auction_id) for auction_id in range(1, count + 1)}
+        self.assertEqual(len(offsets), 3)
+        archive = AuctionArchive(self.path)
+        for auction_id in (1, AuctionArchive.PAGE_SIZE, AuctionArchive.PAGE_SIZE + 1, count):
+            self._assert_archived(archive, auction_id)
+
+    def test_auctions_stay_readable_while_a_page_is_written(self):
+        for auction_id in (1, 2):
+            self.archive.add(_finalized_auction(auction_id))
+        page = self.archive.take_page()
+        self.assertEqual(sorted(page), [1, 2])
+        self.assertEqual(self.archive.pending, {})
+        self.assertEqual(self.archive.ids(), [1, 2])
+        self._assert_archived(self.archive, 2)
+
+        self.assertEqual(sorted(self.archive.write_page(page)), [1, 2])
+        self.archive._cache.clear()
+        self._assert_archived(self.archive, 1)
+        self.assertEqual(len(self.archive), 2)
+
+    def test_failed_write_returns_auctions_to_pending(self):
+        archive = AuctionArchive(os.path.join(self.dir.name, "missing", "auction_archive.dat"))
+        archive.add(_finalized_auction(1))
+        page = archive.take_page()
+        with self.assertRaises(OSError):
+            archive.write_page(page)
+        self.assertEqual(list(archive.pending), [1])
+        self._assert_archived(archive, 1)
+
+    def test_cache_evicts_the_least_recently_used(self):
+        self.archive.CACHE_SIZE = 2
+        for auction_id in (1, 2, 3, 4):
+            self.archive.add(_finalized_auction(auction_id))
+        self.archive.flush()
+
+        first = self.archive.get(1)
+        self.archive.get(2)
+        self.assertIs(self.archive.get(1), first)
+        self.archive.get(3)
+        # 2 was used least recently
+        self.assertEqual(list(self.archive._cache), [1, 3])
+        self.archive.get(4)
+        self.assertEqual(list(self.archive._cache), [3, 4])
+
+        # An evicted auction is read again from its page
+        auction = self.archive.get(1)
+        self.assertIsNot(auction, first)
+        self.assertEqual(auction.highest_bid, first.highest_bid)
+        self.assertEqual(list(self.archive._cache), [4, 1])
+
+    def test_reads_pickled_pages(self):
+        auction = _finalized_auction(1)
+        compressed = zlib.compress(pickle.dumps([auction]))
+        with open(self.path, 'wb') as f:
+            f.write(AuctionArchive._LEGACY_PAGE_HEADER.pack(len(compressed)))
+            f.write(compressed)
+        with open(self.path + ".idx", 'wb') as f:
+            f.write(AuctionArchive._INDEX_RECORD.pack(1, 0))
+
+        archive = AuctionArchive(self.path)
+        self._assert_archived(archive, 1)
+        # New pages go after it
+        archive.add(_finalized_auction(2))
+        archive.flush()
+        archive._cache.clear()
+        self._assert_archived(archive, 1)
+        self._assert_archived(archive, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from utils.auction_manager import AuctionJournal, AuctionManager, SnapshotJournalStore
+
+
+class TornJournalTest(unittest.TestCase):
+    """A crash mid-write must not cost the records written after the restart"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.snap = os.path.join(self.dir.name, "auction_data.snap")
+        self.journal = os.path.join(self.dir.name, "auction_data.journal")
+
+    def _manager(self) -> AuctionManager:
+        manager = AuctionManager(SnapshotJournalStore(self.snap, self.journal))
+        self.assertTrue(manager.load_data())
+        self.addCleanup(manager.store.journal.close)
+        return manager
+
+    def test_bid_after_torn_record_survives_restart(self):
+        manager = self._manager()
+        auction_id = manager.create_auction("Sword", 10, 5, 3600, 1, 2)
+        self.assertTrue(manager.place_bid(auction_id, 11, "alice", 20))
+        manager.store.journal.close()
+
+        # Simulate a crash halfway through writing the next record
+        with open(self.journal, 'a', encoding='utf-8') as f:
+            f.write('{"seq": 99, "op": "bid", "id": ')
+
+        manager = self._manager()
+        self.assertEqual(manager.get_auction(auction_id).highest_bid, 20)
+        self.assertTrue(manager.place_bid(auction_id, 12, "bob", 30))
+        manager.store.journal.close()
+
+        manager = self._manager()
+        auction = manager.get_auction(auction_id)
+        self.assertEqual(auction.highest_bid, 30)
+        self.assertEqual(auction.highest_bidder_id, 12)
+        self.assertEqual(len(auction.bid_history), 2)
+
+    def test_open_truncates_only_the_partial_line(self):
+        with open(self.journal, 'w', encoding='utf-8') as f:
+            f.write('{"seq": 1, "op": "end", "id": 1}\n{"seq": 2, "op": "e')
+        journal = AuctionJournal(self.journal)
+        journal.open(1)
+        journal.append('end', id=2)
+        journal.close()
+        self.assertEqual([record['seq'] for record in AuctionJournal.read(self.journal)], [1, 2])
+
+    def test_open_keeps_a_complete_journal(self):
+        with open(self.journal, 'w', encoding='utf-8') as f:
+            f.write('{"seq": 1, "op": "end", "id": 1}\n')
+        journal = AuctionJournal(self.journal)
+        journal.open(1)
+        journal.close()
+        with open(self.journal, encoding='utf-8') as f:
+            self.assertEqual(f.read(), '{"seq": 1, "op": "end", "id": 1}\n')
+
+
+if __name__ == "__main__":
+    unittest.main()
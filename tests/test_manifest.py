@@ -0,0 +1,238 @@
+import json
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+from cogs.auction import AuctionCog, MANIFEST_COLUMNS, _parse_manifest
+from utils.benchmark import FakeBot, FakeInteraction, FakeREST
+
+HEADER = ",".join(MANIFEST_COLUMNS)
+
+
+def _csv(*rows: str, header: str = HEADER) -> bytes:
+    return "\n".join((header,) + rows).encode()
+
+
+class CsvManifestTest(unittest.TestCase):
+    """CSV manifests, one auction per row after the header"""
+
+    def test_reads_every_column(self):
+        specs, errors = _parse_manifest("batch.csv", _csv(
+            "Sword,10,5,1h,gold,https://example.com/e.png,yes,true",
+            "Shield,0,1,1d12h,,,,"
+        ))
+        self.assertEqual(errors, [])
+        self.assertEqual(specs, [
+            {
+                "item_name": "Sword", "starting_bid": 10, "bid_increment": 5, "duration_seconds": 3600,
+                "currency": "gold", "emblem_url": "https://example.com/e.png",
+                "anonymous_bidding": True, "auto_delete_emblem": True
+            },
+            {
+                "item_name": "Shield", "starting_bid": 0, "bid_increment": 1, "duration_seconds": 129600,
+                "currency": "coins", "emblem_url": None,
+                "anonymous_bidding": False, "auto_delete_emblem": False
+            }
+        ])
+
+    def test_optional_columns_may_be_left_out(self):
+        specs, errors = _parse_manifest("batch.csv", _csv(
+            "Sword,10,5,30m", header="item_name,starting_bid,bid_increment,duration"
+        ))
+        self.assertEqual(errors, [])
+        self.assertEqual(specs[0]["duration_seconds"], 1800)
+        self.assertEqual(specs[0]["currency"], "coins")
+
+    def test_accepts_a_byte_order_mark(self):
+        specs, errors = _parse_manifest("batch.csv", "\ufeff".encode() + _csv("Sword,10,5,1h,,,,"))
+        self.assertEqual(errors, [])
+        self.assertEqual(specs[0]["item_name"], "Sword")
+
+    def test_reports_every_bad_row_by_number(self):
+        specs, errors = _parse_manifest("batch.csv", _csv(
+            "Sword,10,5,1h,,,,",
+            ",10,5,1h,,,,",
+            "Axe,ten,5,1h,,,,",
+            "Bow,-1,5,1h,,,,",
+            "Helm,10,0,1h,,,,",
+            "Ring,10,5,soon,,,,",
+            "Cape,10,5,1h,,ftp://example.com/e.png,,",
+            "Boots,10,5,1h,,,maybe,",
+            f"{'x' * 257},10,5,1h,,,,",
+            "Belt,10,5,1h,,,,,extra"
+        ))
+        self.assertEqual([spec["item_name"] for spec in specs], ["Sword"])
+        self.assertEqual(errors, [
+            "Row 2: missing item_name",
+            "Row 3: starting_bid and bid_increment must be whole numbers",
+            "Row 4: starting_bid can't be negative and bid_increment must be at least 1",
+            "Row 5: starting_bid can't be negative and bid_increment must be at least 1",
+            "Row 6: invalid duration 'soon', use a format like 1h, 30m, 1d or 1d12h",
+            "Row 7: emblem_url must be an http(s) URL",
+            "Row 8: anonymous must be yes or no",
+            "Row 9: item_name is longer than 256 characters",
+            "Row 10: more values than columns"
+        ])
+
+    def test_rejects_unknown_and_missing_columns(self):
+        _, errors = _parse_manifest("batch.csv", _csv("Sword,10,5,1h,red", header="item_name,starting_bid,bid_increment,duration,colour"))
+        self.assertEqual(errors, ["Row 1: unknown column colour"])
+        _, errors = _parse_manifest("batch.csv", _csv("Sword,10", header="item_name,starting_bid"))
+        self.assertEqual(errors, ["Row 1: missing bid_increment, duration"])
+
+    def test_rejects_a_repeated_column(self):
+        specs, errors = _parse_manifest("batch.csv", _csv(
+            "Sword,10,5,1h,1000", header="item_name,starting_bid,bid_increment,duration,starting_bid"
+        ))
+        self.assertEqual(specs, [])
+        self.assertEqual(errors, ["The manifest header repeats the column starting_bid."])
+
+    def test_allows_repeated_rows(self):
+        specs, errors = _parse_manifest("batch.csv", _csv("Sword,10,5,1h,,,,", "Sword,10,5,1h,,,,"))
+        self.assertEqual(errors, [])
+        self.assertEqual(len(specs), 2)
+        self.assertEqual(specs[0], specs[1])
+
+    def test_rejects_text_that_is_not_utf8(self):
+        self.assertEqual(
+            _parse_manifest("batch.csv", "Épée,10,5,1h".encode("latin-1")),
+            ([], ["The manifest must be a UTF-8 text file."])
+        )
+
+
+class JsonManifestTest(unittest.TestCase):
+    """JSON manifests, a list of auctions or an object holding one"""
+
+    ROW = {"item_name": "Sword", "starting_bid": 10, "bid_increment": 5, "duration": "1h"}
+
+    def test_reads_the_same_auctions_as_csv(self):
+        from_csv, _ = _parse_manifest("batch.csv", _csv("Sword,10,5,1h,gold,,yes,"))
+        row = dict(self.ROW, currency="gold", anonymous="yes")
+        for data in ([row], {"auctions": [row]}):
+            with self.subTest(data=data):
+                specs, errors = _parse_manifest("BATCH.JSON", json.dumps(data).encode())
+                self.assertEqual(errors, [])
+                self.assertEqual(specs, from_csv)
+
+    def test_accepts_json_values_as_well_as_strings(self):
+        row = dict(self.ROW, starting_bid="10", anonymous=True, emblem_url=None)
+        specs, errors = _parse_manifest("batch.json", json.dumps([row]).encode())
+        self.assertEqual(errors, [])
+        self.assertEqual(specs[0]["starting_bid"], 10)
+        self.assertTrue(specs[0]["anonymous_bidding"])
+        self.assertIsNone(specs[0]["emblem_url"])
+
+    def test_reports_bad_rows_by_number(self):
+        rows = [self.ROW, dict(self.ROW, bid_increment=0), dict(self.ROW, colour="red")]
+        specs, errors = _parse_manifest("batch.json", json.dumps(rows).encode())
+        self.assertEqual(len(specs), 1)
+        self.assertEqual(errors, [
+            "Row 2: starting_bid can't be negative and bid_increment must be at least 1",
+            "Row 3: unknown column colour"
+        ])
+
+    def test_rejects_a_repeated_key(self):
+        data = b'[{"item_name": "Sword", "starting_bid": 10, "bid_increment": 5, "duration": "1h", "starting_bid": 1000}]'
+        self.assertEqual(
+            _parse_manifest("batch.json", data),
+            ([], ["The manifest has a duplicate key starting_bid."])
+        )
+
+    def test_rejects_other_shapes(self):
+        for data in (b'{"item_name": "Sword"}', b'"Sword"', b'[["Sword", 10, 5, "1h"]]'):
+            with self.subTest(data=data):
+                self.assertEqual(
+                    _parse_manifest("batch.json", data),
+                    ([], ['A JSON manifest must be a list of auctions, or an object with an "auctions" list.'])
+                )
+
+    def test_rejects_invalid_json(self):
+        specs, errors = _parse_manifest("batch.json", b'[{"item_name": "Sword",]')
+        self.assertEqual(specs, [])
+        self.assertEqual(len(errors), 1)
+        self.assertTrue(errors[0].startswith("The manifest is not valid JSON: "))
+
+
+class FakeAttachment:
+    def __init__(self, filename: str, data: bytes):
+        self.filename = filename
+        self.size = len(data)
+        self.data = data
+
+    async def read(self) -> bytes:
+        return self.data
+
+
+class FakeFollowup:
+    def __init__(self):
+        self.messages = []
+
+    async def send(self, content=None, **kwargs):
+        self.messages.append(content)
+
+
+class BatchLimitsTest(unittest.IsolatedAsyncioTestCase):
+    """/auction batch refuses oversized manifests and batches without starting anything"""
+
+    async def asyncSetUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        env = mock.patch.dict(os.environ, {
+            "AUCTION_DATA_DIR": os.path.join(self.dir.name, "auction_data"),
+            "AUCTION_OUTBOX_FILE": os.path.join(self.dir.name, "auction_outbox.db")
+        })
+        env.start()
+        self.addCleanup(env.stop)
+        rest = FakeREST(0, random.Random(0))
+        self.bot = FakeBot(rest, channels=1)
+        self.cog = AuctionCog(self.bot)
+        self.cog.MAX_BATCH_SIZE = 3
+        self.cog.MAX_MANIFEST_BYTES = 1024
+        self.interaction = FakeInteraction(self.bot, self.bot.get_user(1), self.bot.channels[1], 1, rest)
+        self.interaction.followup = FakeFollowup()
+
+    async def asyncTearDown(self):
+        self.cog.cog_unload()
+
+    async def _batch(self, data: bytes):
+        await self.cog.auction_batch.callback(self.cog, self.interaction, FakeAttachment("batch.csv", data))
+
+    def _auction_count(self) -> int:
+        guild = self.cog.guilds.get(1)
+        return len(guild.manager.auctions) if guild else 0
+
+    async def test_starts_a_batch_within_the_limits(self):
+        await self._batch(_csv("Sword,10,5,1h,,,,", "Shield,10,5,1h,,,,", "Axe,10,5,1h,,,,"))
+        self.assertEqual(self.interaction.followup.messages, ["✅ Starting 3 auctions..."])
+        self.assertEqual(self._auction_count(), 3)
+
+    async def test_refuses_too_many_auctions(self):
+        await self._batch(_csv(*["Sword,1,1,1h"] * 4, header="item_name,starting_bid,bid_increment,duration"))
+        self.assertEqual(self.interaction.followup.messages, [
+            "❌ No auctions were started:\n- A batch can start at most 3 auctions, this one has 4."
+        ])
+        self.assertEqual(self._auction_count(), 0)
+
+    async def test_refuses_a_manifest_over_the_size_limit_before_reading_it(self):
+        await self._batch(_csv(*["Sword,10,5,1h,,,,"] * 100))
+        self.assertEqual(self.interaction.response.content, "❌ The manifest is too large (at most 1 KB).")
+        self.assertEqual(self.interaction.followup.messages, [])
+        self.assertEqual(self._auction_count(), 0)
+
+    async def test_starts_nothing_if_any_row_is_bad(self):
+        await self._batch(_csv("Sword,10,5,1h,,,,", "Axe,10,5,soon,,,,"))
+        self.assertEqual(len(self.interaction.followup.messages), 1)
+        self.assertIn("Row 2: invalid duration 'soon'", self.interaction.followup.messages[0])
+        self.assertEqual(self._auction_count(), 0)
+
+    async def test_refuses_an_empty_manifest(self):
+        await self._batch(_csv())
+        self.assertEqual(self.interaction.followup.messages, [
+            "❌ No auctions were started:\n- The manifest does not contain any auctions."
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,179 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import discord
+
+from utils.notifications import CHANNEL, DIRECT_MESSAGE, NotificationDispatcher, NotificationOutbox
+
+
+class NotificationOutboxTest(unittest.TestCase):
+    """Queued notifications, their dedupe keys and how long sent ones are kept"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.path = os.path.join(self.dir.name, "auction_outbox.db")
+        self.outbox = self._outbox()
+
+    def _outbox(self) -> NotificationOutbox:
+        outbox = NotificationOutbox(self.path)
+        self.addCleanup(outbox.close)
+        return outbox
+
+    def test_same_dedupe_key_is_queued_once(self):
+        first = self.outbox.add(CHANNEL, 1, "Auction #1 ended", dedupe_key="end:1")
+        self.assertIsNotNone(first)
+        self.assertIsNone(self.outbox.add(CHANNEL, 1, "Auction #1 ended", dedupe_key="end:1"))
+        self.assertEqual(self.outbox.pending(), [first])
+
+    def test_notifications_without_a_key_are_never_deduplicated(self):
+        self.outbox.add(DIRECT_MESSAGE, 2, "You were outbid")
+        self.outbox.add(DIRECT_MESSAGE, 2, "You were outbid")
+        self.assertEqual(len(self.outbox.pending()), 2)
+
+    def test_sent_notifications_keep_deduplicating_until_pruned(self):
+        notification = self.outbox.add(CHANNEL, 1, "Auction #1 ended", dedupe_key="end:1")
+        self.outbox.mark_sent(notification.id)
+        self.assertEqual(self.outbox.pending(), [])
+        self.assertIsNone(self.outbox.add(CHANNEL, 1, "Auction #1 ended", dedupe_key="end:1"))
+
+        self.assertEqual(self.outbox.prune_sent(time.time() - 60), 0)
+        self.assertEqual(self.outbox.prune_sent(time.time() + 1), 1)
+        self.assertIsNotNone(self.outbox.add(CHANNEL, 1, "Auction #1 ended", dedupe_key="end:1"))
+
+    def test_pruning_keeps_undelivered_notifications(self):
+        pending = self.outbox.add(CHANNEL, 1, "pending")
+        dead = self.outbox.add(CHANNEL, 1, "dead")
+        self.outbox.mark_dead(dead.id, "Missing Access")
+        self.assertEqual(self.outbox.prune_sent(time.time() + 1), 0)
+        self.assertEqual(self.outbox.pending(), [pending])
+        self.assertEqual(self.outbox.dead_letter_count(), 1)
+
+    def test_failures_are_counted_and_survive_a_restart(self):
+        notification = self.outbox.add(DIRECT_MESSAGE, 2, "You won")
+        self.outbox.mark_failed(notification.id, "503 Service Unavailable", 1234.5)
+        self.outbox.close()
+
+        (pending,) = self._outbox().pending()
+        self.assertEqual(pending, notification._replace(attempts=1, next_attempt_at=1234.5))
+
+
+class FakeDestination:
+    """Channel or user whose sends fail with the queued errors, then succeed"""
+
+    def __init__(self, errors=()):
+        self.errors = list(errors)
+        self.sent = []
+        self.attempts = 0
+
+    async def send(self, content):
+        self.attempts += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        self.sent.append(content)
+
+
+class FakeBot:
+    def __init__(self, destination: FakeDestination):
+        self.destination = destination
+
+    def get_channel(self, channel_id: int) -> FakeDestination:
+        return self.destination
+
+    def get_user(self, user_id: int) -> FakeDestination:
+        return self.destination
+
+
+class NotificationDispatcherTest(unittest.IsolatedAsyncioTestCase):
+    """Delivery, retries with backoff and dead letters"""
+
+    async def asyncSetUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.outbox = NotificationOutbox(os.path.join(self.dir.name, "auction_outbox.db"))
+        self.addCleanup(self.outbox.close)
+
+    def _dispatcher(self, destination: FakeDestination) -> NotificationDispatcher:
+        dispatcher = NotificationDispatcher(FakeBot(destination), self.outbox)
+        # Retry straight away so the test does not wait out the backoff
+        dispatcher.RETRY_DELAY = 0
+        dispatcher.MIN_INTERVAL = 0
+        dispatcher.start()
+        self.addCleanup(dispatcher.close)
+        return dispatcher
+
+    async def _settle(self, done):
+        for _ in range(200):
+            if done():
+                return
+            await asyncio.sleep(0.01)
+        self.fail("the dispatcher did not finish in time")
+
+    async def test_delivers_and_marks_sent(self):
+        destination = FakeDestination()
+        dispatcher = self._dispatcher(destination)
+        dispatcher.notify_channel(1, "Auction #1 ended", dedupe_key="end:1")
+        dispatcher.notify_channel(1, "Auction #1 ended", dedupe_key="end:1")
+        await self._settle(lambda: destination.sent)
+        await asyncio.sleep(0.05)
+        self.assertEqual(destination.sent, ["Auction #1 ended"])
+        self.assertEqual(self.outbox.pending(), [])
+
+    async def test_retries_until_delivered(self):
+        destination = FakeDestination([ConnectionResetError("reset")] * 2)
+        dispatcher = self._dispatcher(destination)
+        dispatcher.notify_user(2, "You won")
+        await self._settle(lambda: destination.sent)
+        self.assertEqual(destination.attempts, 3)
+        self.assertEqual(self.outbox.pending(), [])
+        self.assertEqual(self.outbox.dead_letter_count(), 0)
+
+    async def test_dead_letters_after_max_attempts(self):
+        destination = FakeDestination([ConnectionResetError("reset")] * NotificationDispatcher.MAX_ATTEMPTS)
+        dispatcher = self._dispatcher(destination)
+        dispatcher.notify_user(2, "You won")
+        await self._settle(lambda: self.outbox.dead_letter_count())
+        self.assertEqual(destination.attempts, NotificationDispatcher.MAX_ATTEMPTS)
+        self.assertEqual(destination.sent, [])
+        self.assertEqual(self.outbox.pending(), [])
+        ((notification, error),) = self.outbox.dead_letters()
+        self.assertEqual(notification.content, "You won")
+        self.assertEqual(notification.attempts, NotificationDispatcher.MAX_ATTEMPTS)
+        self.assertEqual(error, "reset")
+
+    async def test_backoff_doubles_after_every_failure(self):
+        dispatcher = NotificationDispatcher(FakeBot(FakeDestination()), self.outbox)
+        notification = self.outbox.add(DIRECT_MESSAGE, 2, "You won")
+        with mock.patch("time.time", return_value=1000.0):
+            for attempts in range(1, 4):
+                dispatcher._retry(notification, ConnectionResetError("reset"))
+                notification = notification._replace(attempts=attempts)
+                (pending,) = self.outbox.pending()
+                self.assertEqual(pending.attempts, attempts)
+                self.assertEqual(pending.next_attempt_at, 1000.0 + dispatcher.RETRY_DELAY * 2 ** (attempts - 1))
+
+    async def test_refused_sends_are_dead_lettered_at_once(self):
+        forbidden = discord.Forbidden(mock.Mock(status=403, reason="Forbidden"), "Cannot send messages to this user")
+        destination = FakeDestination([forbidden])
+        dispatcher = self._dispatcher(destination)
+        dispatcher.notify_user(2, "You won")
+        await self._settle(lambda: self.outbox.dead_letter_count())
+        self.assertEqual(destination.attempts, 1)
+        ((notification, error),) = self.outbox.dead_letters()
+        self.assertEqual(notification.attempts, 1)
+        self.assertIn("Cannot send messages to this user", error)
+
+    async def test_restart_resumes_undelivered_notifications(self):
+        self.outbox.add(CHANNEL, 1, "Auction #1 ended", dedupe_key="end:1")
+        destination = FakeDestination()
+        self._dispatcher(destination)
+        await self._settle(lambda: destination.sent)
+        self.assertEqual(destination.sent, ["Auction #1 ended"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import os
+import tempfile
+import unittest
+
+from utils.auction_manager import AuctionArchive, AuctionManager, ProxyBids, SnapshotJournalStore
+
+
+class ProxyBidsTest(unittest.TestCase):
+    """The two highest maximums decide the price, earlier maximums win ties"""
+
+    def test_top_two_orders_by_amount_then_registration(self):
+        proxy_bids = ProxyBids()
+        proxy_bids.set(1, "alice", 50)
+        proxy_bids.set(2, "bob", 80)
+        proxy_bids.set(3, "carol", 80)
+        self.assertEqual(proxy_bids.top_two(), (2, 80, 80))
+
+    def test_replaced_maximum_is_ignored(self):
+        proxy_bids = ProxyBids()
+        proxy_bids.set(1, "alice", 100)
+        proxy_bids.set(2, "bob", 60)
+        proxy_bids.set(1, "alice", 120)
+        self.assertEqual(proxy_bids.top_two(), (1, 120, 60))
+        self.assertEqual(len(proxy_bids), 2)
+
+
+class ProxyResolutionTest(unittest.TestCase):
+    """Maximum bids answered by AuctionManager"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.manager = self._manager()
+        # Starts at 10 with an increment of 5
+        self.auction_id = self.manager.create_auction("Sword", 10, 5, 3600, 1, 2)
+        self.auction = self.manager.get_auction(self.auction_id)
+
+    def _manager(self) -> AuctionManager:
+        manager = AuctionManager(
+            SnapshotJournalStore(
+                os.path.join(self.dir.name, "auction_data.snap"),
+                os.path.join(self.dir.name, "auction_data.journal")
+            ),
+            archive=AuctionArchive(os.path.join(self.dir.name, "auction_archive.dat"))
+        )
+        self.addCleanup(manager.store.journal.close)
+        return manager
+
+    def test_single_maximum_bids_the_minimum(self):
+        self.assertTrue(self.manager.set_max_bid(self.auction_id, 11, "alice", 100))
+        self.assertEqual(self.auction.highest_bidder_id, 11)
+        self.assertEqual(self.auction.highest_bid, 15)
+
+    def test_competing_maximums_settle_one_increment_over_the_runner_up(self):
+        self.manager.set_max_bid(self.auction_id, 11, "alice", 100)
+        self.manager.set_max_bid(self.auction_id, 12, "bob", 60)
+        self.assertEqual(self.auction.highest_bidder_id, 11)
+        self.assertEqual(self.auction.highest_bid, 65)
+
+        # A higher maximum takes over at one increment over the old leader's
+        self.manager.set_max_bid(self.auction_id, 13, "carol", 200)
+        self.assertEqual(self.auction.highest_bidder_id, 13)
+        self.assertEqual(self.auction.highest_bid, 105)
+
+    def test_tie_goes_to_the_earlier_maximum(self):
+        self.manager.set_max_bid(self.auction_id, 11, "alice", 50)
+        self.manager.set_max_bid(self.auction_id, 12, "bob", 50)
+        self.assertEqual(self.auction.highest_bidder_id, 11)
+        self.assertEqual(self.auction.highest_bid, 50)
+
+    def test_leader_never_pays_more_than_their_maximum(self):
+        self.manager.set_max_bid(self.auction_id, 11, "alice", 62)
+        self.manager.set_max_bid(self.auction_id, 12, "bob", 60)
+        self.assertEqual(self.auction.highest_bidder_id, 11)
+        self.assertEqual(self.auction.highest_bid, 62)
+
+    def test_manual_bid_is_answered_by_a_higher_maximum(self):
+        self.manager.set_max_bid(self.auction_id, 11, "alice", 100)
+        self.assertTrue(self.manager.place_bid(self.auction_id, 12, "bob", 40))
+        self.assertEqual(self.auction.highest_bidder_id, 11)
+        self.assertEqual(self.auction.highest_bid, 45)
+
+        # Outbidding the maximum wins
+        self.assertTrue(self.manager.place_bid(self.auction_id, 12, "bob", 110))
+        self.assertEqual(self.auction.highest_bidder_id, 12)
+        self.assertEqual(self.auction.highest_bid, 110)
+
+    def test_maximum_below_the_next_increment_is_refused(self):
+        self.manager.place_bid(self.auction_id, 12, "bob", 40)
+        self.assertFalse(self.manager.set_max_bid(self.auction_id, 11, "alice", 44))
+        self.assertIsNone(self.auction.proxy_bids)
+        self.assertTrue(self.manager.set_max_bid(self.auction_id, 11, "alice", 45))
+        self.assertEqual(self.auction.highest_bidder_id, 11)
+        self.assertEqual(self.auction.highest_bid, 45)
+
+    def test_maximum_can_only_be_raised(self):
+        self.manager.set_max_bid(self.auction_id, 11, "alice", 100)
+        self.assertFalse(self.manager.set_max_bid(self.auction_id, 11, "alice", 90))
+        self.assertFalse(self.manager.set_max_bid(self.auction_id, 11, "alice", 15))
+        self.assertEqual(self.auction.proxy_bids.get(11), 100)
+
+    def test_manual_bid_below_the_increment_is_refused(self):
+        self.manager.place_bid(self.auction_id, 12, "bob", 40)
+        self.assertFalse(self.manager.place_bid(self.auction_id, 13, "carol", 44))
+        self.assertEqual(self.auction.highest_bid, 40)
+
+    def test_maximums_survive_a_restart(self):
+        self.manager.set_max_bid(self.auction_id, 11, "alice", 100)
+        self.manager.store.journal.close()
+        manager = self._manager()
+        self.assertTrue(manager.place_bid(self.auction_id, 12, "bob", 50))
+        auction = manager.get_auction(self.auction_id)
+        self.assertEqual(auction.highest_bidder_id, 11)
+        self.assertEqual(auction.highest_bid, 55)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,142 @@
+import asyncio
+import datetime
+import os
+import random
+import tempfile
+import time
+import unittest
+
+from cogs.auction import AuctionCog
+from utils.auction_manager import AuctionArchive, AuctionManager, SnapshotJournalStore
+from utils.benchmark import FakeBot, FakeREST
+
+
+class DeadlineTest(unittest.TestCase):
+    """The next deadline follows the auctions, and the scheduler hears about changes"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.manager = AuctionManager(
+            SnapshotJournalStore(
+                os.path.join(self.dir.name, "auction_data.snap"),
+                os.path.join(self.dir.name, "auction_data.journal")
+            ),
+            archive=AuctionArchive(os.path.join(self.dir.name, "auction_archive.dat"))
+        )
+        self.addCleanup(self.manager.store.close)
+        self.changes = 0
+        self.manager.on_schedule_change = self._changed
+
+    def _changed(self):
+        self.changes += 1
+
+    def _end_of(self, auction_id: int) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.manager.get_auction(auction_id).end_ts)
+
+    def test_earlier_deadline_moves_the_next_deadline_and_notifies(self):
+        self.assertIsNone(self.manager.next_deadline())
+        late = self.manager.create_auction("Sword", 10, 5, 3600, 1, 2)
+        self.assertEqual(self.changes, 1)
+        self.assertEqual(self.manager.next_deadline(), self._end_of(late))
+
+        early = self.manager.create_auction("Shield", 10, 5, 60, 1, 2)
+        self.assertEqual(self.changes, 2)
+        self.assertEqual(self.manager.next_deadline(), self._end_of(early))
+
+        # A later deadline is announced too, but doesn't move the next one
+        self.manager.create_auction("Axe", 10, 5, 7200, 1, 2)
+        self.assertEqual(self.changes, 3)
+        self.assertEqual(self.manager.next_deadline(), self._end_of(early))
+
+    def test_batch_notifies_once(self):
+        auction_ids = self.manager.create_auctions([
+            {"item_name": name, "starting_bid": 1, "bid_increment": 1, "duration_seconds": duration,
+             "creator_id": 1, "channel_id": 2}
+            for name, duration in (("Sword", 3600), ("Shield", 60))
+        ])
+        self.assertEqual(self.changes, 1)
+        self.assertEqual(self.manager.next_deadline(), self._end_of(auction_ids[1]))
+
+    def test_ending_the_next_auction_moves_the_deadline_later(self):
+        late = self.manager.create_auction("Sword", 10, 5, 3600, 1, 2)
+        early = self.manager.create_auction("Shield", 10, 5, 60, 1, 2)
+        self.manager.end_auction(early, cancelled=True)
+        self.assertEqual(self.changes, 3)
+        self.assertEqual(self.manager.next_deadline(), self._end_of(late))
+        self.manager.end_auction(late)
+        self.assertIsNone(self.manager.next_deadline())
+
+    def test_restarted_clock_replaces_the_old_deadline(self):
+        auction_id = self.manager.create_auction("Sword", 10, 5, 60, 1, 2)
+        auction = self.manager.get_auction(auction_id)
+        # Pretend the auction was created long enough ago to be due
+        auction.created_ts -= 120
+        auction.end_ts -= 120
+        self.manager._rebuild_deadlines()
+
+        self.assertTrue(self.manager.restart_clock(auction_id))
+        self.assertEqual(self.changes, 2)
+        self.assertEqual(self.manager.next_deadline(), self._end_of(auction_id))
+        self.assertGreater(auction.end_ts, time.time())
+        self.assertEqual(self.manager.get_ended_auctions(), [])
+
+    def test_due_auctions_are_returned_once(self):
+        auction_id = self.manager.create_auction("Sword", 10, 5, 60, 1, 2)
+        self.manager.create_auction("Shield", 10, 5, 3600, 1, 2)
+        auction = self.manager.get_auction(auction_id)
+        auction.end_ts -= 120
+        self.manager._rebuild_deadlines()
+
+        self.assertEqual(self.manager.get_ended_auctions(), [auction_id])
+        self.assertEqual(self.manager.get_ended_auctions(), [])
+
+
+class SchedulerWakeupTest(unittest.IsolatedAsyncioTestCase):
+    """The cog's scheduler wakes up for a deadline earlier than the one it sleeps towards"""
+
+    async def asyncSetUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        cwd = os.getcwd()
+        os.chdir(self.dir.name)
+        self.addCleanup(os.chdir, cwd)
+        self.cog = AuctionCog(FakeBot(FakeREST(0, random.Random(0)), channels=1))
+        self.checks = []
+        self.checked = asyncio.Event()
+        self.cog.check_auctions = self._check_auctions
+
+    async def asyncTearDown(self):
+        self.cog.cog_unload()
+
+    async def _check_auctions(self):
+        # Stands in for closing due auctions; records when the scheduler ran
+        self.checks.append((time.monotonic(), self.cog._guild(1).manager.get_ended_auctions()))
+        self.checked.set()
+
+    async def _next_check(self, timeout: float):
+        self.checked.clear()
+        await asyncio.wait_for(self.checked.wait(), timeout)
+        return self.checks[-1]
+
+    async def test_wakes_for_an_earlier_deadline(self):
+        manager = self.cog._guild(1).manager
+        manager.create_auction("Sword", 10, 5, 3600, 1, 2)
+        self.cog._scheduler_task = asyncio.create_task(self.cog.run_scheduler())
+        await self._next_check(1)
+        # Let the scheduler go to sleep until the hour-long auction ends
+        await asyncio.sleep(0.05)
+
+        started = time.monotonic()
+        early = manager.create_auction("Shield", 10, 5, 1, 1, 2)
+        checked_at, _ = await self._next_check(1)
+        self.assertLess(checked_at - started, 0.5)
+
+        # It then sleeps only until the new deadline
+        checked_at, ended = await self._next_check(3)
+        self.assertEqual(ended, [early])
+        self.assertLess(checked_at - started, 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,149 @@
+import os
+import struct
+import tempfile
+import unittest
+
+from utils.auction_manager import (
+    CLOSE_ANNOUNCED, Auction, AuctionArchive, AuctionManager, AuctionSnapshot, ProxyBids, SnapshotJournalStore,
+    _AUCTION_FIELDS, _decode_auction, _decode_string, _encode_auction
+)
+
+
+def _fields(auction: Auction):
+    """Everything an encoding must preserve, in comparable form"""
+    history = auction.bid_history
+    proxy_bids = auction.proxy_bids
+    return (
+        tuple(getattr(auction, slot) for slot in Auction.__slots__ if slot not in ('bid_history', 'proxy_bids')),
+        [tuple(bid) for bid in zip(history.bidder_ids, history.amounts, history.times_ms, history.name_indexes)],
+        history.names,
+        history.bidder_count,
+        (proxy_bids.maxes, proxy_bids.names, proxy_bids.seq) if proxy_bids else None
+    )
+
+
+def _as_version_2(data: bytes) -> bytes:
+    """Re-encode an auction the way format version 2 did, without the bidder count"""
+    offset = _AUCTION_FIELDS.size
+    for _ in range(4):
+        _, offset = _decode_string(data, offset)
+    # The history header was (bid count, name count); version 3 appended the bidder count
+    return data[:offset + 8] + data[offset + 12:]
+
+
+def _sample_auction() -> Auction:
+    auction = Auction(7, "Sword of Ünicode", 10, 5, 3600, 1, 2, currency="gold", emblem_url="https://example.com/e.png")
+    auction.place_bid(11, "alice", 20)
+    auction.place_bid(12, "bob", 30)
+    auction.place_bid(11, "alice", 40)
+    auction.message_id = 1234
+    return auction
+
+
+class AuctionEncodingTest(unittest.TestCase):
+    """_encode_auction and _decode_auction round-trip every field"""
+
+    def test_round_trip(self):
+        auction = _sample_auction()
+        decoded = _decode_auction(_encode_auction(auction), AuctionSnapshot.VERSION)
+        self.assertEqual(_fields(decoded), _fields(auction))
+        self.assertEqual(decoded.bid_history.bidder_count, 2)
+
+    def test_round_trip_of_an_ended_anonymous_auction_with_maximums(self):
+        auction = Auction(8, "Shield", 0, 1, 60, 3, 4, anonymous_bidding=True, auto_delete_emblem=True)
+        auction.place_bid(11, "alice", 5)
+        auction.proxy_bids = ProxyBids()
+        auction.proxy_bids.set(12, "bob", 50)
+        auction.ended = True
+        auction.cancelled = True
+        auction.ended_early = True
+        auction.close_state = CLOSE_ANNOUNCED
+        decoded = _decode_auction(_encode_auction(auction), AuctionSnapshot.VERSION)
+        self.assertEqual(_fields(decoded), _fields(auction))
+
+    def test_decoded_history_keeps_counting_bidders(self):
+        decoded = _decode_auction(_encode_auction(_sample_auction()), AuctionSnapshot.VERSION)
+        decoded.place_bid(12, "bob", 50)
+        self.assertEqual(decoded.bid_history.bidder_count, 2)
+        decoded.place_bid(13, "carol", 60)
+        self.assertEqual(decoded.bid_history.bidder_count, 3)
+
+    def test_decodes_version_2_records(self):
+        auction = _sample_auction()
+        decoded = _decode_auction(_as_version_2(_encode_auction(auction)), 2)
+        self.assertEqual(_fields(decoded), _fields(auction))
+
+    def test_rejects_unknown_versions(self):
+        with self.assertRaises(ValueError):
+            _decode_auction(_encode_auction(_sample_auction()), AuctionSnapshot.VERSION + 1)
+
+
+class SnapshotFileTest(unittest.TestCase):
+    """Snapshot files, including those written by older format versions"""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.snap = os.path.join(self.dir.name, "auction_data.snap")
+        self.journal = os.path.join(self.dir.name, "auction_data.journal")
+
+    def _manager(self) -> AuctionManager:
+        manager = AuctionManager(
+            SnapshotJournalStore(self.snap, self.journal),
+            archive=AuctionArchive(os.path.join(self.dir.name, "auction_archive.dat"))
+        )
+        self.addCleanup(manager.store.close)
+        return manager
+
+    def _write_old_snapshot(self, version: int, auctions):
+        """Write a snapshot as an older format version would have"""
+        records = [
+            (auction.id, AuctionSnapshot.state_of(auction), _as_version_2(_encode_auction(auction)))
+            for auction in auctions
+        ]
+        AuctionSnapshot.write(self.snap, records, 10, 0, None)
+        # Versions 1 and 2 share the start of the header; version 1 had no stats
+        with open(self.snap, 'r+b') as f:
+            f.seek(len(AuctionSnapshot.MAGIC))
+            f.write(struct.pack('<H', version))
+
+    def test_save_and_load(self):
+        manager = self._manager()
+        auction_id = manager.create_auction("Sword", 10, 5, 3600, 1, 2)
+        manager.place_bid(auction_id, 11, "alice", 20)
+        manager.set_max_bid(auction_id, 12, "bob", 50)
+        expected = _fields(manager.get_auction(auction_id))
+        self.assertTrue(manager.save_data())
+        manager.store.close()
+
+        manager = self._manager()
+        self.assertEqual(_fields(manager.get_auction(auction_id)), expected)
+        self.assertEqual(manager.next_id, auction_id + 1)
+        self.assertEqual(manager.stats.total_bids, 2)
+
+    def test_loads_and_upgrades_older_versions(self):
+        for version in (1, 2):
+            with self.subTest(version=version):
+                auction = _sample_auction()
+                self._write_old_snapshot(version, [auction])
+
+                manager = self._manager()
+                self.assertEqual(_fields(manager.get_auction(auction.id)), _fields(auction))
+                # These files carry no stats, so they are rebuilt from the bids
+                self.assertEqual(manager.stats.total_bids, 3)
+                self.assertTrue(manager.save_data())
+                manager.store.close()
+
+                snapshot = AuctionSnapshot(self.snap)
+                self.addCleanup(snapshot.close)
+                self.assertEqual(snapshot.version, AuctionSnapshot.VERSION)
+                self.assertEqual(_fields(snapshot.get(auction.id)), _fields(auction))
+
+    def test_rejects_newer_versions(self):
+        self._write_old_snapshot(AuctionSnapshot.VERSION + 1, [_sample_auction()])
+        with self.assertRaises(ValueError):
+            AuctionSnapshot(self.snap)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,167 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utils.auction_manager import (
+    CLOSE_ANNOUNCED, CLOSE_FINALIZED, Auction, AuctionArchive, AuctionManager, SQLiteAuctionStore,
+    SnapshotJournalStore
+)
+
+
+def _fields(auction: Auction):
+    """Everything both stores must keep, in comparable form"""
+    history = auction.bid_history
+    proxy_bids = auction.proxy_bids
+    return (
+        tuple(getattr(auction, slot) for slot in Auction.__slots__ if slot not in ('bid_history', 'proxy_bids', 'version')),
+        [tuple(bid) for bid in zip(history.bidder_ids, history.amounts, history.times_ms, history.name_indexes)],
+        history.names,
+        history.bidder_count,
+        sorted((bidder_id, proxy_bids.maxes[bidder_id], proxy_bids.names[bidder_id]) for bidder_id in proxy_bids.maxes)
+        if proxy_bids else None
+    )
+
+
+def _stats(manager: AuctionManager):
+    stats = manager.stats
+    return (
+        stats.total_bids, stats.bidders, stats.public_bids, stats.names, stats.top_bidders(),
+        stats.currencies, stats.minutes
+    )
+
+
+def _state(manager: AuctionManager):
+    """What a manager answers about its auctions, loaded or not"""
+    return (
+        manager.next_id,
+        {auction_id: _fields(manager.get_auction(auction_id)) for auction_id in range(1, manager.next_id)},
+        sorted(manager.get_active_auctions()),
+        sorted(manager.get_unfinished_closings()),
+        # Only the lazy store also looks archived auctions up by user or channel
+        manager.get_channel_auction_ids(2, active_only=True),
+        manager.get_creator_auction_ids(1, active_only=True),
+        manager.get_bidder_auction_ids(11, active_only=True),
+        manager.get_winning_auction_ids(12),
+        _stats(manager)
+    )
+
+
+class StoreParityTest(unittest.TestCase):
+    """SQLiteAuctionStore keeps and loads the same auctions as SnapshotJournalStore"""
+
+    NOW = 1_800_000_000.123
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        # Both stores see the same clock, so their timestamps can be compared
+        for name, value in (("time.time", self.NOW), ("time.time_ns", int(self.NOW * 1000) * 1_000_000)):
+            patcher = mock.patch(name, return_value=value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def _snapshot_manager(self) -> AuctionManager:
+        manager = AuctionManager(
+            SnapshotJournalStore(
+                os.path.join(self.dir.name, "auction_data.snap"),
+                os.path.join(self.dir.name, "auction_data.journal")
+            ),
+            archive=AuctionArchive(os.path.join(self.dir.name, "auction_archive.dat"))
+        )
+        self.addCleanup(manager.store.close)
+        return manager
+
+    def _sqlite_manager(self) -> AuctionManager:
+        manager = AuctionManager(SQLiteAuctionStore(os.path.join(self.dir.name, "auction_data.db")))
+        self.addCleanup(manager.store.close)
+        return manager
+
+    def _run(self, manager: AuctionManager):
+        """The same history of changes, applied to either store"""
+        sword = manager.create_auction("Sword", 10, 5, 3600, 1, 2, currency="gold")
+        shield = manager.create_auction(
+            "Shield", 0, 1, 7200, 1, 2, emblem_url="https://example.com/e.png", anonymous_bidding=True
+        )
+        axe, bow, helm = manager.create_auctions([
+            {"item_name": name, "starting_bid": 20, "bid_increment": 2, "duration_seconds": 600,
+             "creator_id": 3, "channel_id": 4}
+            for name in ("Axe", "Bow", "Helm")
+        ])
+        for auction_id, message_id in ((sword, 100), (shield, 101), (axe, 102), (bow, 103)):
+            manager.set_message_id(auction_id, message_id)
+        manager.restart_clock(bow)
+
+        manager.place_bid(sword, 11, "alice", 20)
+        manager.set_max_bid(sword, 12, "bob", 100)
+        manager.place_bid(sword, 11, "alice", 50)
+        manager.set_max_bid(sword, 13, "carol", 80)
+        manager.place_bid(shield, 11, "alice", 3)
+        manager.place_bid(shield, 12, "bob", 4)
+        manager.place_bid(axe, 12, "bob", 22)
+        manager.place_bid(axe, 11, "alice", 24)
+        manager.place_bid(bow, 13, "carol", 22)
+
+        # One sold and finalized, one cancelled and announced, one sold but still closing
+        manager.end_auction(axe)
+        manager.set_close_state(axe, CLOSE_ANNOUNCED)
+        manager.set_close_state(axe, CLOSE_FINALIZED)
+        manager.end_auction(bow, cancelled=True, early=True)
+        manager.set_close_state(bow, CLOSE_ANNOUNCED)
+        manager.end_auction(helm)
+
+    def test_same_state_after_the_same_changes(self):
+        snapshot = self._snapshot_manager()
+        sqlite = self._sqlite_manager()
+        self._run(snapshot)
+        self._run(sqlite)
+        self.assertEqual(_state(sqlite), _state(snapshot))
+        self.assertEqual(sqlite.get_bidder_auction_ids(11), [1, 2, 3])
+        self.assertEqual(snapshot.get_bidder_auction_ids(11), [1, 2])
+
+    def test_same_state_after_a_restart_without_saving(self):
+        snapshot = self._snapshot_manager()
+        sqlite = self._sqlite_manager()
+        self._run(snapshot)
+        self._run(sqlite)
+        expected = _state(snapshot)
+        snapshot.store.close()
+        sqlite.store.close()
+
+        self.assertEqual(_state(self._snapshot_manager()), expected)
+        self.assertEqual(_state(self._sqlite_manager()), expected)
+
+    def test_same_state_after_saving_and_restarting(self):
+        snapshot = self._snapshot_manager()
+        sqlite = self._sqlite_manager()
+        self._run(snapshot)
+        self._run(sqlite)
+        expected = _state(snapshot)
+        self.assertTrue(snapshot.save_data())
+        self.assertTrue(sqlite.save_data())
+        snapshot.close()
+        sqlite.close()
+
+        snapshot = self._snapshot_manager()
+        sqlite = self._sqlite_manager()
+        self.assertEqual(_state(snapshot), expected)
+        self.assertEqual(_state(sqlite), expected)
+        # Only auctions that are running or still closing are loaded
+        self.assertEqual(sorted(snapshot.auctions), sorted(sqlite.auctions))
+
+    def test_later_changes_continue_from_the_loaded_state(self):
+        for make in (self._snapshot_manager, self._sqlite_manager):
+            manager = make()
+            self._run(manager)
+            manager.store.close()
+        snapshot = self._snapshot_manager()
+        sqlite = self._sqlite_manager()
+        for manager in (snapshot, sqlite):
+            self.assertTrue(manager.place_bid(1, 14, "dave", 200))
+            self.assertTrue(manager.set_max_bid(2, 13, "carol", 50))
+            manager.create_auction("Ring", 5, 1, 60, 1, 2)
+        self.assertEqual(_state(sqlite), _state(snapshot))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Tuple
+
+import discord
+
+logger = logging.getLogger('auction_bot')
+
+
+class UserNameCache:
+    """Shared user ID -> name lookups for everything that renders auctions
+
+    Names come from the bot's user cache, from names already stored on
+    auctions, or from fetch_user. Entries expire after TTL seconds and the
+    least recently used are dropped beyond MAX_SIZE. Concurrent lookups of
+    the same unknown user share a single fetch_user call.
+    """
+    MAX_SIZE = 10000
+    # Seconds a name is trusted before it is looked up again
+    TTL = 3600
+    # Seconds before a user that could not be fetched is tried again
+    FAILURE_TTL = 300
+
+    def __init__(self, bot, max_size: int = MAX_SIZE, ttl: float = TTL):
+        self.bot = bot
+        self.max_size = max_size
+        self.ttl = ttl
+        # user_id -> (name or None if unknown, expiry on the monotonic clock)
+        self._names: OrderedDict[int, Tuple[Optional[str], float]] = OrderedDict()
+        self._pending: Dict[int, asyncio.Task] = {}
+
+    def get(self, user_id: int) -> Optional[str]:
+        """Get a name without waiting
+
+        A user that isn't known yet is fetched in the background, so a later
+        render has the name. Until then the last known name, if any, is used.
+        """
+        entry = self._names.get(user_id)
+        if entry is not None and entry[1] > time.monotonic():
+            self._names.move_to_end(user_id)
+            return entry[0]
+
+        user = self.bot.get_user(user_id)
+        if user is not None:
+            self.remember(user_id, user.name)
+            return user.name
+
+        try:
+            self._fetch(user_id)
+        except RuntimeError:
+            # No running event loop, e.g. during a background save
+            pass
+        return entry[0] if entry else None
+
+    def remember(self, user_id: int, name: str):
+        """Store a name that is known to be current"""
+        self._put(user_id, name, self.ttl)
+
+    def warm(self, names: Iterable[Tuple[int, str]]):
+        """Seed (user_id, name) pairs, such as names stored on auctions, without replacing known names"""
+        for user_id, name in names:
+            if user_id is not None and name and user_id not in self._names:
+                self._put(user_id, name, self.ttl)
+
+    def close(self):
+        """Cancel fetches that are still running"""
+        for task in self._pending.values():
+            task.cancel()
+        self._pending.clear()
+
+    def _put(self, user_id: int, name: Optional[str], ttl: float):
+        self._names[user_id] = (name, time.monotonic() + ttl)
+        self._names.move_to_end(user_id)
+        while len(self._names) > self.max_size:
+            self._names.popitem(last=False)
+
+    def _fetch(self, user_id: int) -> asyncio.Task:
+        task = self._pending.get(user_id)
+        if task is None:
+            task = self._pending[user_id] = asyncio.get_running_loop().create_task(self._fetch_name(user_id))
+        return task
+
+    async def _fetch_name(self, user_id: int) -> Optional[str]:
+        entry = self._names.get(user_id)
+        stale = entry[0] if entry else None
+        try:
+            user = await self.bot.fetch_user(user_id)
+        except discord.HTTPException as e:
+            # Keep the last known name, but don't ask again for a while
+            logger.warning(f"Could not fetch user {user_id}: {e}")
+            self._put(user_id, stale, self.FAILURE_TTL)
+            return stale
+        finally:
+            self._pending.pop(user_id, None)
+        self.remember(user_id, user.name)
+        return user.name